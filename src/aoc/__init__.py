@@ -1,20 +1,43 @@
 from .bit import BITS, BITS_LIST
+from .bitgrid import BitGrid
 from .graph import (
+    CompiledGraph,
     Edge,
+    ShortestPaths,
+    astar,
+    astar_length,
     bfs,
+    bfs_all,
     bfs_all_nodes,
     bfs_length,
     dfs,
     dijkstra,
+    dijkstra_all,
     dijkstra_length,
     edge_iter,
     make_undirected,
     node_set,
 )
-from .grid import Grid
+from .grid import (
+    CellMask,
+    Components,
+    Cycle,
+    DistanceMap,
+    FlatGrid,
+    Grid,
+    GridState,
+    GridView,
+    NeighborTable,
+    PoiMatrix,
+    Region,
+    bounded_cost,
+    momentum_rule,
+    turning_rule,
+)
 from .hex import HEX_DIAGONALS, HEX_DIRECTIONS, HEX_NAMED_DIRECTIONS, Hex
 from .interval import Interval
 from .linked_list import ListNode, SinglyListNode
+from .obstacles import ObstacleIndex, Walk
 from .point import (
     ADJACENTS_3D,
     ALL_ADJACENTS,
@@ -43,5 +66,8 @@ from .point import (
     translate,
 )
 from .rect import Rect
+from .search import BloomVisited, HashedVisited, SearchResult, implicit_search
+from .sparse_grid import SparseGrid
 from .tree import TreeNode
 from .utils import batched, build_number, fetch, get_ints, range_intersect, split_range
+from .voxel import VoxelGrid
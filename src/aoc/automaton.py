@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from operator import ne
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - the pure python engine is used without it
+    np = None
+
+# neighbor counts (0..8) of every counted value are packed into 4 bits of one integer
+_BITS = 4
+_COUNT_MASK = (1 << _BITS) - 1
+
+
+class Automaton:
+    """
+    Cellular automaton engine over a row-major list of cell values (used by Grid.step and
+    Grid.simulate).
+
+    The rule is called as rule(value, *counts) with the number of neighbors holding each of the
+    counted values and must return the new value. It has to be a pure function: results are
+    cached per (value, counts) combination.
+    """
+
+    def __init__(self, rule: Callable[..., str], count: str | list[str], diagonal: bool = True):
+        """
+        :param rule: rule(value, *counts) -> new value
+        :param count: values to count in the neighborhood (each character of a string)
+        :param diagonal: count all 8 neighbors instead of the 4 direct ones
+        """
+        self.rule = rule
+        self.count = list(count)
+        self.diagonal = diagonal
+        self.codes = {v: 1 << (_BITS * k) for k, v in enumerate(self.count)}
+        self._results = {}
+
+    def apply(self, value: str, packed: int) -> str:
+        """New value of a cell with value and packed neighbor counts."""
+        key = (value, packed)
+        result = self._results.get(key)
+        if result is None:
+            counts = [(packed >> (_BITS * k)) & _COUNT_MASK for k in range(len(self.count))]
+            result = self._results[key] = self.rule(value, *counts)
+        return result
+
+    def step(self, cells: list[str], out: list[str], width: int, height: int) -> int:
+        """
+        One generation from cells into the equally sized buffer out. Neighbor counts are summed
+        with whole-row list operations on shifted rows.
+
+        :return: number of changed cells
+        """
+        codes, apply = self.codes, self.apply
+        masks = []
+        for y in range(height):
+            masks.append([codes.get(v, 0) for v in cells[y * width : (y + 1) * width]])
+        zeros = [0] * width
+
+        if self.diagonal:
+            # horizontal sums of three, then vertical sums of three minus the cell itself
+            sums = [[a + b + c for a, b, c in zip([0, *m], m, [*m[1:], 0])] for m in masks]
+        else:
+            sums = masks
+        for y in range(height):
+            up = sums[y - 1] if y > 0 else zeros
+            down = sums[y + 1] if y < height - 1 else zeros
+            m = masks[y]
+            if self.diagonal:
+                counts = [a + b + c - d for a, b, c, d in zip(up, sums[y], down, m)]
+            else:
+                counts = [a + b + c + d for a, b, c, d in zip(up, down, [0, *m], [*m[1:], 0])]
+            row = slice(y * width, (y + 1) * width)
+            out[row] = map(apply, cells[row], counts)
+        return sum(map(ne, cells, out))
+
+    def step_array(self, cells, width: int, height: int):
+        """
+        One generation with numpy over a (height, width) uint8 array of latin-1 cell values.
+        Returns (new array, number of changed cells) or None if a rule result can not be stored
+        as a single latin-1 character.
+        """
+        lut = np.zeros(256, dtype=np.uint64)
+        for v, code in self.codes.items():
+            lut[ord(v)] = code
+        m = lut[cells]
+        p = np.pad(m, 1)
+        counts = p[:-2, 1:-1] + p[2:, 1:-1] + p[1:-1, :-2] + p[1:-1, 2:]
+        if self.diagonal:
+            counts += p[:-2, :-2] + p[:-2, 2:] + p[2:, :-2] + p[2:, 2:]
+
+        shift = _BITS * len(self.count)
+        keys = (cells.astype(np.uint64) << np.uint64(shift)) | counts
+        unique, inverse = np.unique(keys, return_inverse=True)
+        values = bytearray()
+        for key in unique.tolist():
+            result = self.apply(chr(key >> shift), key & ((1 << shift) - 1))
+            if not (isinstance(result, str) and len(result) == 1 and ord(result) < 256):
+                return None
+            values.append(ord(result))
+        new = np.frombuffer(bytes(values), dtype=np.uint8)[inverse].reshape(height, width)
+        return new, int(np.count_nonzero(new != cells))
+
+    def step_frontier(self, cells: list[str], offsets, targets, active: set[int]) -> set[int]:
+        """
+        One generation in place, only recomputing the active cells (cells whose neighborhood
+        changed in the last generation). The neighbors of cell i are
+        targets[offsets[i]:offsets[i + 1]] (see Grid.neighbor_table).
+
+        :return: the indices of the changed cells
+        """
+        codes, apply = self.codes, self.apply
+        updates = []
+        for i in active:
+            packed = 0
+            for j in targets[offsets[i] : offsets[i + 1]]:
+                packed += codes.get(cells[j], 0)
+            value = apply(cells[i], packed)
+            if value != cells[i]:
+                updates.append((i, value))
+        for i, value in updates:
+            cells[i] = value
+        return {i for i, _ in updates}
+
+    def frontier(self, changed: set[int], offsets, targets) -> set[int]:
+        """The changed cells and all their neighbors."""
+        active = set(changed)
+        for i in changed:
+            active.update(targets[offsets[i] : offsets[i + 1]])
+        return active
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+
+from .grid import Grid
+from .point import Point
+
+
+class BitGrid:
+    """
+    Two-valued 2D grid stored as one Python integer per row: bit x of row y is cell (x, y).
+
+    Set operations (&, |, ^, ~), shifts, neighbor counts, expansion and tilting work on whole
+    rows with integer shifts and bitwise operations instead of visiting single cells.
+    """
+
+    def __init__(self, width: int, height: int, rows: Iterable[int] | None = None):
+        """
+        :param width: number of columns
+        :param height: number of rows
+        :param rows: row integers (default: all cells cleared)
+        """
+        self.width = width
+        self.height = height
+        self._full = (1 << width) - 1
+        self._rows = [0] * height if rows is None else [r & self._full for r in rows]
+        if len(self._rows) != height:
+            raise ValueError(f"expected {height} rows, got {len(self._rows)}")
+
+    @classmethod
+    def parse(cls, text: str, on: str | Callable[[str], bool] = "#") -> BitGrid:
+        """Parse multiline string; cells equal to on (or satisfying on) are set."""
+        return cls.from_grid(Grid.parse(text), on)
+
+    @classmethod
+    def from_grid(cls, grid: Grid, on: str | Callable[[str], bool] = "#") -> BitGrid:
+        """BitGrid of the cells of grid that equal on (or satisfy on)."""
+        test = on if callable(on) else on.__eq__
+        rows = []
+        for row in grid.rows():
+            bits = "".join("1" if test(v) else "0" for v in reversed(row))
+            rows.append(int(bits, 2) if bits else 0)
+        return cls(grid.width, grid.height, rows)
+
+    def to_grid(self, on: str = "#", off: str = ".") -> Grid:
+        return Grid(list(self.rows(on, off)))
+
+    def rows(self, on: str = "#", off: str = ".") -> Iterator[str]:
+        table = str.maketrans("01", off + on)
+        for r in self._rows:
+            yield format(r, f"0{self.width}b")[::-1].translate(table) if self.width else ""
+
+    def row(self, y: int) -> int:
+        """Integer of row y (bit x is cell (x, y))."""
+        return self._rows[y]
+
+    def __getitem__(self, p: Point | tuple) -> bool:
+        return bool(self._rows[p[1]] >> p[0] & 1)
+
+    def __setitem__(self, p: Point | tuple, value: bool):
+        if not 0 <= p[0] < self.width:
+            raise IndexError(f"{p} outside of {self!r}")
+        if value:
+            self._rows[p[1]] |= 1 << p[0]
+        else:
+            self._rows[p[1]] &= ~(1 << p[0])
+
+    def __contains__(self, p: Point | tuple) -> bool:
+        return 0 <= p[0] < self.width and 0 <= p[1] < self.height
+
+    def points(self) -> Iterator[Point]:
+        """All set cells in row-major order."""
+        for y, r in enumerate(self._rows):
+            while r:
+                low = r & -r
+                yield Point(low.bit_length() - 1, y)
+                r ^= low
+
+    def count(self) -> int:
+        """Number of set cells."""
+        return sum(bin(r).count("1") for r in self._rows)
+
+    def _new(self, rows: list[int]) -> BitGrid:
+        grid = BitGrid.__new__(BitGrid)
+        grid.width, grid.height, grid._full, grid._rows = self.width, self.height, self._full, rows
+        return grid
+
+    def _check(self, other: BitGrid):
+        if (self.width, self.height) != (other.width, other.height):
+            raise ValueError(f"size mismatch: {self!r} and {other!r}")
+
+    def __and__(self, other: BitGrid) -> BitGrid:
+        self._check(other)
+        return self._new([a & b for a, b in zip(self._rows, other._rows)])
+
+    def __or__(self, other: BitGrid) -> BitGrid:
+        self._check(other)
+        return self._new([a | b for a, b in zip(self._rows, other._rows)])
+
+    def __xor__(self, other: BitGrid) -> BitGrid:
+        self._check(other)
+        return self._new([a ^ b for a, b in zip(self._rows, other._rows)])
+
+    def __invert__(self) -> BitGrid:
+        full = self._full
+        return self._new([r ^ full for r in self._rows])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitGrid):
+            return NotImplemented
+        return (self.width, self.height, self._rows) == (other.width, other.height, other._rows)
+
+    def __hash__(self) -> int:
+        return hash((self.width, self.height, tuple(self._rows)))
+
+    def copy(self) -> BitGrid:
+        return self._new(self._rows[:])
+
+    def _shift_rows(self, rows: list[int], dx: int, dy: int) -> list[int]:
+        full, h = self._full, self.height
+        if dx > 0:
+            rows = [(r << dx) & full for r in rows]
+        elif dx < 0:
+            rows = [r >> -dx for r in rows]
+        if dy > 0:
+            rows = [0] * min(dy, h) + rows[: max(h - dy, 0)]
+        elif dy < 0:
+            rows = rows[-dy:] + [0] * min(-dy, h)
+        return rows
+
+    def shift(self, dx: int, dy: int) -> BitGrid:
+        """Move every set cell by (dx, dy); cells moved outside of the grid are dropped."""
+        return self._new(self._shift_rows(self._rows, dx, dy))
+
+    def _adjacent_rows(self, rows: list[int], diagonal: bool) -> list[int]:
+        full, h = self._full, self.height
+        sides = [(r << 1) & full | r >> 1 for r in rows]
+        # rows above and below contribute the cell itself, with diagonal also its sides
+        vertical = [r | s for r, s in zip(rows, sides)] if diagonal else rows
+        return [
+            sides[y] | (vertical[y - 1] if y else 0) | (vertical[y + 1] if y < h - 1 else 0)
+            for y in range(h)
+        ]
+
+    def adjacent(self, diagonal: bool = False) -> BitGrid:
+        """Cells with at least one set neighbor."""
+        return self._new(self._adjacent_rows(self._rows, diagonal))
+
+    def dilate(self, diagonal: bool = False) -> BitGrid:
+        """All set cells plus their neighbors."""
+        rows = self._adjacent_rows(self._rows, diagonal)
+        return self._new([a | b for a, b in zip(rows, self._rows)])
+
+    def neighbor_counts(self, diagonal: bool = True) -> list[BitGrid]:
+        """
+        Number of set neighbors of every cell as bit planes: the count of a cell is
+        sum(planes[k][p] << k). All neighbor rows are added at once with a bit-sliced adder.
+        """
+        h = self.height
+        offsets = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        if diagonal:
+            offsets += [(1, -1), (1, 1), (-1, 1), (-1, -1)]
+        planes = [[0] * h for _ in range(4)]
+        for dx, dy in offsets:
+            carry = self._shift_rows(self._rows, dx, dy)
+            for plane in planes:
+                for y in range(h):
+                    c = carry[y]
+                    if c:
+                        plane[y], carry[y] = plane[y] ^ c, plane[y] & c
+        return [self._new(plane) for plane in planes]
+
+    def _count_equals(self, planes: list[BitGrid], n: int) -> list[int]:
+        full = self._full
+        rows = [full] * self.height
+        for k, plane in enumerate(planes):
+            bit_rows = plane._rows if n >> k & 1 else [r ^ full for r in plane._rows]
+            rows = [a & b for a, b in zip(rows, bit_rows)]
+        return rows
+
+    def life(
+        self, birth: Iterable[int] = (3,), survive: Iterable[int] = (2, 3), diagonal: bool = True
+    ) -> BitGrid:
+        """
+        One generation of a life-like automaton (default: Conway's B3/S23).
+
+        :param birth: neighbor counts turning a cleared cell on
+        :param survive: neighbor counts keeping a set cell on
+        :param diagonal: count all 8 neighbors instead of the 4 direct ones
+        """
+        planes = self.neighbor_counts(diagonal)
+        h = self.height
+        born = [0] * h
+        for n in set(birth):
+            born = [a | b for a, b in zip(born, self._count_equals(planes, n))]
+        kept = [0] * h
+        for n in set(survive):
+            kept = [a | b for a, b in zip(kept, self._count_equals(planes, n))]
+        full = self._full
+        return self._new([(b & (r ^ full)) | (k & r) for b, k, r in zip(born, kept, self._rows)])
+
+    def flood(self, start: Point | tuple, diagonal: bool = False) -> BitGrid:
+        """Set cells connected to start, grown a whole layer per round."""
+        filled = [0] * self.height
+        if not self[start]:
+            return self._new(filled)
+        filled[start[1]] = 1 << start[0]
+        while True:
+            grown = [a & b for a, b in zip(self._adjacent_rows(filled, diagonal), self._rows)]
+            grown = [a | b for a, b in zip(grown, filled)]
+            if grown == filled:
+                return self._new(filled)
+            filled = grown
+
+    def reachable(
+        self, starts: Point | tuple | Iterable[Point | tuple], steps: int, diagonal: bool = False
+    ) -> BitGrid:
+        """
+        Cells reachable from starts in exactly steps steps, moving only onto set cells (self is
+        the passable map). Once the reachable set alternates between two states the remaining
+        steps are resolved by their parity, so huge step counts finish after about the grid
+        diameter.
+
+        :param starts: starting point or points (need not be set themselves)
+        :param steps: exact number of steps
+        :param diagonal: also move diagonally
+        """
+        if isinstance(starts, tuple) and starts and isinstance(starts[0], int):
+            starts = [starts]
+        current = [0] * self.height
+        for p in starts:
+            current[p[1]] |= 1 << p[0]
+        history = [current]
+        for step in range(1, steps + 1):
+            adjacent = self._adjacent_rows(current, diagonal)
+            current = [a & b for a, b in zip(adjacent, self._rows)]
+            if len(history) >= 2 and current == history[-2]:
+                # period 2 from here on: every further pair of steps repeats the same states
+                current = current if (steps - step) % 2 == 0 else history[-1]
+                break
+            history = [history[-1], current]
+        return self._new(current)
+
+    def tilt(self, walls: BitGrid, direction: Point | tuple) -> BitGrid:
+        """
+        Roll every set cell (e.g. round rocks) in direction until it hits a wall, another
+        rolled cell or the border. All cells that can move advance together by one cell per
+        round.
+
+        :param walls: cells that never move and block rolling cells
+        :param direction: (dx, dy) unit step, e.g. NORTH
+        """
+        self._check(walls)
+        dx, dy = direction[0], direction[1]
+        rocks, blocked = self._rows[:], walls._rows
+        while True:
+            taken = [a | b for a, b in zip(rocks, blocked)]
+            moved = self._shift_rows(rocks, dx, dy)
+            # cells a rock moves into, and the cells those rocks came from
+            arrived = [m & ~t for m, t in zip(moved, taken)]
+            if not any(arrived):
+                return self._new(rocks)
+            left = self._shift_rows(arrived, -dx, -dy)
+            rocks = [(r & ~g) | a for r, g, a in zip(rocks, left, arrived)]
+
+    def tile(self, nx: int, ny: int) -> BitGrid:
+        """The grid repeated nx times horizontally and ny times vertically."""
+        w = self.width
+        rows = []
+        for r in self._rows:
+            tiled = 0
+            for k in range(nx):
+                tiled |= r << (k * w)
+            rows.append(tiled)
+        return BitGrid(w * nx, self.height * ny, rows * ny)
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows())
+
+    def __repr__(self) -> str:
+        return f"BitGrid({self.width}x{self.height})"
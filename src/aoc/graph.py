@@ -1,9 +1,12 @@
 import heapq
+from array import array
 from collections import defaultdict, deque, namedtuple
-from itertools import chain
+from itertools import chain, count
 
 Edge = namedtuple("Edge", "child,dist", defaults=[1])
 
+_MISSING = object()
+
 
 def edge_iter(edge):
     if isinstance(edge, Edge):
@@ -28,28 +31,384 @@ def make_undirected(edges):
 
 
 def node_set(edges):
+    if isinstance(edges, CompiledGraph):
+        return set(edges.nodes)
     children = set(
         map(lambda e: e.child, chain(*[edge_iter(e) for e in edges.values()]))
     )
     return children.union(edges.keys())
 
 
-def _bfs(edges, start, is_target, with_path=True):
-    q = deque()
-    q.append(([start] if with_path else start, 0))
-    seen = {start}
+class CompiledGraph:
+    # integer indexed form of a dict graph: node ids 0..n-1 (nodes[id] is the label, ids the
+    # reverse mapping) and CSR adjacency - the edges of node i are
+    # targets[offsets[i]:offsets[i + 1]] with the same slice of weights
+    def __init__(self, nodes, offsets, targets, weights, ids=None):
+        self.nodes = nodes
+        self.ids = {node: i for i, node in enumerate(nodes)} if ids is None else ids
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._reversed = None
+
+    def reverse(self):
+        # (offsets, targets, weights) of the graph with every edge flipped, built on first use
+        if self._reversed is None:
+            self._reversed = _reverse(self)
+        return self._reversed
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.ids
+
+    def edges(self, node):
+        i = self.ids[node]
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return [Edge(self.nodes[t], w) for t, w in zip(self.targets[lo:hi], self.weights[lo:hi])]
+
+    def __repr__(self):
+        return f"CompiledGraph({len(self.nodes)} nodes, {len(self.targets)} edges)"
+
+
+def compile(edges):
+    if isinstance(edges, CompiledGraph):
+        return edges
+    nodes = list(edges)
+    ids = {node: i for i, node in enumerate(nodes)}
+    offsets = array("i", [0])
+    targets = array("i")
+    dists = []
+    for edge in edges.values():
+        for child, dist in edge_iter(edge):
+            i = ids.get(child)
+            if i is None:
+                i = ids[child] = len(nodes)
+                nodes.append(child)
+            targets.append(i)
+            dists.append(dist)
+        offsets.append(len(targets))
+    # nodes that only appear as targets have no edges
+    offsets.extend([len(targets)] * (len(nodes) - len(edges)))
+    try:
+        weights = array("q", dists)
+    except TypeError:  # non integer weights
+        weights = array("d", dists)
+    return CompiledGraph(nodes, offsets, targets, weights, ids)
+
+
+def _reverse(graph):
+    # CSR adjacency with every edge flipped
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    incoming = [[] for _ in graph.nodes]
+    for node in range(len(graph.nodes)):
+        for k in range(offsets[node], offsets[node + 1]):
+            incoming[targets[k]].append((node, weights[k]))
+    rev_offsets = array("i", [0])
+    rev_targets = array("i")
+    rev_weights = array(weights.typecode)
+    for row in incoming:
+        for child, dist in row:
+            rev_targets.append(child)
+            rev_weights.append(dist)
+        rev_offsets.append(len(rev_targets))
+    return rev_offsets, rev_targets, rev_weights
+
+
+def _target(graph, destination):
+    if callable(destination):
+        nodes = graph.nodes
+        return lambda i: destination(nodes[i])
+    target = graph.ids.get(destination, -1)
+    return lambda i: i == target
+
+
+class ShortestPaths:
+    # distances and predecessor tree of a single source search, keyed by node label -
+    # unreached nodes are missing and paths are rebuilt only on request
+    def __init__(self, start, dist, parents):
+        self.start = start
+        self._dist = dist
+        self._parents = parents
+
+    def __getitem__(self, node):
+        return self._dist[node]
+
+    def get(self, node, default=None):
+        return self._dist.get(node, default)
+
+    def __contains__(self, node):
+        return node in self._dist
+
+    def __len__(self):
+        return len(self._dist)
+
+    def __iter__(self):
+        return iter(self._dist)
+
+    def items(self):
+        return self._dist.items()
+
+    def parent(self, node):
+        return self._parents[node]
+
+    def path(self, node):
+        return _build_path(self._parents, node) if node in self._dist else None
+
+    def __repr__(self):
+        return f"ShortestPaths(from {self.start!r}, {len(self)} reached)"
+
+
+def _build_path(parents, node):
+    path = [node]
+    while parents[node] is not None:
+        node = parents[node]
+        path.append(node)
+    return path[::-1]
+
+
+def _path(graph, parents, node):
+    path = []
+    while node >= 0:
+        path.append(graph.nodes[node])
+        node = parents[node]
+    return path[::-1]
+
+
+def _not_found(with_path):
+    return (None, -1) if with_path else -1
+
+
+# single source searches over a CompiledGraph: return the first node id satisfying is_target
+# (-1 if there is none or no is_target was given - the whole reachable part is searched then)
+# together with the distances, predecessors and reached markers of all node ids
+
+
+def _compiled_bfs(graph, start, is_target=None):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph.nodes)
+    dist = array(weights.typecode, [0]) * n
+    parents = array("i", [-1]) * n
+    reached = bytearray(n)
+    reached[start] = 1
+    q = deque([start])
 
     while q:
-        path, total_dist = q.popleft()
-        node = path[-1] if with_path else path
+        node = q.popleft()
+        if is_target is not None and is_target(node):
+            return node, dist, parents, reached
+        total_dist = dist[node]
+        for k in range(offsets[node], offsets[node + 1]):
+            child = targets[k]
+            if reached[child]:
+                continue
+            reached[child] = 1
+            dist[child] = total_dist + weights[k]
+            parents[child] = node
+            q.append(child)
+    return -1, dist, parents, reached
+
+
+def _compiled_bidirectional_bfs(graph, start, target, with_path=True):
+    # search forward from start and backward (over reversed edges) from target, always
+    # expanding the smaller frontier by a whole level - the first node reached by both
+    # searches lies on a path with the fewest edges
+    if start == target:
+        return ([graph.nodes[start]], 0) if with_path else 0
+    adjacency = ((graph.offsets, graph.targets, graph.weights), graph.reverse())
+    # node -> (neighbor towards start / target, dist of that edge)
+    links = ({start: None}, {target: None})
+    frontiers = [[start], [target]]
+
+    while frontiers[0] and frontiers[1]:
+        k = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other = links[k], links[1 - k]
+        offsets, targets, weights = adjacency[k]
+        q = []
+        for node in frontiers[k]:
+            for e in range(offsets[node], offsets[node + 1]):
+                child = targets[e]
+                if child in seen:
+                    continue
+                seen[child] = (node, weights[e])
+                if child in other:
+                    if not with_path:
+                        return _join_paths(links, child)[1]
+                    path, total_dist = _join_paths(links, child)
+                    return [graph.nodes[i] for i in path], total_dist
+                q.append(child)
+        frontiers[k] = q
+    return _not_found(with_path)
+
+
+def _join_paths(links, node):
+    # path start -> node -> target from the links of both searches, and its length
+    total_dist = 0
+    halves = []
+    for link in links:
+        half = []
+        cur = node
+        while link[cur] is not None:
+            cur, dist = link[cur]
+            total_dist += dist
+            half.append(cur)
+        halves.append(half)
+    return [*reversed(halves[0]), node, *halves[1]], total_dist
+
+
+def _compiled_dfs(graph, cur, is_target, path_set=None, total_dist=0, best=0):
+    if is_target(cur):
+        return max(best, total_dist)
+    if path_set is None:
+        path_set = bytearray(len(graph.nodes))
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    for k in range(offsets[cur], offsets[cur + 1]):
+        child = targets[k]
+        if not path_set[child]:
+            path_set[child] = 1
+            best = _compiled_dfs(graph, child, is_target, path_set, total_dist + weights[k], best)
+            path_set[child] = 0
+    return best
+
+
+def _compiled_dijkstra(graph, start, is_target=None):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(graph.nodes)
+    dist = array(weights.typecode, [0]) * n
+    parents = array("i", [-1]) * n
+    reached = bytearray(n)
+    reached[start] = 1
+    heap = [(0, start)]
+    while heap:
+        total_dist, node = heapq.heappop(heap)
+        if total_dist > dist[node]:
+            continue  # stale entry - node was reached cheaper in the meantime
+        if is_target is not None and is_target(node):
+            return node, dist, parents, reached
+        for k in range(offsets[node], offsets[node + 1]):
+            child = targets[k]
+            costs = total_dist + weights[k]
+            if not reached[child] or costs < dist[child]:
+                # found a (cheaper) path to child
+                reached[child] = 1
+                dist[child] = costs
+                parents[child] = node
+                heapq.heappush(heap, (costs, child))
+    return -1, dist, parents, reached
+
+
+def _compiled_astar(graph, start, is_target, heuristic, consistent=False):
+    # heuristic(node) must not overestimate the remaining distance; a consistent heuristic
+    # (h(a) <= dist(a, b) + h(b) for every edge) settles every node on its first pop, so nodes
+    # are closed then and never reopened
+    offsets, targets, weights, nodes = graph.offsets, graph.targets, graph.weights, graph.nodes
+    n = len(nodes)
+    dist = array(weights.typecode, [0]) * n
+    parents = array("i", [-1]) * n
+    reached = bytearray(n)
+    reached[start] = 1
+    closed = bytearray(n) if consistent else None
+    # ties on the estimate go to the deeper node, which is usually closer to the target
+    heap = [(heuristic(nodes[start]), 0, start)]
+    while heap:
+        _, total_dist, node = heapq.heappop(heap)
+        total_dist = -total_dist
+        if total_dist > dist[node]:
+            continue  # stale entry - node was reached cheaper in the meantime
+        if consistent:
+            if closed[node]:
+                continue
+            closed[node] = 1
         if is_target(node):
-            return (path, total_dist) if with_path else total_dist
-        for child, dist in edge_iter(edges[node]):
-            if child in seen:
+            return node, dist, parents, reached
+        for k in range(offsets[node], offsets[node + 1]):
+            child = targets[k]
+            if consistent and closed[child]:
                 continue
-            seen.add(child)
-            q.append(([*path, child] if with_path else child, total_dist + dist))
-    return (None, -1) if with_path else -1
+            costs = total_dist + weights[k]
+            if not reached[child] or costs < dist[child]:
+                reached[child] = 1
+                dist[child] = costs
+                parents[child] = node
+                heapq.heappush(heap, (costs + heuristic(nodes[child]), -costs, child))
+    return -1, dist, parents, reached
+
+
+def _compiled_bidirectional_dijkstra(graph, start, target, with_path=True):
+    # dijkstra forward from start and backward from target, popping from the side with the
+    # smaller heap; every edge relaxed towards a node the other side has reached gives a
+    # candidate path, and once the two heap minimums add up to at least the best candidate no
+    # shorter path can be found
+    if start == target:
+        return ([graph.nodes[start]], 0) if with_path else 0
+    adjacency = ((graph.offsets, graph.targets, graph.weights), graph.reverse())
+    n = len(graph.nodes)
+    typecode = graph.weights.typecode
+    dists = (array(typecode, [0]) * n, array(typecode, [0]) * n)
+    parents = (array("i", [-1]) * n, array("i", [-1]) * n)
+    reached = (bytearray(n), bytearray(n))
+    reached[0][start] = reached[1][target] = 1
+    heaps = ([(0, start)], [(0, target)])
+    best, meet = None, -1
+
+    while heaps[0] and heaps[1]:
+        if best is not None and heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        k = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        total_dist, node = heapq.heappop(heaps[k])
+        dist, parent, seen = dists[k], parents[k], reached[k]
+        if total_dist > dist[node]:
+            continue  # stale entry - node was reached cheaper in the meantime
+        other_dist, other_seen = dists[1 - k], reached[1 - k]
+        offsets, targets, weights = adjacency[k]
+        for e in range(offsets[node], offsets[node + 1]):
+            child = targets[e]
+            costs = total_dist + weights[e]
+            if not seen[child] or costs < dist[child]:
+                seen[child] = 1
+                dist[child] = costs
+                parent[child] = node
+                heapq.heappush(heaps[k], (costs, child))
+            if other_seen[child] and (best is None or dist[child] + other_dist[child] < best):
+                best, meet = dist[child] + other_dist[child], child
+
+    if meet < 0:
+        return _not_found(with_path)
+    if not with_path:
+        return best
+    path = _path(graph, parents[0], meet)
+    node = parents[1][meet]
+    while node >= 0:
+        path.append(graph.nodes[node])
+        node = parents[1][node]
+    return path, best
+
+
+# single source searches over a dict graph: same as above, but return the node label
+# (_MISSING if none) and dicts of distances and predecessors of the reached nodes
+
+
+def _bfs(edges, start, is_target=None):
+    dist = {start: 0}
+    parents = {start: None}
+    q = deque([start])
+
+    while q:
+        node = q.popleft()
+        if is_target is not None and is_target(node):
+            return node, dist, parents
+        edge = edges.get(node)
+        if edge is None:
+            continue  # no outgoing edges
+        total_dist = dist[node]
+        for child, d in edge_iter(edge):
+            if child in dist:
+                continue
+            dist[child] = total_dist + d
+            parents[child] = node
+            q.append(child)
+    return _MISSING, dist, parents
 
 
 def _dfs(edges, cur, is_target, path_set=None, total_dist=0, best=0):
@@ -66,64 +425,310 @@ def _dfs(edges, cur, is_target, path_set=None, total_dist=0, best=0):
     return best
 
 
-def _dijkstra(edges, start, is_target, with_path=True):
-    paths = []
-    heapq.heappush(paths, (0, [start] if with_path else start))
-    min_costs = {start: 0}
-    while paths:
-        total_dist, path = heapq.heappop(paths)
-        node = path[-1] if with_path else path
-        if is_target(node):
-            return (path, total_dist) if with_path else total_dist
-        if node not in edges:
+def _dijkstra(edges, start, is_target=None):
+    dist = {start: 0}
+    parents = {start: None}
+    tie = count()  # nodes need not be comparable
+    heap = [(0, 0, start)]
+    while heap:
+        total_dist, _, node = heapq.heappop(heap)
+        if total_dist > dist[node]:
+            continue  # stale entry - node was reached cheaper in the meantime
+        if is_target is not None and is_target(node):
+            return node, dist, parents
+        edge = edges.get(node)
+        if edge is None:
             continue
-        for child, dist in edge_iter(edges[node]):
-            costs = total_dist + dist
-            if child not in min_costs or costs < min_costs[child]:
+        for child, d in edge_iter(edge):
+            costs = total_dist + d
+            if child not in dist or costs < dist[child]:
                 # found a (cheaper) path to child
-                min_costs[child] = costs
-                heapq.heappush(paths, (costs, [*path, child] if with_path else child))
+                dist[child] = costs
+                parents[child] = node
+                heapq.heappush(heap, (costs, next(tie), child))
+    return _MISSING, dist, parents
+
+
+def _astar(edges, start, is_target, heuristic, consistent=False):
+    dist = {start: 0}
+    parents = {start: None}
+    closed = set() if consistent else None
+    tie = count()
+    # ties on the estimate go to the deeper node, which is usually closer to the target
+    heap = [(heuristic(start), 0, 0, start)]
+    while heap:
+        _, total_dist, _, node = heapq.heappop(heap)
+        total_dist = -total_dist
+        if total_dist > dist[node]:
+            continue  # stale entry - node was reached cheaper in the meantime
+        if consistent:
+            if node in closed:
+                continue
+            closed.add(node)
+        if is_target(node):
+            return node, dist, parents
+        edge = edges.get(node)
+        if edge is None:
+            continue
+        for child, d in edge_iter(edge):
+            if consistent and child in closed:
+                continue
+            costs = total_dist + d
+            if child not in dist or costs < dist[child]:
+                dist[child] = costs
+                parents[child] = node
+                heapq.heappush(heap, (costs + heuristic(child), -costs, next(tie), child))
+    return _MISSING, dist, parents
 
-    return (None, -1) if with_path else -1
+
+def _search(search, compiled_search, edges, start, destination, with_path=True):
+    if isinstance(edges, CompiledGraph):
+        return _compiled(compiled_search, edges, start, destination, with_path)
+    is_target = destination if callable(destination) else lambda e: e == destination
+    node, dist, parents = search(edges, start, is_target)
+    if node is _MISSING:
+        return _not_found(with_path)
+    return (_build_path(parents, node), dist[node]) if with_path else dist[node]
+
+
+def _compiled(search, graph, start, destination, with_path=True):
+    if start not in graph.ids:
+        # a node without any edges: only the trivial path
+        found = destination(start) if callable(destination) else start == destination
+        if not found:
+            return _not_found(with_path)
+        return ([start], 0) if with_path else 0
+    node, dist, parents, _ = search(graph, graph.ids[start], _target(graph, destination))
+    if node < 0:
+        return _not_found(with_path)
+    return (_path(graph, parents, node), dist[node]) if with_path else dist[node]
+
+
+def _search_all(search, compiled_search, edges, start):
+    if not isinstance(edges, CompiledGraph):
+        _, dist, parents = search(edges, start)
+        return ShortestPaths(start, dist, parents)
+    if start not in edges.ids:
+        return ShortestPaths(start, {start: 0}, {start: None})
+    nodes = edges.nodes
+    _, dist, parents, reached = compiled_search(edges, edges.ids[start])
+    dist_map, parent_map = {}, {}
+    for i, flag in enumerate(reached):
+        if flag:
+            node = nodes[i]
+            dist_map[node] = dist[i]
+            parent_map[node] = nodes[parents[i]] if parents[i] >= 0 else None
+    return ShortestPaths(start, dist_map, parent_map)
+
+
+def bfs_all(edges, start):
+    return _search_all(_bfs, _compiled_bfs, edges, start)
+
+
+def dijkstra_all(edges, start):
+    return _search_all(_dijkstra, _compiled_dijkstra, edges, start)
 
 
 def bfs_all_nodes(edges, start):
+    if not isinstance(edges, CompiledGraph):
+        q = deque()
+        q.append(start)
+        seen = set()
+        while q:
+            node = q.popleft()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node in edges:
+                for child, _ in edge_iter(edges[node]):
+                    q.append(child)
+        return seen
+    if start not in edges.ids:
+        return {start}
+    offsets, targets = edges.offsets, edges.targets
     q = deque()
-    q.append(start)
-    seen = set()
+    q.append(edges.ids[start])
+    seen = bytearray(len(edges.nodes))
     while q:
         node = q.popleft()
-        if node in seen:
+        if seen[node]:
             continue
-        seen.add(node)
-        for child, _ in edge_iter(edges[node]):
-            q.append(child)
-    return seen
-
-
-def bfs(edges, start, destination):
-    is_target = destination if callable(destination) else lambda e: e == destination
-    return _bfs(edges, start, is_target)
-
-
-def bfs_length(edges, start, destination):
-    is_target = destination if callable(destination) else lambda e: e == destination
-    return _bfs(edges, start, is_target, with_path=False)
+        seen[node] = 1
+        q.extend(targets[offsets[node] : offsets[node + 1]])
+    return {edges.nodes[i] for i, flag in enumerate(seen) if flag}
+
+
+# reversed adjacency of the last dict graphs searched bidirectionally: id(edges) -> (edges,
+# node count, reverse). Building it costs a pass over all edges, which only pays off when a
+# graph is queried more than once - so the first query just marks the dict (reverse None).
+# The dict is kept alive so its id cannot be reused; a changed node count rebuilds the
+# reverse, edits to the edges of existing nodes are not noticed.
+_REVERSED = {}
+_REVERSED_MAXSIZE = 2
+
+
+def _reverse_edges(edges):
+    cached = _REVERSED.pop(id(edges), None)
+    if cached is not None and cached[0] is edges and cached[1] == len(edges):
+        reverse = cached[2]
+        if reverse is None:
+            reverse = defaultdict(list)
+            for node, edge in edges.items():
+                for child, dist in edge_iter(edge):
+                    reverse[child].append((node, dist))
+            reverse = dict(reverse)
+    else:
+        reverse = None
+    if len(_REVERSED) >= _REVERSED_MAXSIZE:
+        del _REVERSED[next(iter(_REVERSED))]
+    _REVERSED[id(edges)] = (edges, len(edges), reverse)
+    return reverse
+
+
+def _adjacency(edges, reverse):
+    # neighbor functions of the forward and the backward search
+    def forward(node):
+        return edge_iter(edges[node]) if node in edges else ()
+
+    return forward, lambda node: reverse.get(node, ())
+
+
+def _bidirectional_bfs(edges, reverse, start, target, with_path=True):
+    if start == target:
+        return ([start], 0) if with_path else 0
+    adjacency = _adjacency(edges, reverse)
+    links = ({start: None}, {target: None})
+    frontiers = [[start], [target]]
+
+    while frontiers[0] and frontiers[1]:
+        k = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other, neighbors = links[k], links[1 - k], adjacency[k]
+        q = []
+        for node in frontiers[k]:
+            for child, dist in neighbors(node):
+                if child in seen:
+                    continue
+                seen[child] = (node, dist)
+                if child in other:
+                    path, total_dist = _join_paths(links, child)
+                    return (path, total_dist) if with_path else total_dist
+                q.append(child)
+        frontiers[k] = q
+    return _not_found(with_path)
+
+
+def _bidirectional_dijkstra(edges, reverse, start, target, with_path=True):
+    # same as _compiled_bidirectional_dijkstra over the dict and its reverse
+    if start == target:
+        return ([start], 0) if with_path else 0
+    adjacency = _adjacency(edges, reverse)
+    dists = ({start: 0}, {target: 0})
+    parents = ({start: None}, {target: None})
+    tie = count()
+    heaps = ([(0, 0, start)], [(0, 0, target)])
+    best, meet = None, _MISSING
+
+    while heaps[0] and heaps[1]:
+        if best is not None and heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        k = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        total_dist, _, node = heapq.heappop(heaps[k])
+        dist, parent, other_dist = dists[k], parents[k], dists[1 - k]
+        if total_dist > dist[node]:
+            continue  # stale entry - node was reached cheaper in the meantime
+        for child, d in adjacency[k](node):
+            costs = total_dist + d
+            if child not in dist or costs < dist[child]:
+                dist[child] = costs
+                parent[child] = node
+                heapq.heappush(heaps[k], (costs, next(tie), child))
+            if child in other_dist and (best is None or dist[child] + other_dist[child] < best):
+                best, meet = dist[child] + other_dist[child], child
+
+    if meet is _MISSING:
+        return _not_found(with_path)
+    if not with_path:
+        return best
+    path = _build_path(parents[0], meet)
+    node = parents[1][meet]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    return path, best
+
+
+def _bidirectional(searches, edges, start, destination, with_path=True):
+    # searches: bidirectional dict search, bidirectional CSR search, one sided dict search
+    search, compiled_search, one_sided = searches
+    if callable(destination):
+        raise ValueError("bidirectional search needs a destination node, not a predicate")
+    if not isinstance(edges, CompiledGraph):
+        reverse = _reverse_edges(edges)
+        if reverse is None:  # first query on this dict
+            return _search(one_sided, None, edges, start, destination, with_path)
+        return search(edges, reverse, start, destination, with_path)
+    if start not in edges.ids or destination not in edges.ids:
+        # a node without any edges on either end: only the trivial path
+        if start != destination:
+            return _not_found(with_path)
+        return ([start], 0) if with_path else 0
+    return compiled_search(edges, edges.ids[start], edges.ids[destination], with_path)
+
+
+def bfs(edges, start, destination, bidirectional=False):
+    if bidirectional:
+        searches = _bidirectional_bfs, _compiled_bidirectional_bfs, _bfs
+        return _bidirectional(searches, edges, start, destination)
+    return _search(_bfs, _compiled_bfs, edges, start, destination)
+
+
+def bfs_length(edges, start, destination, bidirectional=False):
+    if bidirectional:
+        searches = _bidirectional_bfs, _compiled_bidirectional_bfs, _bfs
+        return _bidirectional(searches, edges, start, destination, with_path=False)
+    return _search(_bfs, _compiled_bfs, edges, start, destination, with_path=False)
 
 
 def dfs(edges, start, destination):
     is_target = destination if callable(destination) else lambda e: e == destination
-    return _dfs(edges, start, is_target)
+    if not isinstance(edges, CompiledGraph):
+        return _dfs(edges, start, is_target)
+    if start not in edges.ids:
+        return 0
+    nodes = edges.nodes
+    return _compiled_dfs(edges, edges.ids[start], lambda i: is_target(nodes[i]))
+
+
+def dijkstra(edges, start, destination, bidirectional=False):
+    if bidirectional:
+        searches = _bidirectional_dijkstra, _compiled_bidirectional_dijkstra, _dijkstra
+        return _bidirectional(searches, edges, start, destination)
+    return _search(_dijkstra, _compiled_dijkstra, edges, start, destination)
+
+
+def dijkstra_length(edges, start, destination, bidirectional=False):
+    if bidirectional:
+        searches = _bidirectional_dijkstra, _compiled_bidirectional_dijkstra, _dijkstra
+        return _bidirectional(searches, edges, start, destination, with_path=False)
+    return _search(_dijkstra, _compiled_dijkstra, edges, start, destination, with_path=False)
+
+
+def _astar_searches(heuristic, consistent):
+    return (
+        lambda edges, start, is_target: _astar(edges, start, is_target, heuristic, consistent),
+        lambda graph, start, is_target: _compiled_astar(
+            graph, start, is_target, heuristic, consistent
+        ),
+    )
 
 
-def dijkstra(edges, start, destination):
-    is_target = destination if callable(destination) else lambda e: e == destination
-    return _dijkstra(edges, start, is_target)
+def astar(edges, start, destination, heuristic, consistent=False):
+    return _search(*_astar_searches(heuristic, consistent), edges, start, destination)
 
 
-def dijkstra_length(edges, start, destination):
-    is_target = destination if callable(destination) else lambda e: e == destination
-    return _dijkstra(edges, start, is_target, with_path=False)
+def astar_length(edges, start, destination, heuristic, consistent=False):
+    searches = _astar_searches(heuristic, consistent)
+    return _search(*searches, edges, start, destination, with_path=False)
 
 
 if __name__ == "__main__":
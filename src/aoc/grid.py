@@ -1,15 +1,554 @@
 from __future__ import annotations
 
 import heapq
-from collections import deque
-from collections.abc import Callable, Iterator
+import os
+import random
+from array import array
+from collections import deque, namedtuple
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from math import gcd
+from multiprocessing import shared_memory
 
+from . import automaton
+from .automaton import Automaton
+from .obstacles import ObstacleIndex
 from .point import ALL_ADJACENTS, DIRECT_ADJACENTS, Point
+from .rect import Rect
+
+
+def _build_path(parents: dict, node):
+    """Walk the predecessor map back from node and return the path start -> node."""
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
+
+
+def _search_result(result, with_path: bool):
+    """Format the (goal, cost, parents) outcome of a search as (path, cost) or just the cost."""
+    if result is None:
+        return None if with_path else -1
+    node, total, parents = result
+    return (_build_path(parents, node), total) if with_path else total
+
+
+def _index_result(result, with_path: bool, width: int):
+    """Format the (goal index, cost, parents) outcome of an index based search."""
+    if result is None:
+        return None if with_path else -1
+    i, total, parents = result
+    if not with_path:
+        return total
+    path = []
+    while i >= 0:
+        path.append(Point(i % width, i // width))
+        i = parents[i]
+    path.reverse()
+    return path, total
+
+
+# cost functions declaring a max_cost up to this bound are searched with a bucket queue
+BUCKET_QUEUE_MAX_COST = 64
+
+
+def bounded_cost(max_cost: int):
+    """
+    Decorator declaring that a grid cost function only returns integers in 0..max_cost.
+    Grid.dijkstra uses a bucket queue instead of a heap for such cost functions.
+
+    :param max_cost: the largest cost a single step can have
+    """
+
+    def decorate(fn):
+        fn.max_cost = max_cost
+        return fn
+
+    return decorate
+
+
+# state of a walker on a grid: position, heading (index into DIRECT_ADJACENTS: N, E, S, W) and
+# the number of steps taken in that heading
+GridState = namedtuple("GridState", "pos,heading,steps", defaults=[1, 0])
+
+
+def momentum_rule(
+    min_run: int = 1, max_run: int = 3, cost: Callable[[str], int] | None = None
+) -> Callable[[Grid, GridState], Iterator[tuple[GridState, int]]]:
+    """
+    Transition rule for walkers that must go straight between min_run and max_run steps before
+    turning left or right (no reversing). A state with 0 steps may turn freely.
+    Use with Grid.state_search(..., max_steps=max_run).
+
+    :param min_run: minimum number of steps in one heading before turning
+    :param max_run: maximum number of steps in one heading
+    :param cost: cost of entering a cell by its value (default: the digit value)
+    """
+    if cost is None:
+        cost = int
+
+    def rule(grid: Grid, state: GridState) -> Iterator[tuple[GridState, int]]:
+        pos, heading, steps = state
+        for turn in (0, 1, 3):
+            if turn == 0:
+                if steps >= max_run:
+                    continue
+                new_steps = steps + 1
+            else:
+                if 0 < steps < min_run:
+                    continue
+                new_steps = 1
+            new_heading = (heading + turn) % 4
+            dx, dy = DIRECT_ADJACENTS[new_heading]
+            np = Point(pos[0] + dx, pos[1] + dy)
+            if np in grid:
+                yield GridState(np, new_heading, new_steps), cost(grid[np])
+
+    return rule
+
+
+def turning_rule(
+    step_cost: int = 1, turn_cost: int = 1000
+) -> Callable[[Grid, GridState], Iterator[tuple[GridState, int]]]:
+    """
+    Transition rule for walkers that either step forward or rotate by 90 degrees in place.
+    Use with Grid.state_search(..., max_steps=0).
+
+    :param step_cost: cost of a step forward
+    :param turn_cost: cost of a clockwise or counterclockwise rotation
+    """
+
+    def rule(grid: Grid, state: GridState) -> Iterator[tuple[GridState, int]]:
+        pos, heading, _ = state
+        dx, dy = DIRECT_ADJACENTS[heading]
+        yield GridState(Point(pos[0] + dx, pos[1] + dy), heading, 0), step_cost
+        yield GridState(pos, (heading + 1) % 4, 0), turn_cost
+        yield GridState(pos, (heading + 3) % 4, 0), turn_cost
+
+    return rule
+
+
+# Zobrist keys: one random table per grid size, mixed with a random multiplier per cell value,
+# so the memory does not grow with the number of distinct values
+_ZOBRIST_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+@lru_cache(maxsize=4)
+def _zobrist_table(size: int) -> array:
+    return array("Q", random.Random(size).randbytes(8 * size))
+
+
+@lru_cache(maxsize=1024)
+def _zobrist_multiplier(value: str) -> int:
+    return random.Random(value).getrandbits(64) | 1
+
+
+def _zobrist_key(table_key: int, multiplier: int) -> int:
+    # fold the 128 bit product, so every bit of the key depends on all bits of both factors
+    m = table_key * multiplier
+    return (m ^ m >> 64) & _ZOBRIST_MASK
+
+
+# result of Grid.run_until_cycle: the state after n steps, the step the cycle starts at and its
+# length (-1 and 0 if no state repeated)
+Cycle = namedtuple("Cycle", "grid,start,length")
+
+
+# result of Grid.poi_distances: the points of interest and the dense matrix of their pairwise
+# BFS distances (distances[i][j] from points[i] to points[j], -1 if unreachable)
+PoiMatrix = namedtuple("PoiMatrix", "points,distances")
+
+
+def _poi_row(ok: bytes, offsets: array, targets: array, pois: list[int], source: int) -> list[int]:
+    """BFS distances from pois[source] to all pois, stopping once every poi was reached."""
+    seen = bytearray(ok)
+    where = {}
+    for k, i in enumerate(pois):
+        where.setdefault(i, []).append(k)
+    row = [-1] * len(pois)
+    missing = len(pois)
+    start = pois[source]
+    seen[start] = 0
+    frontier = [start]
+    dist = 0
+    while frontier and missing:
+        queued = []
+        for i in frontier:
+            for k in where.get(i, ()):
+                row[k] = dist
+                missing -= 1
+            for j in targets[offsets[i] : offsets[i + 1]]:
+                if seen[j]:
+                    seen[j] = 0
+                    queued.append(j)
+        frontier = queued
+        dist += 1
+    return row
+
+
+def _poi_rows(
+    name: str, width: int, height: int, diagonal: bool, pois: list[int], sources: list[int]
+) -> list[list[int]]:
+    """Worker side of Grid.poi_distances: read the passable mask from shared memory once."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        ok = bytes(shm.buf[: width * height])
+    finally:
+        shm.close()
+    _, _, offsets, targets = _geometry_table(width, height, diagonal)
+    return [_poi_row(ok, offsets, targets, pois, k) for k in sources]
+
+
+def _row_major(p: Point) -> tuple[int, int]:
+    return p[1], p[0]
+
+
+# CSR neighbor table of a width x height grid: the neighbors of cell i = y * width + x are
+# targets[offsets[i]:offsets[i + 1]], in the order of DIRECT_ADJACENTS / ALL_ADJACENTS
+NeighborTable = namedtuple("NeighborTable", "width,height,offsets,targets")
+
+
+def _build_table(width: int, height: int, diagonal: bool, ok: bytearray | None) -> NeighborTable:
+    adjacents = ALL_ADJACENTS if diagonal else DIRECT_ADJACENTS
+    steps = [(dx, dy, dy * width + dx) for dx, dy in adjacents]
+    offsets = array("i", [0])
+    targets = array("i")
+    for y in range(height):
+        # only the steps staying inside the grid vertically, the x check is left per cell
+        row_steps = [(dx, di) for dx, dy, di in steps if 0 <= y + dy < height]
+        base = y * width
+        for x in range(width):
+            i = base + x
+            targets.extend(
+                [
+                    i + di
+                    for dx, di in row_steps
+                    if 0 <= x + dx < width and (ok is None or ok[i + di])
+                ]
+            )
+            offsets.append(len(targets))
+    return NeighborTable(width, height, offsets, targets)
+
+
+@lru_cache(maxsize=8)
+def _geometry_table(width: int, height: int, diagonal: bool) -> NeighborTable:
+    """Unfiltered neighbor table - it only depends on the grid size, so it is shared."""
+    return _build_table(width, height, diagonal, None)
+
+
+def _index_neighbors(width: int, height: int, diagonal: bool) -> Callable[[int], list[int]]:
+    """
+    Neighbor cell indices of a cell computed on the fly, in the order of the neighbor table.
+    Point-to-point searches use this instead of building the table for the whole grid.
+    """
+    last, bottom = width - 1, width * (height - 1)
+    if not diagonal:
+
+        def neighbors(i: int) -> list[int]:
+            x = i % width
+            out = [i - width] if i >= width else []
+            if x < last:
+                out.append(i + 1)
+            if i < bottom:
+                out.append(i + width)
+            if x:
+                out.append(i - 1)
+            return out
+
+        return neighbors
+
+    def diagonal_neighbors(i: int) -> list[int]:
+        x = i % width
+        left, right, up, down = x > 0, x < last, i >= width, i < bottom
+        out = []
+        if up:
+            out.append(i - width)
+            if right:
+                out.append(i - width + 1)
+        if right:
+            out.append(i + 1)
+            if down:
+                out.append(i + width + 1)
+        if down:
+            out.append(i + width)
+            if left:
+                out.append(i + width - 1)
+        if left:
+            out.append(i - 1)
+            if up:
+                out.append(i - width - 1)
+        return out
+
+    return diagonal_neighbors
+
+
+class _LazyCells:
+    """
+    Cell values and passability of a grid evaluated on first touch, so a search only pays for
+    the cells it reaches. state[i] is 0 while cell i is not evaluated, then 1 if it is
+    passable and 2 if not (searches may set 2 to mark visited cells as well).
+    """
+
+    def __init__(self, grid: Grid, passable: Callable[[str], bool]):
+        self.width = grid.width
+        self.state = bytearray(grid.width * grid.height)
+        self._grid = grid
+        self._passable = passable
+        self._lookup = {}
+        self._rows = {}
+
+    def value(self, i: int) -> str:
+        y, x = divmod(i, self.width)
+        row = self._rows.get(y)
+        if row is None:
+            row = self._rows[y] = self._grid._row_values(y)
+        return row[x]
+
+    def fill(self, i: int) -> int:
+        """Evaluate cell i and return its state."""
+        v = self.value(i)
+        r = self._lookup.get(v)
+        if r is None:
+            r = self._lookup[v] = 1 if self._passable(v) else 2
+        self.state[i] = r
+        return r
+
+
+def _add_period(lattice: tuple[int, int, int], p: int, q: int) -> tuple[int, int, int]:
+    """
+    Add the vector (p, q) to a 2d integer lattice in Hermite normal form (a, b, c), i.e. the
+    lattice spanned by (a, b) and (0, c) with a, c >= 0 (b == 0 if a == 0).
+    """
+    a, b, c = lattice
+    if a == 0 and p == 0:
+        return 0, 0, gcd(c, q)
+    # extended euclid on the x components: g = s * a + t * p
+    g, s, t, r, s1, t1 = a, 1, 0, p, 0, 1
+    while r:
+        k = g // r
+        g, r, s, s1, t, t1 = r, g - k * r, s1, s - k * s1, t1, t - k * t1
+    if g < 0:
+        g, s, t = -g, -s, -t
+    # (a, b) and (p, q) span the same vectors as (g, s * b + t * q) and (0, rest)
+    rest = a // g * q - p // g * b
+    c = gcd(c, rest)
+    b = s * b + t * q
+    return g, b % c if c else b, c
+
+
+def _in_lattice(lattice: tuple[int, int, int], p: int, q: int) -> bool:
+    a, b, c = lattice
+    if a == 0:
+        if p:
+            return False
+    elif p % a:
+        return False
+    else:
+        q -= p // a * b
+    return q % c == 0 if c else q == 0
+
+
+def _tiled_reachable(grid: Grid, start, goal, diagonal: bool, passable) -> bool:
+    """
+    Whether goal can be reached from start on a tiled (infinite) grid. Sweeps a single tile:
+    every cell remembers the tile it was first reached in, and reaching it again in another
+    tile adds the tile difference as a period - the reachable region repeats by every
+    combination of periods.
+    """
+    w, h = grid.width, grid.height
+    gx, gy = goal[0], goal[1]
+    if start[0] == gx and start[1] == gy:
+        return True
+    cells = _LazyCells(grid, passable)
+    state, fill = cells.state, cells.fill
+    i = gy % h * w + gx % w
+    if (state[i] or fill(i)) != 1:
+        return False
+    i = start[1] % h * w + start[0] % w
+    if (state[i] or fill(i)) != 1:
+        # the start is never entered again, so its copies are not connected through it
+        return any(
+            _tiled_reachable(grid, p, goal, diagonal, passable)
+            for p in grid.neighbors(start, diagonal)
+            if passable(grid[p])
+        )
+
+    adjacents = ALL_ADJACENTS if diagonal else DIRECT_ADJACENTS
+    tiles = {i: (start[0] // w, start[1] // h)}
+    lattice = (0, 0, 0)
+    queue = deque([(start[0], start[1])])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in adjacents:
+            nx, ny = x + dx, y + dy
+            j = ny % h * w + nx % w
+            if (state[j] or fill(j)) != 1:
+                continue
+            first = tiles.get(j)
+            if first is None:
+                tiles[j] = (nx // w, ny // h)
+                queue.append((nx, ny))
+            elif first[0] != nx // w or first[1] != ny // h:
+                lattice = _add_period(lattice, nx // w - first[0], ny // h - first[1])
+
+    first = tiles.get(gy % h * w + gx % w)
+    return first is not None and _in_lattice(lattice, gx // w - first[0], gy // h - first[1])
+
+
+class DistanceMap:
+    """
+    Distances from one or more sources to every cell of a grid.
+
+    Stored as a flat array indexed by y * width + x; unreached cells hold -1.
+    Supports dict-like lookup by Point for reached cells.
+    """
+
+    def __init__(self, width: int, height: int, dist: array):
+        self.width = width
+        self.height = height
+        self._dist = dist
+
+    def _lookup(self, p: Point | tuple) -> int:
+        x, y = p[0], p[1]
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._dist[y * self.width + x]
+        return -1
+
+    def __getitem__(self, p: Point | tuple) -> int:
+        d = self._lookup(p)
+        if d < 0:
+            raise KeyError(p)
+        return d
+
+    def get(self, p: Point | tuple, default: int | None = None) -> int | None:
+        d = self._lookup(p)
+        return d if d >= 0 else default
+
+    def __contains__(self, p: Point | tuple) -> bool:
+        return self._lookup(p) >= 0
+
+    def __len__(self) -> int:
+        return len(self._dist) - self._dist.count(-1)
+
+    def __iter__(self) -> Iterator[Point]:
+        for p, _ in self.items():
+            yield p
+
+    def items(self) -> Iterator[tuple[Point, int]]:
+        w = self.width
+        for i, d in enumerate(self._dist):
+            if d >= 0:
+                yield Point(i % w, i // w), d
+
+    def within(self, n: int) -> int:
+        """Number of reached cells with a distance of at most n."""
+        return sum(1 for d in self._dist if 0 <= d <= n)
+
+    def max(self) -> int:
+        """Largest distance of any reached cell (-1 if nothing was reached)."""
+        return max(self._dist, default=-1)
+
+    def __repr__(self) -> str:
+        return f"DistanceMap({self.width}x{self.height}, {len(self)} reached)"
+
+
+class CellMask:
+    """
+    Set of grid cells stored as a bitmap with one byte per cell (index y * width + x).
+    Supports membership tests, len and iteration like a set of Points.
+    """
+
+    def __init__(self, width: int, height: int, bits: bytearray):
+        self.width = width
+        self.height = height
+        self.bits = bits
+
+    def __contains__(self, p: Point | tuple) -> bool:
+        x, y = p[0], p[1]
+        return 0 <= x < self.width and 0 <= y < self.height and self.bits[y * self.width + x] == 1
+
+    def __len__(self) -> int:
+        return self.bits.count(1)
+
+    def __iter__(self) -> Iterator[Point]:
+        """Cells in row-major order."""
+        bits, w = self.bits, self.width
+        i = bits.find(1)
+        while i >= 0:
+            yield Point(i % w, i // w)
+            i = bits.find(1, i + 1)
+
+    def to_set(self) -> set[Point]:
+        return set(self)
+
+    def __repr__(self) -> str:
+        return f"CellMask({self.width}x{self.height}, {len(self)} cells)"
+
+
+# one connected region of a grid: its label, the shared key of its cells, the number of cells,
+# the length of its outline, the number of outline corners (= number of sides) and bounding Rect
+Region = namedtuple("Region", "label,key,area,perimeter,corners,bounds")
+
+
+class Components:
+    """
+    Connected regions of a grid (result of Grid.label_components).
+
+    labels is a flat array indexed by y * width + x holding the region label of every cell
+    (-1 for cells without a key); regions[label] holds the statistics of that region.
+    Labels are numbered in row-major order of the regions' first cells.
+    """
+
+    def __init__(self, width: int, height: int, labels: array, regions: list[Region]):
+        self.width = width
+        self.height = height
+        self.labels = labels
+        self.regions = regions
+
+    def label(self, p: Point | tuple) -> int:
+        """Label of the region containing p (-1 if p has no region or lies outside)."""
+        x, y = p[0], p[1]
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.labels[y * self.width + x]
+        return -1
+
+    def region(self, p: Point | tuple) -> Region | None:
+        label = self.label(p)
+        return self.regions[label] if label >= 0 else None
+
+    def cells(self, label: int) -> list[Point]:
+        """All cells of a region in row-major order."""
+        w = self.width
+        return [Point(i % w, i // w) for i, k in enumerate(self.labels) if k == label]
+
+    def __getitem__(self, label: int) -> Region:
+        return self.regions[label]
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def __iter__(self) -> Iterator[Region]:
+        return iter(self.regions)
+
+    def __repr__(self) -> str:
+        return f"Components({self.width}x{self.height}, {len(self.regions)} regions)"
 
 
 class Grid:
     """2D grid with Point-based access."""
 
+    # Zobrist fingerprint - computed on first access of fingerprint, then maintained by
+    # __setitem__
+    _zobrist: int | None = None
+    # value -> positions index - only present after build_index, then maintained by __setitem__
+    _positions: dict[str, set[Point]] | None = None
+    # tiled views have no cell indices - searches fall back to Point based implementations
+    _unbounded = False
+
     def __init__(self, data: list[str] | list[list[str]]):
         """Create grid from list of strings or list of lists."""
         if not data:
@@ -43,11 +582,42 @@ class Grid:
         return self._data[p[1]][p[0]]
 
     def __setitem__(self, p: Point | tuple, value: str):
-        self._data[p[1]][p[0]] = value
+        row = self._data[p[1]]
+        if self._zobrist is not None:
+            self._update_fingerprint(p, row[p[0]], value)
+        if self._positions is not None:
+            self._update_index(p, row[p[0]], value)
+        row[p[0]] = value
 
     def __contains__(self, p: Point | tuple) -> bool:
         return 0 <= p[0] < self.width and 0 <= p[1] < self.height
 
+    @property
+    def fingerprint(self) -> int:
+        """
+        64 bit Zobrist hash of all cell values. Computed once in O(width * height) on first
+        access and from then on updated in O(1) by every __setitem__. Equal grids of the same
+        size have equal fingerprints.
+        """
+        if self._zobrist is None:
+            table = _zobrist_table(self.width * self.height)
+            multipliers = {}
+            h = 0
+            for t, v in zip(table, self._values()):
+                c = multipliers.get(v)
+                if c is None:
+                    c = multipliers[v] = _zobrist_multiplier(v)
+                m = t * c
+                h ^= m ^ m >> 64  # _zobrist_key, masked once at the end
+            self._zobrist = h & _ZOBRIST_MASK
+        return self._zobrist
+
+    def _update_fingerprint(self, p: Point | tuple, old: str, new: str):
+        w, h = self.width, self.height
+        t = _zobrist_table(w * h)[(p[1] % h) * w + p[0] % w]
+        key, multiplier = _zobrist_key, _zobrist_multiplier
+        self._zobrist ^= key(t, multiplier(old)) ^ key(t, multiplier(new))
+
     def get(self, p: Point | tuple, default: str | None = None) -> str | None:
         if p in self:
             return self[p]
@@ -66,15 +636,86 @@ class Grid:
         for row in self._data:
             yield "".join(row)
 
+    def _values(self) -> Iterable[str]:
+        """All cell values in row-major order (index y * width + x)."""
+        return chain.from_iterable(self._data)
+
+    def _row_values(self, y: int) -> Sequence[str]:
+        """Cell values of row y."""
+        return self._data[y]
+
+    def _assign_values(self, values: list[str]):
+        """Replace all cell values from a row-major list."""
+        self._zobrist = None
+        w = self.width
+        for y in range(self.height):
+            self._data[y] = values[y * w : (y + 1) * w]
+        if self._positions is not None:
+            self.build_index()
+
+    def _copy_state(self, grid: Grid) -> Grid:
+        """Carry fingerprint and value index over to a copy of this grid."""
+        grid._zobrist = self._zobrist
+        if self._positions is not None:
+            grid._positions = {v: set(ps) for v, ps in self._positions.items()}
+        return grid
+
+    def _mask(self, predicate: Callable[[str], bool]) -> bytearray:
+        """One byte per cell in row-major order: 1 where predicate(value) holds, else 0."""
+        lookup = {v: 1 if predicate(v) else 0 for v in set(self._values())}
+        return bytearray(map(lookup.__getitem__, self._values()))
+
+    def build_index(self):
+        """
+        Index the positions of every value in one pass. From then on __setitem__ keeps the
+        index up to date and find, find_all and count only look at the matching cells.
+        """
+        w = self.width
+        positions = {}
+        for i, v in enumerate(self._values()):
+            if v in positions:
+                positions[v].add(Point(i % w, i // w))
+            else:
+                positions[v] = {Point(i % w, i // w)}
+        self._positions = positions
+
+    def drop_index(self):
+        """Stop maintaining the value index."""
+        self._positions = None
+
+    def _update_index(self, p: Point | tuple, old: str, new: str):
+        p = Point(p[0] % self.width, p[1] % self.height)
+        positions = self._positions
+        old_positions = positions.get(old)
+        if old_positions is not None:
+            old_positions.discard(p)
+            if not old_positions:
+                del positions[old]
+        if new in positions:
+            positions[new].add(p)
+        else:
+            positions[new] = {p}
+
     def find(self, value: str) -> Point | None:
+        if self._positions is not None:
+            positions = self._positions.get(value)
+            return min(positions, key=_row_major) if positions else None
         for p, v in self.items():
             if v == value:
                 return p
         return None
 
     def find_all(self, value: str) -> list[Point]:
+        if self._positions is not None:
+            return sorted(self._positions.get(value, ()), key=_row_major)
         return [p for p, v in self.items() if v == value]
 
+    def count(self, value: str) -> int:
+        """Number of cells holding value."""
+        if self._positions is not None:
+            return len(self._positions.get(value, ()))
+        return sum(1 for v in self._values() if v == value)
+
     def neighbors(self, p: Point | tuple, diagonal: bool = False) -> Iterator[Point]:
         adjacents = ALL_ADJACENTS if diagonal else DIRECT_ADJACENTS
         for dx, dy in adjacents:
@@ -88,30 +729,106 @@ class Grid:
         for np in self.neighbors(p, diagonal):
             yield np, self[np]
 
+    def neighbor_table(
+        self, diagonal: bool = False, passable: Callable[[str], bool] | None = None
+    ) -> NeighborTable:
+        """
+        CSR neighbor table: flat integer arrays with the neighbor cell indices of every cell
+        (index y * width + x). The neighbors of cell i are targets[offsets[i]:offsets[i + 1]].
+        The unfiltered table only depends on the grid size and is cached; with passable only
+        passable neighbors are listed, which reflects the current cell values.
+
+        :param diagonal: Include diagonal neighbors
+        :param passable: Only list neighbors whose value satisfies this predicate
+        """
+        if passable is None:
+            return _geometry_table(self.width, self.height, diagonal)
+        return _build_table(self.width, self.height, diagonal, self._mask(passable))
+
+    def _index(self, p: Point | tuple) -> int:
+        if p not in self:
+            raise IndexError(f"{p} outside of grid")
+        return p[1] * self.width + p[0]
+
+    def _index_goal(self, goal) -> tuple[int, Callable[[Point], bool] | None]:
+        """Split a search goal into a cell index (-1 if none) and a predicate (None if none)."""
+        if callable(goal):
+            return -1, goal
+        if goal in self:
+            return goal[1] * self.width + goal[0], None
+        return -1, None
+
     def flood_fill(
-        self, start: Point | tuple, predicate: Callable[[str], bool] | None = None
-    ) -> set[Point]:
+        self,
+        start: Point | tuple,
+        predicate: Callable[[str], bool] | None = None,
+        as_mask: bool = False,
+    ) -> set[Point] | CellMask:
+        """
+        Fill the region of cells connected to start (direct neighbors only) whose value
+        satisfies predicate (default: equal to the start value).
+        Scanline fill: every horizontal run is filled at once into a bitmap and the rows above
+        and below are scanned for the runs to continue with. The predicate is only evaluated
+        on rows the fill reaches (once per distinct value).
+
+        :param start: Starting point
+        :param predicate: Predicate on cell values to include
+        :param as_mask: Return the CellMask bitmap instead of converting it to a set of Points
+        :raises TypeError: on tiled views, whose regions may be infinite
+        """
         if predicate is None:
             start_value = self[start]
 
             def predicate(v):
                 return v == start_value
 
-        result = set()
-        queue = deque([Point(*start) if not isinstance(start, Point) else start])
+        if self._unbounded:
+            raise TypeError("tiled views are unbounded - flood fill a single tile instead")
 
-        while queue:
-            p = queue.popleft()
-            if p in result or p not in self:
-                continue
-            if not predicate(self[p]):
+        w, h = self.width, self.height
+        filled = bytearray(w * h)
+        mask = CellMask(w, h, filled)
+        if start not in self:
+            return mask if as_mask else set()
+
+        lookup = {}
+        # predicate results per reached row - filled cells are cleared, so they double as the
+        # visited marker
+        open_rows = {}
+
+        def open_row(y: int) -> bytearray:
+            row = open_rows.get(y)
+            if row is None:
+                values = self._row_values(y)
+                for v in set(values).difference(lookup):
+                    lookup[v] = 1 if predicate(v) else 0
+                row = open_rows[y] = bytearray(map(lookup.__getitem__, values))
+            return row
+
+        stack = [(start[0], start[1])]
+        while stack:
+            x, y = stack.pop()
+            row = open_row(y)
+            if not row[x]:
                 continue
-            result.add(p)
-            for np in self.neighbors(p):
-                if np not in result:
-                    queue.append(np)
+            left = row.rfind(0, 0, x) + 1
+            right = row.find(0, x)
+            if right < 0:
+                right = w
+            row[left:right] = bytes(right - left)
+            filled[y * w + left : y * w + right] = b"\x01" * (right - left)
+            for ny in (y - 1, y + 1):
+                if 0 <= ny < h:
+                    above = open_row(ny)
+                    x = above.find(1, left, right)
+                    while x >= 0:
+                        stack.append((x, ny))
+                        x = above.find(0, x, right)
+                        if x < 0:
+                            break
+                        x = above.find(1, x, right)
 
-        return result
+        return mask if as_mask else mask.to_set()
 
     def bfs(
         self,
@@ -119,42 +836,299 @@ class Grid:
         goal: Point | tuple | Callable[[Point], bool],
         diagonal: bool = False,
         passable: Callable[[str], bool] | None = None,
-    ) -> tuple[list[Point], int] | None:
+        with_path: bool = True,
+        bidirectional: bool = False,
+        jump_points: bool = False,
+    ) -> tuple[list[Point], int] | int | None:
         """
         BFS pathfinding. Returns (path, distance) or None if no path found.
+        Runs over cell indices; passable is only evaluated for the cells the search reaches.
 
         :param start: Starting point
         :param goal: Target point or predicate function
         :param diagonal: Include diagonal neighbors
         :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param with_path: Return (path, distance); otherwise only the distance or -1 if no path
+        :param bidirectional: Search from start and goal at the same time (point goals only);
+            explores far fewer cells on open grids and in branching mazes
+        :param jump_points: Use Jump Point Search (point goals only); skips symmetric paths
+            and only expands jump points, which pays off on large open maps
+        :raises IndexError: if start lies outside of the grid
+        :raises TypeError: for a goal predicate on tiled views
         """
         if passable is None:
 
             def passable(v):
                 return v != "#"
 
-        is_goal = goal if callable(goal) else lambda p: p[0] == goal[0] and p[1] == goal[1]
-        start = Point(*start) if not isinstance(start, Point) else start
+        if (bidirectional or jump_points) and callable(goal):
+            raise ValueError("bidirectional and jump point search need a goal point")
+        if bidirectional and jump_points:
+            raise ValueError("choose either bidirectional or jump point search")
 
-        queue = deque([([start], 0)])
-        seen = {start}
+        if self._unbounded:
+            result = self._point_search(start, goal, None, None, diagonal, passable)
+            return _search_result(result, with_path)
 
-        while queue:
-            path, dist = queue.popleft()
-            node = path[-1]
+        w = self.width
+        s = self._index(start)
+        goal_index, is_goal = self._index_goal(goal)
+        if bidirectional or jump_points:
+            if goal_index < 0:
+                return None if with_path else -1
+            search = self._jump_point_search if jump_points else self._bidirectional_bfs
+            return search(s, goal_index, diagonal, passable, with_path)
+        neighbors = _index_neighbors(w, self.height, diagonal)
+        # passability is evaluated per reached cell; queued cells are marked blocked, so the
+        # state doubles as the visited marker
+        cells = _LazyCells(self, passable)
+        state, fill = cells.state, cells.fill
+        parents = {s: -1} if with_path else None
+        state[s] = 2
 
-            if is_goal(node):
-                return path, dist
+        frontier = [s]
+        dist = 0
+        while frontier:
+            queued = []
+            for i in frontier:
+                if i == goal_index or (is_goal is not None and is_goal(Point(i % w, i // w))):
+                    return _index_result((i, dist, parents), with_path, w)
+                for j in neighbors(i):
+                    if (state[j] or fill(j)) == 1:
+                        state[j] = 2
+                        if parents is not None:
+                            parents[j] = i
+                        queued.append(j)
+            frontier = queued
+            dist += 1
 
-            for neighbor in self.neighbors(node, diagonal):
-                if neighbor in seen:
-                    continue
-                if not passable(self[neighbor]):
+        return None if with_path else -1
+
+    def _bidirectional_bfs(self, s, t, diagonal, passable, with_path):
+        """
+        BFS from both ends between cell indices s and t, always expanding the smaller frontier
+        by a whole level. The first edge joining both searches closes a shortest path.
+        """
+        w = self.width
+        if s == t:
+            return ([Point(s % w, s // w)], 0) if with_path else 0
+        cells = _LazyCells(self, passable)
+        state, fill = cells.state, cells.fill
+        if fill(t) != 1:
+            return None if with_path else -1
+
+        neighbors = _index_neighbors(w, self.height, diagonal)
+        n = len(state)
+        # 1: reached from start, 2: reached from goal
+        side = bytearray(n)
+        side[s], side[t] = 1, 2
+        # predecessor towards start / successor towards goal
+        links = (array("i", [-1]) * n, array("i", [-1]) * n) if with_path else None
+        frontiers = [[s], [t]]
+        depths = [0, 0]
+
+        while frontiers[0] and frontiers[1]:
+            k = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            mine, other = k + 1, 2 - k
+            link = links[k] if links else None
+            queued = []
+            for i in frontiers[k]:
+                for j in neighbors(i):
+                    if side[j] == other:
+                        dist = depths[0] + depths[1] + 1
+                        if not with_path:
+                            return dist
+                        # a is on the start side, b on the goal side of the joining edge
+                        a, b = (i, j) if k == 0 else (j, i)
+                        path = []
+                        while a >= 0:
+                            path.append(Point(a % w, a // w))
+                            a = links[0][a]
+                        path.reverse()
+                        while b >= 0:
+                            path.append(Point(b % w, b // w))
+                            b = links[1][b]
+                        return path, dist
+                    if not side[j] and (state[j] or fill(j)) == 1:
+                        side[j] = mine
+                        if link is not None:
+                            link[j] = i
+                        queued.append(j)
+            frontiers[k] = queued
+            depths[k] += 1
+
+        return None if with_path else -1
+
+    def _jump_point_search(self, s, t, diagonal, passable, with_path):
+        """
+        Jump Point Search (A* over jump points) between cell indices s and t at unit step cost.
+        From every jump point the search only continues in its natural and forced directions
+        and jumps along straight lines until it reaches the goal or a cell with a forced
+        neighbor. Without diagonal moves horizontal jumps stop at forced neighbors while
+        vertical jumps branch into horizontal ones at every cell.
+
+        Straight jumps never step cell by cell: every row and column the search touches gets
+        a passable bitmap and a bitmap of the cells with forced neighbors per direction (built
+        with whole-line integer operations), and a jump is a bytes find on those.
+        """
+        w, h = self.width, self.height
+        ok = self._mask(passable)
+        gx, gy = t % w, t // w
+        lines = {}
+        stops = {}
+
+        def line(vertical: bool, k: int) -> bytes:
+            key = (vertical, k)
+            cells = lines.get(key)
+            if cells is None:
+                cells = lines[key] = bytes(ok[k::w] if vertical else ok[k * w : (k + 1) * w])
+            return cells
+
+        def stop_line(vertical: bool, k: int, d: int) -> bytes:
+            key = (vertical, k, d)
+            stop = stops.get(key)
+            if stop is None:
+                n = h if vertical else w
+                full = int.from_bytes(b"\x01" * n, "little")
+                forced = 0
+                for side in (k - 1, k + 1):
+                    if 0 <= side < (w if vertical else h):
+                        # one byte per cell: shifting by 8 bits moves the line by one cell
+                        cells = int.from_bytes(line(vertical, side), "little")
+                        shifted = (cells >> 8, (cells << 8) & full)
+                        ahead, behind = shifted if d > 0 else shifted[::-1]
+                        if diagonal:
+                            forced |= (full ^ cells) & ahead
+                        else:
+                            forced |= cells & (full ^ behind)
+                stop = stops[key] = forced.to_bytes(n, "little")
+            return stop
+
+        def straight(vertical: bool, k: int, pos: int, d: int) -> int:
+            """Next jump point from pos along row / column k in direction d (-1 if none)."""
+            cells = line(vertical, k)
+            stop = stop_line(vertical, k, d)
+            goal = (gy if vertical else gx) if k == (gx if vertical else gy) else -1
+            if d > 0:
+                end = cells.find(0, pos + 1)
+                if end < 0:
+                    end = len(cells)
+                found = stop.find(1, pos + 1, end)
+                if pos < goal < end and (found < 0 or goal < found):
+                    return goal
+            else:
+                end = cells.rfind(0, 0, pos)
+                found = stop.rfind(1, end + 1, pos)
+                if end < goal < pos and goal > found:
+                    return goal
+            return found
+
+        def free(x: int, y: int) -> bool:
+            return 0 <= x < w and 0 <= y < h and ok[y * w + x] == 1
+
+        def jump(x: int, y: int, dx: int, dy: int) -> tuple[int, int] | None:
+            if not dy:
+                found = straight(False, y, x, dx)
+                return (found, y) if found >= 0 else None
+            if diagonal and not dx:
+                found = straight(True, x, y, dy)
+                return (x, found) if found >= 0 else None
+            # diagonal jumps, and vertical jumps without diagonal moves, branch at every cell
+            while True:
+                x += dx
+                y += dy
+                if not free(x, y):
+                    return None
+                if x == gx and y == gy:
+                    return x, y
+                if dx:
+                    if (not free(x - dx, y) and free(x - dx, y + dy)) or (
+                        not free(x, y - dy) and free(x + dx, y - dy)
+                    ):
+                        return x, y
+                    if straight(False, y, x, dx) >= 0 or straight(True, x, y, dy) >= 0:
+                        return x, y
+                elif straight(False, y, x, 1) >= 0 or straight(False, y, x, -1) >= 0:
+                    return x, y
+
+        def directions(x: int, y: int, dx: int, dy: int) -> list[tuple[int, int]]:
+            if not (dx or dy):
+                return ALL_ADJACENTS if diagonal else DIRECT_ADJACENTS
+            if dx and dy:
+                result = [(dx, dy), (dx, 0), (0, dy)]
+                if not free(x - dx, y):
+                    result.append((-dx, dy))
+                if not free(x, y - dy):
+                    result.append((dx, -dy))
+                return result
+            if not diagonal:
+                if dy:
+                    return [(0, dy), (1, 0), (-1, 0)]
+                return [(dx, 0)] + [(0, sy) for sy in (1, -1) if not free(x - dx, y + sy)]
+            result = [(dx, dy)]
+            for side in (1, -1):
+                if dx and not free(x, y + side):
+                    result.append((dx, side))
+                elif dy and not free(x + side, y):
+                    result.append((side, dy))
+            return result
+
+        def heuristic(x: int, y: int) -> int:
+            if diagonal:
+                return max(abs(x - gx), abs(y - gy))
+            return abs(x - gx) + abs(y - gy)
+
+        if s == t or ok[t]:
+            sx, sy = s % w, s // w
+            heap = [(heuristic(sx, sy), 0, s)]
+            costs = {s: 0}
+            parents = {s: -1}
+        else:
+            heap = []
+
+        while heap:
+            _, total, i = heapq.heappop(heap)
+            if total > costs[i]:
+                continue  # stale entry - jump point was reached cheaper in the meantime
+            if i == t:
+                if not with_path:
+                    return total
+                points = []
+                while i >= 0:
+                    points.append(i)
+                    i = parents[i]
+                points.reverse()
+                path = [Point(sx, sy)]
+                for i in points[1:]:
+                    x, y = i % w, i // w
+                    px, py = path[-1]
+                    dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+                    while (px, py) != (x, y):
+                        px, py = px + dx, py + dy
+                        path.append(Point(px, py))
+                return path, total
+
+            x, y = i % w, i // w
+            parent = parents[i]
+            if parent >= 0:
+                px, py = parent % w, parent // w
+                dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+            else:
+                dx = dy = 0
+            for ndx, ndy in directions(x, y, dx, dy):
+                found = jump(x, y, ndx, ndy)
+                if found is None:
                     continue
-                seen.add(neighbor)
-                queue.append(([*path, neighbor], dist + 1))
+                jx, jy = found
+                j = jy * w + jx
+                steps = max(abs(jx - x), abs(jy - y))
+                new_cost = total + steps
+                if j not in costs or new_cost < costs[j]:
+                    costs[j] = new_cost
+                    parents[j] = i
+                    heapq.heappush(heap, (new_cost + heuristic(jx, jy), new_cost, j))
 
-        return None
+        return None if with_path else -1
 
     def dfs(
         self,
@@ -165,36 +1139,135 @@ class Grid:
     ) -> int:
         """
         DFS to find longest path. Returns max distance or -1 if no path.
+        Runs on the contracted junction graph - see longest_path.
 
         :param start: Starting point
         :param goal: Target point or predicate function
         :param diagonal: Include diagonal neighbors
         :param passable: Predicate to check if a cell is passable (default: not '#')
         """
+        return self.longest_path(start, goal, diagonal, passable)
+
+    def junction_graph(
+        self,
+        start: Point | tuple,
+        diagonal: bool = False,
+        passable: Callable[[str], bool] | None = None,
+        is_node: Callable[[Point], bool] | None = None,
+        prune_dead_ends: bool = False,
+    ) -> dict[Point, list[tuple[Point, int]]]:
+        """
+        Contract corridors into a weighted graph of junctions reachable from start.
+        Nodes are start, every cell with other than two passable neighbors (junctions and dead
+        ends) and every cell matching is_node; edges are (node, corridor length). Of parallel
+        corridors between two nodes only the longest is kept.
+        The result can be used with the aoc.graph functions.
+
+        :param start: Starting point
+        :param diagonal: Include diagonal neighbors
+        :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param is_node: Additional predicate for cells that must stay nodes (e.g. goals)
+        :param prune_dead_ends: Drop corridors ending in a dead end not matching is_node
+        """
         if passable is None:
 
             def passable(v):
                 return v != "#"
 
-        is_goal = goal if callable(goal) else lambda p: p[0] == goal[0] and p[1] == goal[1]
         start = Point(*start) if not isinstance(start, Point) else start
+        open_neighbors = {}
 
-        def _dfs(cur: Point, path_set: set[Point], total_dist: int, best: int) -> int:
-            if is_goal(cur):
-                return max(best, total_dist)
+        def exits(p: Point) -> list[Point]:
+            if p not in open_neighbors:
+                open_neighbors[p] = [
+                    np for np in self.neighbors(p, diagonal) if np == start or passable(self[np])
+                ]
+            return open_neighbors[p]
 
-            for neighbor in self.neighbors(cur, diagonal):
-                if neighbor in path_set:
-                    continue
-                if not passable(self[neighbor]):
+        def node_like(p: Point) -> bool:
+            return p in edges or (is_node is not None and is_node(p)) or len(exits(p)) != 2
+
+        edges = {start: []}
+        todo = [start]
+        while todo:
+            node = todo.pop()
+            longest = {}
+            for first in exits(node):
+                prev, cur, dist = node, first, 1
+                while not node_like(cur):
+                    prev, cur = cur, next(p for p in exits(cur) if p != prev)
+                    dist += 1
+                if cur == node:
+                    continue  # loop back to the same node
+                if prune_dead_ends and len(exits(cur)) == 1 and not (is_node and is_node(cur)):
                     continue
-                path_set.add(neighbor)
-                best = _dfs(neighbor, path_set, total_dist + 1, best)
-                path_set.remove(neighbor)
+                if cur not in edges:
+                    edges[cur] = []
+                    todo.append(cur)
+                longest[cur] = max(longest.get(cur, 0), dist)
+            edges[node] = list(longest.items())
+        return edges
+
+    def longest_path(
+        self,
+        start: Point | tuple,
+        goal: Point | tuple | Callable[[Point], bool],
+        diagonal: bool = False,
+        passable: Callable[[str], bool] | None = None,
+    ) -> int:
+        """
+        Length of the longest simple path from start to goal or -1 if there is none.
+
+        Corridors are first collapsed into a junction graph (see junction_graph), then an
+        iterative DFS over the junctions tracks visited nodes as an integer bitmask and prunes
+        branches that can not beat the best result even when picking up every remaining node.
+
+        :param start: Starting point
+        :param goal: Target point or predicate function
+        :param diagonal: Include diagonal neighbors
+        :param passable: Predicate to check if a cell is passable (default: not '#')
+        """
+        is_goal = goal if callable(goal) else lambda p: p[0] == goal[0] and p[1] == goal[1]
+        start = Point(*start) if not isinstance(start, Point) else start
+        if is_goal(start):
+            return 0
+
+        junctions = self.junction_graph(start, diagonal, passable, is_goal, prune_dead_ends=True)
+        ids = {p: i for i, p in enumerate(junctions)}  # start is id 0
+        goals = 0
+        for p, i in ids.items():
+            if is_goal(p):
+                goals |= 1 << i
+        adj = [[(ids[q], dist) for q, dist in junctions[p] if q != start] for p in junctions]
 
-            return best
+        # upper bound for the rest of a path: every unvisited node entered by its longest edge
+        max_in = [0] * len(adj)
+        for targets in adj:
+            for j, dist in targets:
+                max_in[j] = max(max_in[j], dist)
 
-        return _dfs(start, {start}, 0, -1)
+        # a single goal with a single entry node must be taken from there: leaving that node
+        # elsewhere would make the goal unreachable
+        sources = [i for i, targets in enumerate(adj) for j, _ in targets if goals >> j & 1]
+        if bin(goals).count("1") == 1 and len(sources) == 1:
+            adj[sources[0]] = [(j, d) for j, d in adj[sources[0]] if goals >> j & 1]
+
+        best = -1
+        stack = [(0, 0, 1, sum(max_in) - max_in[0])]
+        while stack:
+            node, dist, visited, remaining = stack.pop()
+            if goals >> node & 1:
+                best = max(best, dist)
+                continue
+            if dist + remaining <= best:
+                continue
+            for child, child_dist in adj[node]:
+                bit = 1 << child
+                if not visited & bit:
+                    stack.append(
+                        (child, dist + child_dist, visited | bit, remaining - max_in[child])
+                    )
+        return best
 
     def dijkstra(
         self,
@@ -203,61 +1276,1010 @@ class Grid:
         cost: Callable[[Point, Point, str], int] | None = None,
         diagonal: bool = False,
         passable: Callable[[str], bool] | None = None,
-    ) -> tuple[list[Point], int] | None:
+        with_path: bool = True,
+    ) -> tuple[list[Point], int] | int | None:
         """
         Dijkstra pathfinding with optional cost function.
 
         :param start: Starting point
         :param goal: Target point or predicate function
         :param cost: Cost function(from_point, to_point, to_value) -> int. Default: 1
+            Cost functions decorated with @bounded_cost(n) are searched with a bucket queue.
         :param diagonal: Include diagonal neighbors
         :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param with_path: Return (path, total_cost); otherwise only the cost or -1 if no path
         :return: (path, total_cost) or None if no path
+        :raises IndexError: if start lies outside of the grid
+        :raises TypeError: for a goal predicate on tiled views
         """
         if passable is None:
 
             def passable(v):
                 return v != "#"
 
-        if cost is None:
+        if self._unbounded:
+            result = self._point_search(start, goal, cost, None, diagonal, passable)
+            return _search_result(result, with_path)
 
-            def cost(_from, _to, _val):
-                return 1
+        max_cost = 1 if cost is None else getattr(cost, "max_cost", None)
+        if max_cost is not None and max_cost <= BUCKET_QUEUE_MAX_COST:
+            result = self._bucket_search(start, goal, cost, max_cost, diagonal, passable, with_path)
+        else:
+            result = self._heap_search(start, goal, cost, None, diagonal, passable, with_path)
+        return _index_result(result, with_path, self.width)
 
-        is_goal = goal if callable(goal) else lambda p: p[0] == goal[0] and p[1] == goal[1]
-        start = Point(*start) if not isinstance(start, Point) else start
+    def astar(
+        self,
+        start: Point | tuple,
+        goal: Point | tuple | Callable[[Point], bool],
+        cost: Callable[[Point, Point, str], int] | None = None,
+        heuristic: Callable[[Point], int] | None = None,
+        diagonal: bool = False,
+        passable: Callable[[str], bool] | None = None,
+        with_path: bool = True,
+    ) -> tuple[list[Point], int] | int | None:
+        """
+        A* pathfinding. Without an explicit heuristic the manhattan distance to a goal point is
+        used (chebyshev distance if diagonal), which assumes every step costs at least 1.
 
-        heap = [(0, [start])]
+        :param start: Starting point
+        :param goal: Target point or predicate function
+        :param cost: Cost function(from_point, to_point, to_value) -> int. Default: 1
+        :param heuristic: Lower bound of the remaining cost from a point to the goal
+        :param diagonal: Include diagonal neighbors
+        :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param with_path: Return (path, total_cost); otherwise only the cost or -1 if no path
+        :return: (path, total_cost) or None if no path
+        :raises IndexError: if start lies outside of the grid
+        :raises TypeError: for a goal predicate on tiled views
+        """
+        if passable is None:
+
+            def passable(v):
+                return v != "#"
+
+        if heuristic is None and not callable(goal):
+            gx, gy = goal[0], goal[1]
+            if diagonal:
+
+                def heuristic(p):
+                    return max(abs(p[0] - gx), abs(p[1] - gy))
+            else:
+
+                def heuristic(p):
+                    return abs(p[0] - gx) + abs(p[1] - gy)
+
+        if self._unbounded:
+            result = self._point_search(start, goal, cost, heuristic, diagonal, passable)
+            return _search_result(result, with_path)
+
+        result = self._heap_search(start, goal, cost, heuristic, diagonal, passable, with_path)
+        return _index_result(result, with_path, self.width)
+
+    def _heap_search(self, start, goal, cost, heuristic, diagonal, passable, with_path):
+        """
+        Dijkstra (or A* given a heuristic) over cell indices with a binary heap and stale-entry
+        skipping. Returns (goal index, cost, parents) or None.
+        """
+        w = self.width
+        s = self._index(start)
+        goal_index, is_goal = self._index_goal(goal)
+        neighbors = _index_neighbors(w, self.height, diagonal)
+        cells = _LazyCells(self, passable)
+        state, fill, value = cells.state, cells.fill, cells.value
+        # dicts: only the reached cells are stored, and costs need not be integers
+        min_costs = {s: 0}
+        parents = {s: -1} if with_path else None
+        heap = [(heuristic(Point(s % w, s // w)) if heuristic else 0, 0, s)]
+
+        while heap:
+            _, total_dist, i = heapq.heappop(heap)
+            if total_dist > min_costs[i]:
+                continue  # stale entry - node was reached cheaper in the meantime
+
+            node = Point(i % w, i // w) if is_goal or cost is not None else None
+            if i == goal_index or (is_goal is not None and is_goal(node)):
+                return i, total_dist, parents
+
+            for j in neighbors(i):
+                if (state[j] or fill(j)) != 1:
+                    continue
+                if cost is None:
+                    new_cost = total_dist + 1
+                    neighbor = None
+                else:
+                    neighbor = Point(j % w, j // w)
+                    new_cost = total_dist + cost(node, neighbor, value(j))
+
+                old_cost = min_costs.get(j)
+                if old_cost is None or new_cost < old_cost:
+                    min_costs[j] = new_cost
+                    if parents is not None:
+                        parents[j] = i
+                    if heuristic:
+                        neighbor = neighbor or Point(j % w, j // w)
+                        heapq.heappush(heap, (new_cost + heuristic(neighbor), new_cost, j))
+                    else:
+                        heapq.heappush(heap, (new_cost, new_cost, j))
+
+        return None
+
+    def _bucket_search(self, start, goal, cost, max_cost, diagonal, passable, with_path):
+        """
+        Dijkstra over cell indices with a bucket queue (Dial's algorithm) for integer costs in
+        0..max_cost. A ring of max_cost + 1 buckets covers every pending distance, so push/pop
+        are O(1). Returns (goal index, cost, parents) or None.
+        """
+        w = self.width
+        s = self._index(start)
+        goal_index, is_goal = self._index_goal(goal)
+        neighbors = _index_neighbors(w, self.height, diagonal)
+        cells = _LazyCells(self, passable)
+        state, fill, value = cells.state, cells.fill, cells.value
+        # dicts: only the reached cells are stored, and costs need not be integers
+        min_costs = {s: 0}
+        parents = {s: -1} if with_path else None
+
+        ring = max_cost + 1
+        buckets = [[] for _ in range(ring)]
+        buckets[0].append(s)
+        pending = 1
+        total_dist = 0
+
+        while pending:
+            bucket = buckets[total_dist % ring]
+            while bucket:
+                i = bucket.pop()
+                pending -= 1
+                if min_costs[i] != total_dist:
+                    continue  # stale entry - node was reached cheaper in the meantime
+
+                node = Point(i % w, i // w) if is_goal or cost is not None else None
+                if i == goal_index or (is_goal is not None and is_goal(node)):
+                    return i, total_dist, parents
+
+                for j in neighbors(i):
+                    if (state[j] or fill(j)) != 1:
+                        continue
+                    if cost is None:
+                        new_cost = total_dist + 1
+                    else:
+                        edge_cost = cost(node, Point(j % w, j // w), value(j))
+                        if not 0 <= edge_cost <= max_cost or edge_cost != int(edge_cost):
+                            raise ValueError(
+                                f"cost {edge_cost} is not an integer in range 0..{max_cost}"
+                            )
+                        new_cost = total_dist + int(edge_cost)
+
+                    old_cost = min_costs.get(j)
+                    if old_cost is None or new_cost < old_cost:
+                        min_costs[j] = new_cost
+                        if parents is not None:
+                            parents[j] = i
+                        buckets[new_cost % ring].append(j)
+                        pending += 1
+            total_dist += 1
+
+        return None
+
+    def _point_search(self, start, goal, cost, heuristic, diagonal, passable):
+        """
+        Dijkstra / A* on Points for unbounded (tiled) grids, which have no cell indices.
+        Only point goals are supported, and they are checked for reachability first, as the
+        search would never end otherwise. Returns (goal, cost, parents dict) or None.
+        """
+        if callable(goal):
+            raise TypeError("searches on tiled views need a goal point, not a predicate")
+        if not _tiled_reachable(self, start, goal, diagonal, passable):
+            return None
+        start = Point(*start) if not isinstance(start, Point) else start
+        heap = [(heuristic(start) if heuristic else 0, 0, start)]
         min_costs = {start: 0}
+        parents = {start: None}
 
         while heap:
-            total_dist, path = heapq.heappop(heap)
-            node = path[-1]
+            _, total_dist, node = heapq.heappop(heap)
+            if total_dist > min_costs[node]:
+                continue  # stale entry - node was reached cheaper in the meantime
 
-            if is_goal(node):
-                return path, total_dist
+            if node[0] == goal[0] and node[1] == goal[1]:
+                return node, total_dist, parents
 
             for neighbor in self.neighbors(node, diagonal):
-                if not passable(self[neighbor]):
+                value = self[neighbor]
+                if not passable(value):
                     continue
-                edge_cost = cost(node, neighbor, self[neighbor])
-                new_cost = total_dist + edge_cost
+                new_cost = total_dist + (cost(node, neighbor, value) if cost else 1)
 
                 if neighbor not in min_costs or new_cost < min_costs[neighbor]:
                     min_costs[neighbor] = new_cost
-                    heapq.heappush(heap, (new_cost, [*path, neighbor]))
+                    parents[neighbor] = node
+                    priority = new_cost + heuristic(neighbor) if heuristic else new_cost
+                    heapq.heappush(heap, (priority, new_cost, neighbor))
 
         return None
 
+    def state_search(
+        self,
+        start: Point | tuple | GridState | Iterable[GridState],
+        goal: Point | tuple | Callable[[GridState], bool],
+        rule: Callable[[Grid, GridState], Iterable[tuple[GridState, int]]],
+        max_steps: int = 0,
+        passable: Callable[[str], bool] | None = None,
+        with_path: bool = True,
+    ) -> tuple[list[GridState], int] | int | None:
+        """
+        Dijkstra over (position, heading, steps) states instead of plain positions.
+        Every state is packed into one integer ((y * width + x) * 4 + heading) * (max_steps + 1)
+        + steps and costs / predecessors live in flat arrays indexed by that integer.
+        Costs are stored as 32 bit integers.
+
+        :param start: Starting point (all four headings with 0 steps), start state or states
+        :param goal: Target point (any state on it) or predicate on GridState
+        :param rule: Transition rule(grid, state) -> iterable of (next_state, cost),
+            e.g. momentum_rule() or turning_rule()
+        :param max_steps: Largest steps value any state can have
+        :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param with_path: Return (states, total_cost); otherwise only the cost or -1 if no path
+        :return: (list of states, total_cost) or None if no path
+        """
+        if passable is None:
+
+            def passable(v):
+                return v != "#"
+
+        if callable(goal):
+            is_goal = goal
+        else:
+
+            def is_goal(state):
+                return state[0][0] == goal[0] and state[0][1] == goal[1]
+
+        if isinstance(start, GridState):
+            starts = [start]
+        elif isinstance(start, tuple) and start and isinstance(start[0], int):
+            starts = [GridState(Point(*start), heading, 0) for heading in range(4)]
+        else:
+            starts = list(start)
+
+        w = self.width
+        span = max_steps + 1
+        size = w * self.height * 4 * span
+        # 32 bit costs and state ids keep the arrays at 4 bytes per state; predecessors are
+        # only allocated when the path is requested
+        id_type = "i" if size <= 2**31 else "q"
+        costs = array("i", [-1]) * size
+        parents = array(id_type, [-1]) * size if with_path else None
+
+        def encode(state: GridState) -> int:
+            pos, heading, steps = state
+            if not 0 <= steps <= max_steps:
+                raise ValueError(f"{state} exceeds max_steps={max_steps}")
+            if not 0 <= heading < 4:
+                raise ValueError(f"{state} has invalid heading (must be 0..3)")
+            return ((pos[1] * w + pos[0]) * 4 + heading) * span + steps
+
+        def decode(i: int) -> GridState:
+            rest, steps = divmod(i, span)
+            cell, heading = divmod(rest, 4)
+            return GridState(Point(cell % w, cell // w), heading, steps)
+
+        heap = []
+        for state in starts:
+            if state[0] not in self:
+                raise IndexError(f"start {state} outside of grid")
+            i = encode(state)
+            costs[i] = 0
+            heap.append((0, i))
+
+        while heap:
+            total, i = heapq.heappop(heap)
+            if total > costs[i]:
+                continue  # stale entry - state was reached cheaper in the meantime
+            state = decode(i)
+            if is_goal(state):
+                if not with_path:
+                    return total
+                path = [state]
+                while parents[i] >= 0:
+                    i = parents[i]
+                    path.append(decode(i))
+                path.reverse()
+                return path, total
+
+            for next_state, step_cost in rule(self, state):
+                pos = next_state[0]
+                if pos not in self or not passable(self[pos]):
+                    continue
+                j = encode(next_state)
+                new_cost = total + step_cost
+                if costs[j] < 0 or new_cost < costs[j]:
+                    costs[j] = new_cost
+                    if with_path:
+                        parents[j] = i
+                    heapq.heappush(heap, (new_cost, j))
+
+        return None if with_path else -1
+
+    def distance_map(
+        self,
+        sources: Point | tuple | Iterable[Point | tuple],
+        passable: Callable[[str], bool] | None = None,
+        diagonal: bool = False,
+        cost: Callable[[Point, Point, str], float] | None = None,
+        max_distance: float | None = None,
+    ) -> DistanceMap:
+        """
+        Distance from the nearest source to every reachable cell in a single sweep.
+        Uses BFS for unit costs and Dijkstra if a cost function is given.
+
+        :param sources: Starting point or iterable of starting points (distance 0)
+        :raises IndexError: if a source lies outside of the grid
+        :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param diagonal: Include diagonal neighbors
+        :param cost: Cost function(from_point, to_point, to_value) -> int or float. Default: 1
+        :param max_distance: Stop expanding cells beyond this distance
+        :return: DistanceMap with -1 for all unreached cells
+        """
+        if passable is None:
+
+            def passable(v):
+                return v != "#"
+
+        w, h = self.width, self.height
+        if isinstance(sources, tuple) and sources and isinstance(sources[0], int):
+            sources = [sources]
+        limit = max_distance if max_distance is not None else float("inf")
+        ok = self._mask(passable)
+        dist = array("q", [-1]) * (w * h)
+        _, _, offsets, targets = self.neighbor_table(diagonal)
+
+        starts = []
+        for p in sources:
+            if p not in self:
+                raise IndexError(f"source {p} outside of grid")
+            i = p[1] * w + p[0]
+            if dist[i] < 0:
+                dist[i] = 0
+                starts.append(i)
+
+        if cost is None:
+            queue = deque(starts)
+            while queue:
+                i = queue.popleft()
+                d = dist[i] + 1
+                if d > limit:
+                    continue
+                for j in targets[offsets[i] : offsets[i + 1]]:
+                    if ok[j] and dist[j] < 0:
+                        dist[j] = d
+                        queue.append(j)
+        else:
+            values = list(self._values())
+            heap = [(0, i) for i in starts]
+            while heap:
+                total, i = heapq.heappop(heap)
+                if total > dist[i]:
+                    continue
+                node = Point(i % w, i // w)
+                for j in targets[offsets[i] : offsets[i + 1]]:
+                    if not ok[j]:
+                        continue
+                    d = total + cost(node, Point(j % w, j // w), values[j])
+                    if d <= limit and (dist[j] < 0 or d < dist[j]):
+                        try:
+                            dist[j] = d
+                        except TypeError:
+                            # float costs: continue in a float array, -1 still marks unreached
+                            dist = array("d", dist)
+                            dist[j] = d
+                        heapq.heappush(heap, (d, j))
+
+        return DistanceMap(w, h, dist)
+
+    def obstacle_index(self, obstacle: str | Callable[[str], bool] = "#") -> ObstacleIndex:
+        """
+        Per-row and per-column sorted index of the obstacle cells for walkers that only turn
+        at obstacles (see ObstacleIndex.next_obstacle and walk). The index is a snapshot;
+        later changes of the grid have to be applied with add, remove or toggle.
+
+        :param obstacle: obstacle value or predicate on cell values
+        """
+        hits = self._mask(obstacle if callable(obstacle) else lambda v: v == obstacle)
+        w = self.width
+        cells = []
+        i = hits.find(1)
+        while i >= 0:
+            cells.append(Point(i % w, i // w))
+            i = hits.find(1, i + 1)
+        return ObstacleIndex(w, self.height, cells)
+
+    def poi_distances(
+        self,
+        pois: Iterable[Point | tuple | str],
+        diagonal: bool = False,
+        passable: Callable[[str], bool] | None = None,
+        workers: int | None = 1,
+    ) -> PoiMatrix:
+        """
+        Pairwise shortest distances between points of interest, e.g. as input for TSP-style
+        route searches. Runs one BFS per source that stops as soon as every other point of
+        interest was reached.
+
+        With several workers the sources are spread over a ProcessPoolExecutor; the passable
+        mask is handed to the workers once through shared memory instead of pickling the grid
+        for every task.
+
+        :param pois: Points and / or cell values (every cell holding the value, in row-major
+            order); a string is a sequence of values, e.g. "01234"
+        :param diagonal: Include diagonal neighbors
+        :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param workers: Number of processes (1: run in this process, None: one per CPU)
+        :return: PoiMatrix(points, distances) with -1 for unreachable pairs
+        :raises IndexError: if a point lies outside of the grid
+        """
+        if passable is None:
+
+            def passable(v):
+                return v != "#"
+
+        points = []
+        for item in pois:
+            if isinstance(item, str):
+                points.extend(self.find_all(item))
+            else:
+                points.append(Point(*item) if not isinstance(item, Point) else item)
+        w, h = self.width, self.height
+        indices = [self._index(p) for p in points]
+        ok = bytes(self._mask(passable))
+        sources = list(range(len(points)))
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(sources) <= 1:
+            _, _, offsets, targets = self.neighbor_table(diagonal)
+            rows = [_poi_row(ok, offsets, targets, indices, k) for k in sources]
+            return PoiMatrix(points, rows)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(len(ok), 1))
+        try:
+            shm.buf[: len(ok)] = ok
+            chunks = [sources[k::workers] for k in range(workers) if sources[k::workers]]
+            with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+                futures = [
+                    pool.submit(_poi_rows, shm.name, w, h, diagonal, indices, chunk)
+                    for chunk in chunks
+                ]
+                rows = [None] * len(sources)
+                for chunk, future in zip(chunks, futures):
+                    for k, row in zip(chunk, future.result()):
+                        rows[k] = row
+        finally:
+            shm.close()
+            shm.unlink()
+        return PoiMatrix(points, rows)
+
+    def label_components(
+        self, diagonal: bool = False, key: Callable[[str], object] | None = None
+    ) -> Components:
+        """
+        Label every connected region of equal keys in two passes over the grid: the first one
+        joins equal neighbors in a union-find forest, the second one assigns compact labels and
+        collects area, perimeter, corners and bounds of every region.
+
+        Perimeter and corners are measured along cell edges; the number of corners of a region
+        equals its number of sides.
+
+        :param diagonal: Also connect diagonally adjacent cells
+        :param key: Region key of a cell value (default: the value itself). Cells with key None
+            belong to no region.
+        """
+        w, h = self.width, self.height
+        n = w * h
+        keys = list(self._values())
+        if key is not None:
+            keys = list(map(key, keys))
+        parent = array("i", range(n))
+
+        def find(i: int) -> int:
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        def union(a: int, b: int):
+            ra, rb = find(a), find(b)
+            # the smaller index stays root, so every root is the first cell of its region
+            if ra < rb:
+                parent[rb] = ra
+            elif rb < ra:
+                parent[ra] = rb
+
+        for y in range(h):
+            for x in range(w):
+                i = y * w + x
+                k = keys[i]
+                if k is None:
+                    continue
+                if x and keys[i - 1] == k:
+                    union(i, i - 1)
+                if y:
+                    if keys[i - w] == k:
+                        union(i, i - w)
+                    if diagonal:
+                        if x and keys[i - w - 1] == k:
+                            union(i, i - w - 1)
+                        if x < w - 1 and keys[i - w + 1] == k:
+                            union(i, i - w + 1)
+
+        def same(x: int, y: int, k) -> bool:
+            return 0 <= x < w and 0 <= y < h and keys[y * w + x] == k
+
+        labels = array("i", [-1]) * n
+        # per label: key, area, perimeter, corners, min x, min y, max x, max y
+        stats = []
+        for y in range(h):
+            for x in range(w):
+                i = y * w + x
+                k = keys[i]
+                if k is None:
+                    continue
+                root = find(i)
+                if root == i:
+                    label = len(stats)
+                    stats.append([k, 0, 0, 0, x, y, x, y])
+                else:
+                    label = labels[root]
+                labels[i] = label
+                s = stats[label]
+                s[1] += 1
+                s[2] += sum(1 for dx, dy in DIRECT_ADJACENTS if not same(x + dx, y + dy, k))
+                for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                    a, b = same(x + dx, y, k), same(x, y + dy, k)
+                    if not (a or b) or (a and b and not same(x + dx, y + dy, k)):
+                        s[3] += 1  # convex or concave corner
+                if x < s[4]:
+                    s[4] = x
+                if x > s[6]:
+                    s[6] = x
+                s[7] = y
+
+        regions = [
+            Region(label, k, area, perimeter, corners, Rect(x0, y0, x1 - x0 + 1, y1 - y0 + 1))
+            for label, (k, area, perimeter, corners, x0, y0, x1, y1) in enumerate(stats)
+        ]
+        return Components(w, h, labels, regions)
+
+    def step(self, rule: Callable[..., str], count: str = "#", diagonal: bool = True) -> int:
+        """
+        Advance the grid one cellular automaton generation in place.
+
+        :param rule: rule(value, *counts) -> new value, called with the number of neighbors
+            holding each value in count. Must be pure - results are cached.
+        :param count: values to count in the neighborhood (one per character)
+        :param diagonal: count all 8 neighbors instead of the 4 direct ones
+        :return: number of changed cells
+        """
+        return self._simulate(Automaton(rule, count, diagonal), 1, False)[1]
+
+    def simulate(
+        self,
+        rule: Callable[..., str],
+        generations: int,
+        count: str = "#",
+        diagonal: bool = True,
+        frontier: bool = False,
+    ) -> int:
+        """
+        Run a cellular automaton for a number of generations in place (see step).
+        Neighbors are counted in bulk with numpy if available (shifted row lists otherwise)
+        into two alternating buffers; the grid itself is only written once at the end.
+        Stops early once a generation changes nothing.
+
+        :param rule: rule(value, *counts) -> new value
+        :param generations: maximum number of generations
+        :param count: values to count in the neighborhood (one per character)
+        :param diagonal: count all 8 neighbors instead of the 4 direct ones
+        :param frontier: only recompute cells next to a cell changed in the last generation;
+            pays off when activity is confined to small parts of a large grid
+        :return: number of generations run
+        """
+        return self._simulate(Automaton(rule, count, diagonal), generations, frontier)[0]
+
+    def _simulate(self, engine: Automaton, generations: int, frontier: bool) -> tuple[int, int]:
+        w, h = self.width, self.height
+        cells = list(self._values())
+        generation = changed = 0
+        if not cells:
+            return generation, changed
+
+        if frontier:
+            _, _, offsets, targets = _geometry_table(w, h, engine.diagonal)
+            active = set(range(w * h))
+            while generation < generations:
+                updated = engine.step_frontier(cells, offsets, targets, active)
+                generation, changed = generation + 1, len(updated)
+                if not updated:
+                    break
+                active = engine.frontier(updated, offsets, targets)
+            self._assign_values(cells)
+            return generation, changed
+
+        data = None
+        if automaton.np is not None:
+            try:
+                data = "".join(cells).encode("latin-1")
+            except UnicodeEncodeError:
+                pass
+        if data is not None and len(data) == w * h:
+            np = automaton.np
+            current = np.frombuffer(data, dtype=np.uint8).reshape(h, w)
+            done = False
+            while generation < generations:
+                result = engine.step_array(current, w, h)
+                if result is None:
+                    break  # rule produced values numpy can not hold - continue in python
+                current, changed = result
+                generation += 1
+                if not changed:
+                    done = True
+                    break
+            else:
+                done = True
+            cells = list(current.tobytes().decode("latin-1"))
+            if done:
+                self._assign_values(cells)
+                return generation, changed
+
+        buffer = cells[:]
+        while generation < generations:
+            changed = engine.step(cells, buffer, w, h)
+            cells, buffer = buffer, cells
+            generation += 1
+            if not changed:
+                break
+        self._assign_values(cells)
+        return generation, changed
+
+    def run_until_cycle(self, step_fn: Callable[[Grid], Grid | None], n: int) -> Cycle:
+        """
+        Apply step_fn n times to a copy of this grid, skipping ahead as soon as a state repeats.
+        States are compared by fingerprint, so a step_fn changing the grid in place through
+        __setitem__ only pays for the cells it touches.
+
+        :param step_fn: step_fn(grid) changing the grid in place or returning the next grid
+        :param n: number of steps
+        :return: Cycle(grid after n steps, first step of the cycle, cycle length)
+        """
+        grid = self.copy()
+        seen = {grid.fingerprint: 0}
+        for i in range(1, n + 1):
+            result = step_fn(grid)
+            if result is not None:
+                grid = result
+            fingerprint = grid.fingerprint
+            if fingerprint in seen:
+                start = seen[fingerprint]
+                length = i - start
+                for _ in range((n - i) % length):
+                    result = step_fn(grid)
+                    if result is not None:
+                        grid = result
+                return Cycle(grid, start, length)
+            seen[fingerprint] = i
+        return Cycle(grid, -1, 0)
+
     def copy(self) -> Grid:
-        return Grid([row[:] for row in self._data])
+        return self._copy_state(Grid([row[:] for row in self._data]))
 
     def transpose(self) -> Grid:
         transposed = [list(row) for row in zip(*self._data)]
         return Grid(transposed)
 
+    def transposed(self) -> GridView:
+        """Zero-copy transposed view."""
+        return GridView(self, self.height, self.width, (0, 0, 0, 1, 1, 0))
+
+    def rotated(self, turns: int = 1) -> GridView:
+        """Zero-copy view rotated clockwise by turns * 90 degrees."""
+        w, h = self.width, self.height
+        turns %= 4
+        if turns == 0:
+            return GridView(self, w, h, (0, 0, 1, 0, 0, 1))
+        if turns == 1:
+            return GridView(self, h, w, (0, h - 1, 0, 1, -1, 0))
+        if turns == 2:
+            return GridView(self, w, h, (w - 1, h - 1, -1, 0, 0, -1))
+        return GridView(self, h, w, (w - 1, 0, 0, -1, 1, 0))
+
+    def mirrored(self, vertical: bool = False) -> GridView:
+        """Zero-copy view mirrored left to right (or top to bottom if vertical)."""
+        w, h = self.width, self.height
+        if vertical:
+            return GridView(self, w, h, (0, h - 1, 1, 0, 0, -1))
+        return GridView(self, w, h, (w - 1, 0, -1, 0, 0, 1))
+
+    def orientations(self) -> Iterator[GridView]:
+        """All 8 rotated and mirrored views."""
+        for turns in range(4):
+            yield self.rotated(turns)
+        mirror = self.mirrored()
+        for turns in range(4):
+            yield mirror.rotated(turns)
+
+    def window(self, rect: Rect) -> GridView:
+        """Zero-copy view of the cells inside rect, with rect's top left corner at (0, 0)."""
+        if rect.x < 0 or rect.y < 0 or rect.x2 >= self.width or rect.y2 >= self.height:
+            raise ValueError(f"{rect} exceeds {self!r}")
+        return GridView(self, rect.w, rect.h, (rect.x, rect.y, 1, 0, 0, 1))
+
+    def tiled(self) -> GridView:
+        """
+        Zero-copy view repeating this grid infinitely in all directions: every point is inside
+        and maps to (x mod width, y mod height). Iteration and rows cover a single tile.
+        Searches need a goal point, and flood fills are not supported.
+        """
+        return GridView(self, self.width, self.height, (0, 0, 1, 0, 0, 1), tiled=True)
+
     def __str__(self) -> str:
         return "\n".join(self.rows())
 
     def __repr__(self) -> str:
         return f"Grid({self.width}x{self.height})"
+
+
+class GridView(Grid):
+    """
+    Read (and write-through) view onto another grid without copying any cells.
+
+    Coordinates are mapped onto the parent with an affine transform
+    (px, py) = (ox + xx * x + xy * y, oy + yx * x + yy * y), optionally after wrapping them
+    into the view size for tiled views. Stacked views collapse into a single transform onto the
+    underlying grid. All Grid read APIs work on views; materialize() builds a real copy.
+    Create views with Grid.transposed, rotated, mirrored, window and tiled.
+    """
+
+    def __init__(
+        self,
+        parent: Grid,
+        width: int,
+        height: int,
+        transform: tuple[int, int, int, int, int, int],
+        tiled: bool = False,
+    ):
+        ox, oy, xx, xy, yx, yy = transform
+        if isinstance(parent, GridView) and not parent._tiled:
+            pox, poy, pxx, pxy, pyx, pyy = parent._transform
+            ox, oy, xx, xy, yx, yy = (
+                pox + pxx * ox + pxy * oy,
+                poy + pyx * ox + pyy * oy,
+                pxx * xx + pxy * yx,
+                pxx * xy + pxy * yy,
+                pyx * xx + pyy * yx,
+                pyx * xy + pyy * yy,
+            )
+            parent = parent._parent
+        self._parent = parent
+        self._width = width
+        self._height = height
+        self._transform = (ox, oy, xx, xy, yx, yy)
+        self._tiled = tiled
+        self._unbounded = tiled
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    def _map(self, p: Point | tuple) -> tuple[int, int]:
+        x, y = p[0], p[1]
+        if self._tiled:
+            x %= self._width
+            y %= self._height
+        elif not (0 <= x < self._width and 0 <= y < self._height):
+            raise IndexError(f"{p} outside of {self!r}")
+        ox, oy, xx, xy, yx, yy = self._transform
+        return ox + xx * x + xy * y, oy + yx * x + yy * y
+
+    def __getitem__(self, p: Point | tuple) -> str:
+        return self._parent[self._map(p)]
+
+    def __setitem__(self, p: Point | tuple, value: str):
+        self._parent[self._map(p)] = value
+
+    def __contains__(self, p: Point | tuple) -> bool:
+        return self._tiled or (0 <= p[0] < self._width and 0 <= p[1] < self._height)
+
+    @property
+    def fingerprint(self) -> int:
+        # writes to the parent bypass this view, so never trust a cached value
+        self._zobrist = None
+        return Grid.fingerprint.fget(self)
+
+    def rows(self) -> Iterator[str]:
+        for y in range(self._height):
+            yield "".join(self[(x, y)] for x in range(self._width))
+
+    def build_index(self):
+        # writes to the parent bypass this view and would leave the index stale
+        raise TypeError("build the value index on the underlying grid, not on a view")
+
+    def _values(self) -> Iterable[str]:
+        for y in range(self._height):
+            for x in range(self._width):
+                yield self[(x, y)]
+
+    def _row_values(self, y: int) -> Sequence[str]:
+        return [self[(x, y)] for x in range(self._width)]
+
+    def _assign_values(self, values: list[str]):
+        w = self._width
+        for i, v in enumerate(values):
+            self[(i % w, i // w)] = v
+
+    def materialize(self) -> Grid:
+        """Copy of the viewed cells as a grid of the underlying grid's type."""
+        root = self._parent
+        while isinstance(root, GridView):
+            root = root._parent
+        values = list(self._values())
+        w = self._width
+        return type(root)([values[y * w : (y + 1) * w] for y in range(self._height)])
+
+    def copy(self) -> Grid:
+        return self.materialize()
+
+    def transpose(self) -> Grid:
+        return self.transposed().materialize()
+
+    def __repr__(self) -> str:
+        kind = "tiled " if self._tiled else ""
+        return f"GridView({kind}{self._width}x{self._height} of {self._parent!r})"
+
+
+# single latin-1 character for every byte value, faster than calling chr()
+_LATIN1 = tuple(map(chr, range(256)))
+
+
+def _byte(value) -> int:
+    """Byte value of a single latin-1 character or -1 if value can not be stored in a FlatGrid."""
+    if isinstance(value, str) and len(value) == 1 and ord(value) < 256:
+        return ord(value)
+    return -1
+
+
+class FlatGrid(Grid):
+    """
+    2D grid backed by a single contiguous bytearray indexed by y * width + x.
+
+    Same API as Grid but every cell must hold a single latin-1 character. Uses one byte per
+    cell, caches the dimensions and copies the whole grid with a single buffer copy.
+    Point access goes through per-row memoryviews onto that buffer.
+    """
+
+    def __init__(self, data: list[str] | list[list[str]]):
+        """Create grid from list of strings or list of lists."""
+        height = len(data)
+        width = len(data[0]) if data else 0
+        buf = bytearray()
+        for row in data:
+            encoded = "".join(row).encode("latin-1")
+            if len(row) != width or len(encoded) != width:
+                raise ValueError(f"all rows must have {width} single latin-1 character cells")
+            buf += encoded
+        self._attach(buf, width, height)
+
+    @classmethod
+    def create(cls, width: int, height: int, fill: str = ".") -> FlatGrid:
+        """Create empty grid with fill character."""
+        if _byte(fill) < 0:
+            raise ValueError(f"fill must be a single latin-1 character, got {fill!r}")
+        return cls._from_buffer(bytearray([ord(fill)]) * (width * height), width, height)
+
+    @classmethod
+    def _from_buffer(cls, buf: bytearray, width: int, height: int) -> FlatGrid:
+        grid = cls.__new__(cls)
+        grid._attach(buf, width, height)
+        return grid
+
+    def _attach(self, buf: bytearray, width: int, height: int):
+        self._buf = buf
+        self._width = width
+        self._height = height
+        view = memoryview(buf)
+        self._rows = [view[y * width : (y + 1) * width] for y in range(height)]
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    def __getitem__(self, p: Point | tuple) -> str:
+        return _LATIN1[self._rows[p[1]][p[0]]]
+
+    def __setitem__(self, p: Point | tuple, value: str):
+        row = self._rows[p[1]]
+        # validate before the fingerprint and value index see the new value
+        b = ord(value)
+        if b > 255:
+            raise ValueError(f"FlatGrid cells must be single latin-1 characters, got {value!r}")
+        old = _LATIN1[row[p[0]]]
+        if self._zobrist is not None:
+            self._update_fingerprint(p, old, value)
+        if self._positions is not None:
+            self._update_index(p, old, value)
+        row[p[0]] = b
+
+    def __contains__(self, p: Point | tuple) -> bool:
+        return 0 <= p[0] < self._width and 0 <= p[1] < self._height
+
+    def rows(self) -> Iterator[str]:
+        for row in self._rows:
+            yield str(row, "latin-1")
+
+    def _values(self) -> Iterable[str]:
+        return self._buf.decode("latin-1")
+
+    def _assign_values(self, values: list[str]):
+        data = "".join(values).encode("latin-1")
+        if len(data) != len(self._buf):
+            raise ValueError("FlatGrid cells must be single latin-1 characters")
+        self._zobrist = None
+        self._buf[:] = data
+        if self._positions is not None:
+            self.build_index()
+
+    def _row_values(self, y: int) -> Sequence[str]:
+        return self._rows[y].tobytes().decode("latin-1")
+
+    def _mask(self, predicate: Callable[[str], bool]) -> bytearray:
+        table = bytearray(256)
+        for b in set(self._buf):
+            table[b] = 1 if predicate(chr(b)) else 0
+        return self._buf.translate(table)
+
+    def find(self, value: str) -> Point | None:
+        if self._positions is not None:
+            return super().find(value)
+        needle = _byte(value)
+        i = self._buf.find(needle) if needle >= 0 else -1
+        return Point(i % self._width, i // self._width) if i >= 0 else None
+
+    def find_all(self, value: str) -> list[Point]:
+        if self._positions is not None:
+            return super().find_all(value)
+        needle = _byte(value)
+        if needle < 0:
+            return []
+        buf, w = self._buf, self._width
+        result = []
+        i = buf.find(needle)
+        while i >= 0:
+            result.append(Point(i % w, i // w))
+            i = buf.find(needle, i + 1)
+        return result
+
+    def count(self, value: str) -> int:
+        if self._positions is not None:
+            return super().count(value)
+        needle = _byte(value)
+        return self._buf.count(needle) if needle >= 0 else 0
+
+    def copy(self) -> FlatGrid:
+        return self._copy_state(self._from_buffer(self._buf[:], self._width, self._height))
+
+    def transpose(self) -> FlatGrid:
+        w = self._width
+        buf = bytearray().join(self._buf[x::w] for x in range(w))
+        return self._from_buffer(buf, self._height, w)
+
+    def __repr__(self) -> str:
+        return f"FlatGrid({self._width}x{self._height})"
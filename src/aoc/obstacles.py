@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from collections.abc import Callable, Iterable
+
+from .point import Point, rot_cw
+
+# result of ObstacleIndex.walk: the (position, direction) states in front of every obstacle hit,
+# whether the walk ends in a loop, and the last cell before leaving the grid (None for loops)
+Walk = namedtuple("Walk", "stops,loop,exit")
+
+
+class ObstacleIndex:
+    """
+    Sorted obstacle coordinates per row and per column of a width x height grid.
+
+    next_obstacle answers "first obstacle from p in direction d" with one bisect, so a walker
+    that only turns at obstacles costs O(turns * log n) instead of one step per cell.
+    Obstacles can be added, removed and toggled one at a time.
+    """
+
+    def __init__(self, width: int, height: int, obstacles: Iterable[Point | tuple] = ()):
+        self.width = width
+        self.height = height
+        self._rows = [[] for _ in range(height)]
+        self._cols = [[] for _ in range(width)]
+        self._cells = set()
+        for p in sorted(obstacles, key=lambda p: (p[1], p[0])):
+            self.add(p)
+
+    def __contains__(self, p: Point | tuple) -> bool:
+        return (p[0], p[1]) in self._cells
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def add(self, p: Point | tuple):
+        x, y = p[0], p[1]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{p} outside of {self.width}x{self.height} grid")
+        if (x, y) not in self._cells:
+            self._cells.add((x, y))
+            insort(self._rows[y], x)
+            insort(self._cols[x], y)
+
+    def remove(self, p: Point | tuple):
+        x, y = p[0], p[1]
+        self._cells.remove((x, y))
+        row, col = self._rows[y], self._cols[x]
+        del row[bisect_left(row, x)]
+        del col[bisect_left(col, y)]
+
+    def toggle(self, p: Point | tuple) -> bool:
+        """Add p if it is free, remove it otherwise. Returns whether p is an obstacle now."""
+        if p in self:
+            self.remove(p)
+            return False
+        self.add(p)
+        return True
+
+    def next_obstacle(self, p: Point | tuple, direction: Point | tuple) -> Point | None:
+        """
+        First obstacle strictly beyond p in a straight direction (N, E, S or W) or None if the
+        ray leaves the grid.
+        """
+        x, y = p[0], p[1]
+        dx, dy = direction[0], direction[1]
+        if dy == 0 and dx in (1, -1):
+            if not 0 <= y < self.height:
+                return None
+            line, pos = self._rows[y], x
+        elif dx == 0 and dy in (1, -1):
+            if not 0 <= x < self.width:
+                return None
+            line, pos = self._cols[x], y
+        else:
+            raise ValueError(f"direction {direction} is not a straight unit step")
+        if dx + dy > 0:
+            k = bisect_right(line, pos)
+            if k == len(line):
+                return None
+        else:
+            k = bisect_left(line, pos) - 1
+            if k < 0:
+                return None
+        return Point(line[k], y) if dy == 0 else Point(x, line[k])
+
+    def walk(
+        self,
+        start: Point | tuple,
+        direction: Point | tuple,
+        turn: Callable[[Point], Point] = rot_cw,
+    ) -> Walk:
+        """
+        Walk straight from start and turn in front of every obstacle until the walker leaves
+        the grid or repeats a state (a loop).
+
+        :param start: starting cell
+        :param direction: initial direction, e.g. NORTH
+        :param turn: new direction after hitting an obstacle (default: turn right)
+        """
+        pos = Point(start[0], start[1])
+        heading = Point(direction[0], direction[1])
+        stops = []
+        seen = set()
+        while True:
+            hit = self.next_obstacle(pos, heading)
+            if hit is None:
+                x = pos.x if heading.x == 0 else (self.width - 1 if heading.x > 0 else 0)
+                y = pos.y if heading.y == 0 else (self.height - 1 if heading.y > 0 else 0)
+                return Walk(stops, False, Point(x, y))
+            pos = Point(hit.x - heading.x, hit.y - heading.y)
+            state = (pos, heading)
+            if state in seen:
+                return Walk(stops, True, None)
+            seen.add(state)
+            stops.append(state)
+            heading = turn(heading)
+
+    def __repr__(self) -> str:
+        return f"ObstacleIndex({self.width}x{self.height}, {len(self._cells)} obstacles)"
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections import deque, namedtuple
+from collections.abc import Callable, Hashable, Iterable
+from itertools import count
+from typing import Any
+
+# result of implicit_search: the goal state reached, its total cost and the states from start to
+# goal (None unless with_path was requested)
+SearchResult = namedtuple("SearchResult", "state,cost,path")
+
+METHODS = ("bfs", "dijkstra", "astar", "beam")
+
+
+class HashedVisited:
+    """
+    Visited store keeping only hash(key) of every state instead of the key itself.
+
+    Much smaller than a set of large state tuples; two states whose hashes collide are
+    (rarely) mistaken for each other.
+    """
+
+    def __init__(self):
+        self._hashes = set()
+
+    def add(self, key: Hashable):
+        self._hashes.add(hash(key))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return hash(key) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+class BloomVisited:
+    """
+    Bloom filter visited store with a fixed memory budget.
+
+    Never forgets a state, but may report an unseen state as visited (the chance grows with
+    the number of states, see error_rate). A search using it can miss the optimum or the goal
+    when that happens - use it when an exact store does not fit into memory.
+    """
+
+    def __init__(self, memory: int = 1 << 24, hashes: int = 4):
+        """
+        :param memory: size of the bit array in bytes
+        :param hashes: number of bits set per state
+        """
+        if memory <= 0 or hashes <= 0:
+            raise ValueError("memory and hashes must be positive")
+        self.bits = memory * 8
+        self.hashes = hashes
+        self._data = bytearray(memory)
+        self._added = 0
+
+    def _positions(self, key: Hashable) -> list[int]:
+        # double hashing: both halves of a scrambled 64 bit hash give the k bit positions
+        h = hash(key) * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h >> 32, h & 0xFFFFFFFF | 1
+        m = self.bits
+        return [(h1 + i * h2) % m for i in range(self.hashes)]
+
+    def add(self, key: Hashable):
+        data = self._data
+        for p in self._positions(key):
+            data[p >> 3] |= 1 << (p & 7)
+        self._added += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        data = self._data
+        return all(data[p >> 3] >> (p & 7) & 1 for p in self._positions(key))
+
+    def __len__(self) -> int:
+        """Number of add calls (states may be counted twice if added twice)."""
+        return self._added
+
+    def error_rate(self) -> float:
+        """Estimated chance that an unseen state is reported as visited."""
+        return (1 - math.exp(-self.hashes * self._added / self.bits)) ** self.hashes
+
+
+def _visited_store(visited, memory: int | None):
+    if visited is None or visited == "set":
+        return set()
+    if visited == "hash":
+        return HashedVisited()
+    if visited == "bloom":
+        return BloomVisited(memory) if memory is not None else BloomVisited()
+    if isinstance(visited, str):
+        raise ValueError(f"unknown visited store {visited!r}")
+    return visited
+
+
+def _build_path(parents: dict, key) -> list:
+    """Follow the key -> (state, parent key) map back from key and return start -> state."""
+    path = []
+    while key is not None:
+        state, key = parents[key]
+        path.append(state)
+    path.reverse()
+    return path
+
+
+def implicit_search(
+    start: Any,
+    neighbors: Callable[[Any], Iterable[tuple[Any, int]]],
+    goal: Any | Callable[[Any], bool],
+    method: str = "dijkstra",
+    heuristic: Callable[[Any], int] | None = None,
+    state_key: Callable[[Any], Hashable] | None = None,
+    visited: str | Any | None = None,
+    memory: int | None = None,
+    beam_width: int | None = None,
+    with_path: bool = False,
+) -> SearchResult | None:
+    """
+    Search a graph given only by a neighbor function, for state spaces too large to build as
+    a dict of edges. Returns None if no goal state is reachable.
+
+    :param start: initial state
+    :param neighbors: returns (next state, step cost) pairs of a state
+    :param goal: goal state or predicate on states
+    :param method: "bfs" (fewest steps, costs are only summed up), "dijkstra", "astar"
+        (needs a consistent heuristic) or "beam" (advances one step per round and keeps only
+        the beam_width best states - fast, but not guaranteed to find the optimum)
+    :param heuristic: lower bound of the remaining cost of a state, for astar and beam
+    :param state_key: canonical form of a state: states with the same key are treated as one
+        (e.g. a sorted tuple for states that are symmetric under reordering)
+    :param visited: store of visited keys: "set" (default, exact), "hash" (HashedVisited),
+        "bloom" (BloomVisited of memory bytes) or any object supporting add and in
+    :param memory: memory budget in bytes of the "bloom" store
+    :param beam_width: number of states kept per step by beam search
+    :param with_path: also return the states from start to goal (keeps a parent per state)
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown search method {method!r}, expected one of {METHODS}")
+    if method == "astar" and heuristic is None:
+        raise ValueError("astar needs a heuristic")
+    if method == "beam" and not beam_width:
+        raise ValueError("beam search needs a beam_width")
+    key = state_key if state_key is not None else (lambda state: state)
+    if callable(goal):
+        is_goal = goal
+    else:
+        goal_key = key(goal)
+
+        def is_goal(state):
+            return key(state) == goal_key
+
+    exact = visited is None or visited == "set"
+    seen = _visited_store(visited, memory)
+    parents = {} if with_path else None
+
+    if method == "bfs":
+        found = _bfs(start, neighbors, is_goal, key, seen, parents)
+    elif method == "beam":
+        found = _beam(start, neighbors, is_goal, heuristic, key, seen, parents, beam_width)
+    else:
+        h = heuristic if method == "astar" else None
+        found = _best_first(start, neighbors, is_goal, h, key, seen, exact, parents)
+    if found is None:
+        return None
+    state, k, cost = found
+    return SearchResult(state, cost, _build_path(parents, k) if with_path else None)
+
+
+def _bfs(start, neighbors, is_goal, key, seen, parents):
+    k = key(start)
+    seen.add(k)
+    if parents is not None:
+        parents[k] = (start, None)
+    queue = deque([(start, k, 0)])
+    while queue:
+        state, k, cost = queue.popleft()
+        if is_goal(state):
+            return state, k, cost
+        for child, step in neighbors(state):
+            child_key = key(child)
+            if child_key in seen:
+                continue
+            seen.add(child_key)
+            if parents is not None:
+                parents[child_key] = (child, k)
+            queue.append((child, child_key, cost + step))
+    return None
+
+
+def _best_first(start, neighbors, is_goal, heuristic, key, seen, exact, parents):
+    # dijkstra (heuristic None) or A*: states are closed in seen when popped, which also
+    # fixes their parent; with an exact store the best known cost per key keeps worse
+    # duplicates out of the heap
+    k = key(start)
+    best = {k: 0} if exact else None
+    tie = count()  # states need not be comparable
+    heap = [(heuristic(start) if heuristic else 0, 0, next(tie), start, k, None)]
+    while heap:
+        _, cost, _, state, k, parent = heapq.heappop(heap)
+        if k in seen:
+            continue  # stale entry - already expanded with a lower cost
+        seen.add(k)
+        if parents is not None:
+            parents[k] = (state, parent)
+        if is_goal(state):
+            return state, k, cost
+        for child, step in neighbors(state):
+            child_key = key(child)
+            if child_key in seen:
+                continue
+            child_cost = cost + step
+            if best is not None:
+                if child_key in best and best[child_key] <= child_cost:
+                    continue
+                best[child_key] = child_cost
+            estimate = child_cost + heuristic(child) if heuristic else child_cost
+            heapq.heappush(heap, (estimate, child_cost, next(tie), child, child_key, k))
+    return None
+
+
+def _beam(start, neighbors, is_goal, heuristic, key, seen, parents, beam_width):
+    k = key(start)
+    seen.add(k)
+    if parents is not None:
+        parents[k] = (start, None)
+    layer = [(start, k, 0)]
+    while layer:
+        goals = [entry for entry in layer if is_goal(entry[0])]
+        if goals:
+            return min(goals, key=lambda entry: entry[2])
+        # cheapest way to reach every new state of the next step
+        candidates = {}
+        for state, k, cost in layer:
+            for child, step in neighbors(state):
+                child_key = key(child)
+                if child_key in seen:
+                    continue
+                old = candidates.get(child_key)
+                if old is None or cost + step < old[2]:
+                    candidates[child_key] = (child, k, cost + step)
+
+        def rank(item):
+            child, _, cost = item[1]
+            return cost + heuristic(child) if heuristic else cost
+
+        layer = []
+        for child_key, (child, k, cost) in heapq.nsmallest(
+            beam_width, candidates.items(), key=rank
+        ):
+            seen.add(child_key)
+            if parents is not None:
+                parents[child_key] = (child, k)
+            layer.append((child, child_key, cost))
+    return None
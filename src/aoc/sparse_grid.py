@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterator
+
+from .grid import Grid, _build_path
+from .point import ALL_ADJACENTS, DIRECT_ADJACENTS, Point
+from .rect import Rect
+
+
+class SparseGrid:
+    """
+    Unbounded 2D grid with Point-based access.
+
+    Cells are stored in chunk_size x chunk_size chunks that are only allocated when a
+    non-background value is written into them; every other cell holds the background value.
+    The bounding Rect of all written non-background cells is maintained on every write (it
+    never shrinks). Iteration, rows and searches cover that bounding Rect.
+    """
+
+    def __init__(self, background: str = ".", chunk_size: int = 64):
+        """
+        :param background: value of every cell that was never written
+        :param chunk_size: side length of the allocated chunks
+        """
+        self.background = background
+        self.chunk_size = chunk_size
+        self._chunks: dict[tuple[int, int], list[str]] = {}
+        self._bounds = Rect()
+
+    @classmethod
+    def parse(cls, text: str, background: str = ".", chunk_size: int = 64) -> SparseGrid:
+        """Parse multiline string into SparseGrid with the top left cell at (0, 0)."""
+        grid = cls(background, chunk_size)
+        for y, row in enumerate(text.strip().split("\n")):
+            for x, v in enumerate(row):
+                if v != background:
+                    grid[(x, y)] = v
+        return grid
+
+    @classmethod
+    def from_grid(cls, grid: Grid, background: str = ".", chunk_size: int = 64) -> SparseGrid:
+        """Copy all non-background cells of a Grid."""
+        sparse = cls(background, chunk_size)
+        for p, v in grid.items():
+            if v != background:
+                sparse[p] = v
+        return sparse
+
+    @property
+    def bounds(self) -> Rect:
+        """Bounding Rect of all non-background cells written so far."""
+        return Rect(self._bounds.x, self._bounds.y, self._bounds.w, self._bounds.h)
+
+    @property
+    def width(self) -> int:
+        return self._bounds.w
+
+    @property
+    def height(self) -> int:
+        return self._bounds.h
+
+    def __getitem__(self, p: Point | tuple) -> str:
+        size = self.chunk_size
+        chunk = self._chunks.get((p[0] // size, p[1] // size))
+        if chunk is None:
+            return self.background
+        return chunk[(p[1] % size) * size + p[0] % size]
+
+    def __setitem__(self, p: Point | tuple, value: str):
+        size = self.chunk_size
+        key = (p[0] // size, p[1] // size)
+        chunk = self._chunks.get(key)
+        if value == self.background:
+            if chunk is not None:
+                chunk[(p[1] % size) * size + p[0] % size] = value
+            return
+        if chunk is None:
+            chunk = self._chunks[key] = [self.background] * (size * size)
+        chunk[(p[1] % size) * size + p[0] % size] = value
+        if p not in self._bounds:
+            self._bounds.extend((p[0], p[1]))
+
+    def __contains__(self, p: Point | tuple) -> bool:
+        """True if p lies within the bounding Rect."""
+        return p in self._bounds
+
+    def get(self, p: Point | tuple, default: str | None = None) -> str | None:
+        """Value at p; default for non-background cells outside of the bounding Rect."""
+        if p in self._bounds:
+            return self[p]
+        return default
+
+    def __iter__(self) -> Iterator[Point]:
+        yield from self._bounds
+
+    def items(self) -> Iterator[tuple[Point, str]]:
+        for p in self:
+            yield p, self[p]
+
+    def rows(self) -> Iterator[str]:
+        b = self._bounds
+        for y in range(b.y, b.y + b.h):
+            yield "".join(self[(x, y)] for x in range(b.x, b.x + b.w))
+
+    def find(self, value: str) -> Point | None:
+        for p in self.find_all(value):
+            return p
+        return None
+
+    def find_all(self, value: str) -> list[Point]:
+        """All points holding value, row by row. Only allocated chunks are scanned."""
+        if value == self.background:
+            return [p for p, v in self.items() if v == value]
+        size = self.chunk_size
+        result = []
+        for (cx, cy), chunk in self._chunks.items():
+            for i, v in enumerate(chunk):
+                if v == value:
+                    result.append(Point(cx * size + i % size, cy * size + i // size))
+        result.sort(key=lambda p: (p.y, p.x))
+        return result
+
+    def neighbors(self, p: Point | tuple, diagonal: bool = False) -> Iterator[Point]:
+        adjacents = ALL_ADJACENTS if diagonal else DIRECT_ADJACENTS
+        for dx, dy in adjacents:
+            yield Point(p[0] + dx, p[1] + dy)
+
+    def neighbor_values(
+        self, p: Point | tuple, diagonal: bool = False
+    ) -> Iterator[tuple[Point, str]]:
+        for np in self.neighbors(p, diagonal):
+            yield np, self[np]
+
+    def _search_area(self, start: Point | tuple, margin: int) -> Rect:
+        area = self.bounds
+        area.extend((start[0], start[1]))
+        return area.grow(margin) if margin else area
+
+    def flood_fill(
+        self,
+        start: Point | tuple,
+        predicate: Callable[[str], bool] | None = None,
+        margin: int = 1,
+    ) -> set[Point]:
+        """
+        Flood fill from start, limited to the bounding Rect (including start) grown by margin,
+        so filling the background reaches around the outside of every shape.
+        """
+        if predicate is None:
+            start_value = self[start]
+
+            def predicate(v):
+                return v == start_value
+
+        area = self._search_area(start, margin)
+        start = Point(*start) if not isinstance(start, Point) else start
+        result = set()
+        if not predicate(self[start]):
+            return result
+        result.add(start)
+        queue = deque([start])
+        while queue:
+            p = queue.popleft()
+            for np in self.neighbors(p):
+                if np not in result and np in area and predicate(self[np]):
+                    result.add(np)
+                    queue.append(np)
+        return result
+
+    def bfs(
+        self,
+        start: Point | tuple,
+        goal: Point | tuple | Callable[[Point], bool],
+        diagonal: bool = False,
+        passable: Callable[[str], bool] | None = None,
+        with_path: bool = True,
+        margin: int = 1,
+    ) -> tuple[list[Point], int] | int | None:
+        """
+        BFS pathfinding within the bounding Rect (including start) grown by margin.
+        Returns (path, distance) or None if no path found.
+
+        :param start: Starting point
+        :param goal: Target point or predicate function
+        :param diagonal: Include diagonal neighbors
+        :param passable: Predicate to check if a cell is passable (default: not '#')
+        :param with_path: Return (path, distance); otherwise only the distance or -1 if no path
+        :param margin: How far the search may leave the bounding Rect
+        """
+        if passable is None:
+
+            def passable(v):
+                return v != "#"
+
+        is_goal = goal if callable(goal) else lambda p: p[0] == goal[0] and p[1] == goal[1]
+        area = self._search_area(start, margin)
+        start = Point(*start) if not isinstance(start, Point) else start
+
+        queue = deque([(start, 0)])
+        parents = {start: None}
+        while queue:
+            node, dist = queue.popleft()
+            if is_goal(node):
+                return (_build_path(parents, node), dist) if with_path else dist
+            for neighbor in self.neighbors(node, diagonal):
+                if neighbor in parents or neighbor not in area:
+                    continue
+                if not passable(self[neighbor]):
+                    continue
+                parents[neighbor] = node
+                queue.append((neighbor, dist + 1))
+
+        return None if with_path else -1
+
+    def to_grid(self) -> Grid:
+        """Dense Grid of the bounding Rect (top left cell of the bounds at (0, 0))."""
+        return Grid(list(self.rows()))
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows())
+
+    def __repr__(self) -> str:
+        b = self._bounds
+        return f"SparseGrid({b.w}x{b.h} at ({b.x},{b.y}), {len(self._chunks)} chunks)"
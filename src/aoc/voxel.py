@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import product
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - neighbors are counted in pure python without it
+    np = None
+
+
+class VoxelGrid:
+    """
+    N-dimensional grid of small integer cells (0..255) stored in one bytearray.
+
+    Coordinates are tuples (x, y, z, ...) relative to origin; x varies fastest in the buffer
+    (index = sum((c - o) * stride)). Neighbor counting works on the whole grid at once (with
+    numpy if available); exterior and surface queries work on flat indices of a copy padded
+    with one layer of empty cells.
+    """
+
+    def __init__(self, shape: tuple[int, ...], origin: tuple[int, ...] | None = None):
+        """
+        :param shape: size per axis, e.g. (width, height, depth)
+        :param origin: coordinates of the first cell (default: all 0)
+        """
+        self.shape = tuple(shape)
+        self.origin = tuple(origin) if origin is not None else (0,) * len(self.shape)
+        if len(self.origin) != len(self.shape):
+            raise ValueError(f"origin {self.origin} does not match shape {self.shape}")
+        self._strides = _strides(self.shape)
+        self._data = bytearray(self._strides[-1] * self.shape[-1] if self.shape else 0)
+
+    @classmethod
+    def from_points(
+        cls, points: Iterable[tuple[int, ...]], value: int = 1, padding: int = 0
+    ) -> VoxelGrid:
+        """Smallest grid (grown by padding on every side) holding value at every point."""
+        points = list(points)
+        if not points:
+            raise ValueError("from_points needs at least one point")
+        low = [min(c) - padding for c in zip(*points)]
+        high = [max(c) + padding for c in zip(*points)]
+        grid = cls(tuple(h - lo + 1 for lo, h in zip(low, high)), tuple(low))
+        for p in points:
+            grid[p] = value
+        return grid
+
+    @property
+    def dimensions(self) -> int:
+        return len(self.shape)
+
+    def _index(self, p: tuple[int, ...]) -> int:
+        i = 0
+        for c, o, size, stride in zip(p, self.origin, self.shape, self._strides):
+            c -= o
+            if not 0 <= c < size:
+                raise IndexError(f"{p} outside of {self!r}")
+            i += c * stride
+        return i
+
+    def _coords(self, i: int) -> tuple[int, ...]:
+        coords = []
+        for o, size in zip(self.origin, self.shape):
+            i, c = divmod(i, size)
+            coords.append(c + o)
+        return tuple(coords)
+
+    def __getitem__(self, p: tuple[int, ...]) -> int:
+        return self._data[self._index(p)]
+
+    def __setitem__(self, p: tuple[int, ...], value: int):
+        self._data[self._index(p)] = value
+
+    def __contains__(self, p: tuple[int, ...]) -> bool:
+        return all(0 <= c - o < size for c, o, size in zip(p, self.origin, self.shape))
+
+    def get(self, p: tuple[int, ...], default: int | None = None) -> int | None:
+        return self[p] if p in self else default
+
+    def points(self, value: int = 1) -> Iterator[tuple[int, ...]]:
+        """All cells holding value, in buffer order."""
+        data = self._data
+        i = data.find(value)
+        while i >= 0:
+            yield self._coords(i)
+            i = data.find(value, i + 1)
+
+    def count(self, value: int = 1) -> int:
+        return self._data.count(value)
+
+    def padded(self, n: int = 1) -> VoxelGrid:
+        """Copy grown by n empty cells on every side (coordinates are kept)."""
+        grid = VoxelGrid(
+            tuple(size + 2 * n for size in self.shape), tuple(o - n for o in self.origin)
+        )
+        grid._data = _pad(self._data, self.shape, n, 0)
+        return grid
+
+    def copy(self) -> VoxelGrid:
+        grid = VoxelGrid(self.shape, self.origin)
+        grid._data[:] = self._data
+        return grid
+
+    def _offsets(self, strides: list[int], diagonal: bool) -> list[int]:
+        """Flat index deltas of all neighbors for the given strides."""
+        if diagonal:
+            deltas = product((-1, 0, 1), repeat=self.dimensions)
+            return [sum(d * s for d, s in zip(delta, strides)) for delta in deltas if any(delta)]
+        return [sign * s for s in strides for sign in (-1, 1)]
+
+    def neighbor_counts(self, value: int = 1, diagonal: bool = False) -> VoxelGrid:
+        """
+        Grid of the number of neighbors holding value for every cell.
+
+        :param value: cell value to count
+        :param diagonal: count all 3^N - 1 neighbors instead of the 2N face neighbors
+        """
+        counts = VoxelGrid(self.shape, self.origin)
+        if not self._data:
+            return counts
+        if np is not None:
+            # numpy axes are reversed: the last axis is x
+            cells = np.frombuffer(bytes(self._data), dtype=np.uint8).reshape(self.shape[::-1])
+            padded = np.pad((cells == value).astype(np.uint8), 1)
+            total = np.zeros(cells.shape, dtype=np.uint8)
+            n = self.dimensions
+            if diagonal:
+                deltas = [d for d in product((-1, 0, 1), repeat=n) if any(d)]
+            else:
+                deltas = [
+                    tuple(sign if k == axis else 0 for k in range(n))
+                    for axis in range(n)
+                    for sign in (-1, 1)
+                ]
+            for delta in deltas:
+                window = tuple(slice(1 + d, 1 + d + size) for d, size in zip(delta, cells.shape))
+                total += padded[window]
+            counts._data = bytearray(total.tobytes())
+            return counts
+
+        padded = _pad(_select(self._data, lambda b: b == value), self.shape, 1, 0)
+        strides = _strides(tuple(size + 2 for size in self.shape))
+        offsets = self._offsets(strides, diagonal)
+        out = counts._data
+        for i, j in zip(range(len(out)), _interior(self.shape, strides)):
+            out[i] = sum(padded[j + o] for o in offsets)
+        return counts
+
+    def life(
+        self,
+        birth: Iterable[int] = (3,),
+        survive: Iterable[int] = (2, 3),
+        diagonal: bool = True,
+        value: int = 1,
+    ) -> VoxelGrid:
+        """
+        One generation of a life-like automaton over cells holding value (others are empty).
+        The shape stays the same - pad the grid first if the pattern grows.
+        """
+        counts = self.neighbor_counts(value, diagonal)._data
+        birth, survive = set(birth), set(survive)
+        grid = VoxelGrid(self.shape, self.origin)
+        grid._data = bytearray(
+            value if (c in survive if v == value else c in birth) else 0
+            for v, c in zip(self._data, counts)
+        )
+        return grid
+
+    def _outside(self, empty: bytes) -> tuple[bytearray, list[int]]:
+        """
+        Flood the empty cells (1 in the given mask) from outside of the bounding box.
+        Returns the reached cells as a buffer padded by one cell and its strides.
+        """
+        strides = _strides(tuple(size + 2 for size in self.shape))
+        # the padding layer is empty and connects the whole outside; steps that wrap around
+        # an axis always land in the padding layer again, so only the buffer ends are checked
+        passable = _pad(empty, self.shape, 1, 1)
+        n = len(passable)
+        offsets = self._offsets(strides, False)
+        outside = bytearray(n)
+        passable[0] = 0
+        outside[0] = 1
+        queue = deque([0])
+        while queue:
+            i = queue.popleft()
+            for o in offsets:
+                j = i + o
+                if 0 <= j < n and passable[j]:
+                    passable[j] = 0
+                    outside[j] = 1
+                    queue.append(j)
+        return outside, strides
+
+    def exterior(self, empty: int = 0) -> VoxelGrid:
+        """
+        Grid with 1 for every empty cell reachable from outside of the bounding box through
+        empty cells (face neighbors), 0 otherwise. Enclosed pockets stay 0.
+        """
+        outside, strides = self._outside(_select(self._data, lambda b: b == empty))
+        grid = VoxelGrid(self.shape, self.origin)
+        grid._data = bytearray(outside[j] for j in _interior(self.shape, strides))
+        return grid
+
+    def surface_area(self, value: int = 1, exterior_only: bool = False) -> int:
+        """
+        Number of faces of cells holding value that do not touch another such cell.
+
+        :param value: cell value of the solid
+        :param exterior_only: only count faces reachable from outside (no enclosed pockets)
+        """
+        if exterior_only:
+            exposed, strides = self._outside(_select(self._data, lambda b: b != value))
+        else:
+            strides = _strides(tuple(size + 2 for size in self.shape))
+            exposed = _pad(_select(self._data, lambda b: b != value), self.shape, 1, 1)
+        offsets = self._offsets(strides, False)
+        faces = 0
+        for i, j in zip(range(len(self._data)), _interior(self.shape, strides)):
+            if self._data[i] == value:
+                faces += sum(exposed[j + o] for o in offsets)
+        return faces
+
+    def height_map(self, axis: int = -1, value: int | None = None) -> dict[tuple[int, ...], int]:
+        """
+        Highest coordinate along axis of a non-empty cell (or a cell holding value) for every
+        column that has one, keyed by the remaining coordinates.
+
+        :param axis: axis the columns run along (default: the last one, e.g. z)
+        :param value: only consider cells holding value (default: any non-zero cell)
+        """
+        axis %= self.dimensions
+        heights = {}
+        for i, v in enumerate(self._data):
+            if v if value is None else v == value:
+                p = self._coords(i)
+                key = p[:axis] + p[axis + 1 :]
+                if heights.get(key, p[axis] - 1) < p[axis]:
+                    heights[key] = p[axis]
+        return heights
+
+    def __repr__(self) -> str:
+        size = "x".join(map(str, self.shape))
+        return f"VoxelGrid({size} at {self.origin})"
+
+
+def _strides(shape: tuple[int, ...]) -> list[int]:
+    strides = []
+    stride = 1
+    for size in shape:
+        strides.append(stride)
+        stride *= size
+    return strides
+
+
+def _select(data: bytearray, predicate) -> bytearray:
+    """1 for every byte satisfying predicate, 0 otherwise."""
+    return data.translate(bytes(1 if predicate(b) else 0 for b in range(256)))
+
+
+def _interior(shape: tuple[int, ...], padded_strides: list[int]) -> Iterator[int]:
+    """Flat indices in a buffer padded by one cell of all cells of shape, in buffer order."""
+    ranges = [range(1, size + 1) for size in reversed(shape)]
+    strides = padded_strides[::-1]
+    for coords in product(*ranges):
+        yield sum(c * s for c, s in zip(coords, strides))
+
+
+def _pad(data: bytearray, shape: tuple[int, ...], n: int, fill: int) -> bytearray:
+    """Copy of a buffer of shape grown by n cells holding fill on every side."""
+    if not shape:
+        return bytearray(data)
+    padded_shape = tuple(size + 2 * n for size in shape)
+    strides = _strides(padded_shape)
+    out = bytearray([fill]) * (strides[-1] * padded_shape[-1])
+    width = shape[0]
+    ranges = [range(n, size + n) for size in reversed(shape[1:])]
+    outer = strides[1:][::-1]
+    src = 0
+    for coords in product(*ranges):
+        start = sum(c * s for c, s in zip(coords, outer)) + n
+        out[start : start + width] = data[src : src + width]
+        src += width
+    return out
@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+from aoc import NORTH, BitGrid, Grid, Point
+
+GARDEN = """
+...........
+.....###.#.
+.###.##..#.
+..#.#...#..
+....#.#....
+.##..S####.
+.##..#...#.
+.......##..
+.##.#.####.
+.##..##.##.
+...........
+"""
+
+DISH = """
+O....#....
+O.OO#....#
+.....##...
+OO.#O....O
+.O.....O#.
+O.#..O.#.#
+..O..#O..O
+.......O..
+#....###..
+#OO..#....
+"""
+
+
+def test_conversion():
+    grid = Grid(["#..#", ".##.", "...."])
+    bits = BitGrid.from_grid(grid)
+    assert (bits.width, bits.height) == (4, 3)
+    assert bits[Point(0, 0)] and bits[Point(3, 0)] and not bits[Point(1, 0)]
+    assert bits.row(1) == 0b0110
+    assert bits.count() == 4
+    assert list(bits.points()) == [Point(0, 0), Point(3, 0), Point(1, 1), Point(2, 1)]
+    assert list(bits.to_grid().rows()) == list(grid.rows())
+    assert str(BitGrid.parse("ab\nba", on=lambda v: v == "a")) == "#.\n.#"
+
+
+def test_set_operations():
+    a = BitGrid.parse("##.\n...")
+    b = BitGrid.parse(".##\n..#")
+    assert str(a & b) == ".#.\n..."
+    assert str(a | b) == "###\n..#"
+    assert str(a ^ b) == "#.#\n..#"
+    assert str(~a) == "..#\n###"
+    assert a == BitGrid.parse("##.\n...")
+    assert len({a, BitGrid.parse("##.\n..."), b}) == 2
+    with pytest.raises(ValueError):
+        a & BitGrid(2, 2)
+
+
+def test_setitem_and_shift():
+    bits = BitGrid(4, 3)
+    bits[Point(1, 1)] = True
+    bits[Point(3, 2)] = True
+    bits[Point(3, 2)] = False
+    assert bits.count() == 1
+    assert str(bits.shift(2, 1)) == "....\n....\n...#"
+    assert str(bits.shift(3, 0)) == "....\n....\n...."
+    assert str(bits.shift(-1, -1)) == "#...\n....\n...."
+
+
+def test_neighbor_counts_match_grid():
+    rng = random.Random(2)
+    grid = Grid(["".join(rng.choice(".#") for _ in range(9)) for _ in range(7)])
+    bits = BitGrid.from_grid(grid)
+    for diagonal in (False, True):
+        planes = bits.neighbor_counts(diagonal)
+        adjacent = bits.adjacent(diagonal)
+        for p in grid:
+            expected = sum(1 for v in grid.neighbor_values(p, diagonal) if v[1] == "#")
+            assert sum(plane[p] << k for k, plane in enumerate(planes)) == expected
+            assert adjacent[p] == (expected > 0)
+
+
+def test_life_matches_grid_simulate():
+    rows = ["......", "..#...", "...#..", ".###..", "......", "......"]
+
+    def rule(v, n):
+        return "#" if n == 3 or (v == "#" and n == 2) else "."
+
+    grid = Grid(rows)
+    grid.simulate(rule, 4)
+    bits = BitGrid.from_grid(Grid(rows))
+    for _ in range(4):
+        bits = bits.life()
+    assert list(bits.rows()) == list(grid.rows())
+
+
+def test_flood():
+    bits = BitGrid.parse("##.#\n.#.#\n.###", on=".")
+    assert str(bits.flood(Point(0, 1))) == "....\n#...\n#..."
+    assert bits.flood(Point(0, 0)).count() == 0
+
+
+def test_reachable():
+    grid = Grid.parse(GARDEN)
+    start = grid.find("S")
+    plots = BitGrid.from_grid(grid, on=lambda v: v != "#")
+    assert plots.reachable(start, 6).count() == 16
+
+
+def test_reachable_parity_matches_stepping():
+    grid = Grid.parse(GARDEN)
+    start = grid.find("S")
+    plots = BitGrid.from_grid(grid, on=lambda v: v != "#")
+    current = {start}
+    for step in range(1, 40):
+        current = {q for p in current for q in grid.neighbors(p) if grid[q] != "#"}
+        assert plots.reachable(start, step).count() == len(current)
+    assert plots.reachable(start, 26501365).count() == plots.reachable(start, 41).count()
+    assert plots.reachable(start, 26501364).count() == plots.reachable(start, 40).count()
+
+
+def test_tilt():
+    grid = Grid.parse(DISH)
+    rocks = BitGrid.from_grid(grid, on="O")
+    walls = BitGrid.from_grid(grid, on="#")
+    tilted = rocks.tilt(walls, NORTH)
+    assert tilted.count() == rocks.count()
+    assert sum(grid.height - p.y for p in tilted.points()) == 136
+
+
+def test_tile():
+    bits = BitGrid.parse("#.\n.#")
+    assert str(bits.tile(2, 3)) == "\n".join(["#.#.", ".#.#"] * 3)
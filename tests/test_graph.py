@@ -0,0 +1,267 @@
+import random
+
+import pytest
+
+from aoc import (
+    CompiledGraph,
+    Edge,
+    astar,
+    astar_length,
+    bfs,
+    bfs_all,
+    bfs_all_nodes,
+    bfs_length,
+    dfs,
+    dijkstra,
+    dijkstra_all,
+    dijkstra_length,
+    make_undirected,
+    node_set,
+)
+from aoc import graph as graph_module
+from aoc.graph import compile
+
+EDGES = {
+    "a": ["b"],
+    "e": "c",
+    "c": ["a", "b", ("d", 1.2)],
+    "b": Edge("a", 1.4),
+    "d": [Edge("a", 2), Edge("c"), "f"],
+    "f": [("c", 1.9), "g"],
+    "g": ("f",),
+}
+
+ED4 = {
+    "a": [("b", 7), ("d", 14), ("c", 10)],
+    "c": [("a", 9), ("f", 11)],
+    "b": [("c", 10), ("f", 15)],
+    "d": [("c", 2), ("e", 9)],
+    "e": ("f", 6),
+}
+
+
+def _random_graph(rng, n, m):
+    edges = {node: [] for node in range(n)}
+    for _ in range(m):
+        edges[rng.randrange(n)].append(rng.randrange(n))
+    return edges
+
+
+def test_bfs():
+    assert bfs(EDGES, "c", "g") == (["c", "d", "f", "g"], 3.2)
+    assert bfs_length(EDGES, "c", "g") == 3.2
+    assert bfs(EDGES, "c", lambda e: e.upper() >= "E") == (["c", "d", "f"], 2.2)
+
+
+def test_bidirectional_bfs():
+    assert bfs(EDGES, "c", "g", bidirectional=True) == (["c", "d", "f", "g"], 3.2)
+    assert bfs_length(EDGES, "c", "g", bidirectional=True) == 3.2
+    assert bfs(EDGES, "c", "c", bidirectional=True) == (["c"], 0)
+    assert bfs(EDGES, "a", "e", bidirectional=True) == (None, -1)
+    assert bfs_length(EDGES, "a", "e", bidirectional=True) == -1
+
+
+def test_bidirectional_bfs_matches_bfs():
+    rng = random.Random(4)
+    for _ in range(50):
+        edges = _random_graph(rng, 30, 45)
+        for start, target in [(rng.randrange(30), rng.randrange(30)) for _ in range(5)]:
+            expected = bfs_length(edges, start, target)
+            assert bfs_length(edges, start, target, bidirectional=True) == expected
+            path, dist = bfs(edges, start, target, bidirectional=True)
+            if expected < 0:
+                assert path is None
+                continue
+            assert path[0] == start and path[-1] == target
+            assert len(path) == dist + 1
+            for a, b in zip(path, path[1:]):
+                assert b in edges[a]
+
+
+def test_bidirectional_bfs_needs_destination():
+    with pytest.raises(ValueError):
+        bfs(EDGES, "c", lambda e: e == "g", bidirectional=True)
+
+
+def test_dijkstra_length():
+    undirected = make_undirected(ED4)
+    assert dijkstra_length(undirected, "a", "a") == 0
+    assert dijkstra_length(undirected, "a", "c") == 9
+    assert dijkstra_length(undirected, "a", "e") == 20
+    assert dijkstra_length(undirected, "a", "f") == 20
+
+
+def test_compile():
+    graph = compile(EDGES)
+    assert isinstance(graph, CompiledGraph)
+    assert compile(graph) is graph
+    assert len(graph) == 7
+    assert node_set(graph) == node_set(EDGES)
+    assert graph.edges("c") == [Edge("a", 1), Edge("b", 1), Edge("d", 1.2)]
+    assert graph.weights.typecode == "d"
+    assert compile(ED4).weights.typecode == "q"
+    # nodes that only appear as targets have no edges
+    leaf = compile({"x": ["y"]})
+    assert "y" in leaf and leaf.edges("y") == []
+
+
+def test_compiled_searches_match_dict():
+    graph = compile(EDGES)
+    for search in (bfs, bfs_length, dijkstra, dijkstra_length, dfs):
+        for start in "abcdefg":
+            for target in "abcdefg":
+                assert search(graph, start, target) == search(EDGES, start, target)
+    assert bfs(graph, "c", "g", bidirectional=True) == (["c", "d", "f", "g"], 3.2)
+    assert bfs_all_nodes(graph, "a") == bfs_all_nodes(EDGES, "a") == {"a", "b"}
+    undirected = compile(make_undirected(ED4))
+    assert dijkstra(undirected, "a", "e") == (["a", "c", "d", "e"], 20)
+    assert dijkstra_length(undirected, "a", lambda n: n in "ef") == 20
+
+
+def test_search_unknown_start():
+    assert bfs(EDGES, "z", "z") == (["z"], 0)
+    assert bfs(EDGES, "z", "a") == (None, -1)
+    assert dijkstra_length(EDGES, "z", "a") == -1
+    assert bfs_all_nodes(EDGES, "z") == {"z"}
+
+
+def test_bfs_all():
+    paths = bfs_all(EDGES, "c")
+    assert len(paths) == 6 and "e" not in paths
+    assert paths["g"] == bfs_length(EDGES, "c", "g")
+    assert paths.path("g") == ["c", "d", "f", "g"]
+    assert paths.parent("g") == "f" and paths.parent("c") is None
+    assert paths.path("e") is None and paths.get("e") is None
+    with pytest.raises(KeyError):
+        paths["e"]
+    assert set(paths) == bfs_all_nodes(EDGES, "c") - {"e"}
+
+
+def test_dijkstra_all():
+    undirected = make_undirected(ED4)
+    paths = dijkstra_all(undirected, "a")
+    assert dict(paths.items()) == {n: dijkstra_length(undirected, "a", n) for n in "abcdef"}
+    assert paths.path("e") == ["a", "c", "d", "e"]
+    assert list(dijkstra_all(ED4, "z").items()) == [("z", 0)]
+
+
+def test_dijkstra_all_matches_single_searches():
+    rng = random.Random(7)
+    edges = {n: [(rng.randrange(40), rng.randrange(1, 9)) for _ in range(3)] for n in range(40)}
+    paths = dijkstra_all(edges, 0)
+    for node in range(40):
+        assert paths.get(node, -1) == dijkstra_length(edges, 0, node)
+        path = paths.path(node)
+        if path is not None:
+            cost = sum(min(d for c, d in edges[a] if c == b) for a, b in zip(path, path[1:]))
+            assert cost == paths[node]
+
+
+def _grid_graph(rng, size):
+    edges = {}
+    for x in range(size):
+        for y in range(size):
+            edges[x, y] = [
+                Edge((x + dx, y + dy), rng.randrange(1, 10))
+                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                if 0 <= x + dx < size and 0 <= y + dy < size
+            ]
+    return edges
+
+
+def test_astar():
+    undirected = make_undirected(ED4)
+    assert astar(undirected, "a", "e", lambda n: 0) == dijkstra(undirected, "a", "e")
+    assert astar_length(ED4, "a", "z", lambda n: 0) == -1
+    assert astar(EDGES, "c", "c", lambda n: 0, consistent=True) == (["c"], 0)
+
+
+@pytest.mark.parametrize("consistent", [False, True])
+def test_astar_matches_dijkstra(consistent):
+    rng = random.Random(11)
+    edges = _grid_graph(rng, 12)
+    target = (11, 7)
+
+    def manhattan(p):
+        return abs(p[0] - target[0]) + abs(p[1] - target[1])
+
+    path, dist = astar(edges, (0, 0), target, manhattan, consistent)
+    assert dist == dijkstra_length(edges, (0, 0), target)
+    assert path[0] == (0, 0) and path[-1] == target
+    assert astar_length(edges, (3, 9), target, manhattan, consistent) == dijkstra_length(
+        edges, (3, 9), target
+    )
+
+
+def test_astar_admissible_inconsistent_heuristic():
+    rng = random.Random(5)
+    edges = _grid_graph(rng, 10)
+    target = (9, 9)
+    # exact remaining distances (the grid graph is symmetric in shape, not in weights)
+    reverse = {node: [] for node in edges}
+    for node, children in edges.items():
+        for child, dist in children:
+            reverse[child].append(Edge(node, dist))
+    exact = dict(dijkstra_all(reverse, target).items())
+    # random fractions of the exact distance: admissible but not consistent
+    estimate = {node: exact[node] * rng.choice((0, 0.5, 1)) for node in edges}
+    for start in [(0, 0), (4, 2), (9, 0)]:
+        assert astar_length(edges, start, target, estimate.get) == exact[start]
+
+
+def test_bidirectional_dijkstra():
+    undirected = make_undirected(ED4)
+    for target in "abcdef":
+        expected = dijkstra_length(undirected, "a", target)
+        assert dijkstra_length(undirected, "a", target, bidirectional=True) == expected
+    assert dijkstra(undirected, "a", "e", bidirectional=True) == (["a", "c", "d", "e"], 20)
+    assert dijkstra(ED4, "f", "a", bidirectional=True) == (None, -1)
+    assert dijkstra_length(EDGES, "c", "g", bidirectional=True) == dijkstra_length(EDGES, "c", "g")
+    with pytest.raises(ValueError):
+        dijkstra(ED4, "a", lambda n: n == "e", bidirectional=True)
+
+
+def test_bidirectional_dijkstra_matches_dijkstra():
+    rng = random.Random(9)
+    for _ in range(30):
+        edges = {
+            n: [(rng.randrange(40), rng.randrange(1, 20)) for _ in range(2)] for n in range(40)
+        }
+        graph = compile(edges)
+        for start, target in [(rng.randrange(40), rng.randrange(40)) for _ in range(5)]:
+            expected = dijkstra_length(graph, start, target)
+            path, dist = dijkstra(graph, start, target, bidirectional=True)
+            assert dist == expected
+            if path is None:
+                continue
+            assert path[0] == start and path[-1] == target
+            cost = sum(min(d for c, d in edges[a] if c == b) for a, b in zip(path, path[1:]))
+            assert cost == dist
+        assert graph.reverse() is graph.reverse()
+
+
+def test_dict_searches_do_not_compile(monkeypatch):
+    def fail(edges):
+        raise AssertionError("dict graph was compiled")
+
+    monkeypatch.setattr(graph_module, "compile", fail)
+    assert bfs(EDGES, "c", "g") == (["c", "d", "f", "g"], 3.2)
+    assert dijkstra_length(make_undirected(ED4), "a", "e") == 20
+    assert astar_length(ED4, "a", "e", lambda n: 0) == 23
+    assert dfs(EDGES, "c", "g") > 0
+    assert bfs_all(EDGES, "a").path("b") == ["a", "b"]
+    assert bfs_all_nodes(EDGES, "a") == {"a", "b"}
+
+
+def test_bidirectional_reverse_cache():
+    edges = {n: [(n + 1, 2), (n + 2, 5)] for n in range(50)}
+    expected = dijkstra_length(edges, 0, 50)
+    # the first query runs one sided, the second builds the reverse, later ones reuse it
+    for _ in range(3):
+        assert dijkstra_length(edges, 0, 50, bidirectional=True) == expected
+    reverse = graph_module._reverse_edges(edges)
+    assert reverse[50] == [(48, 5), (49, 2)]
+    assert graph_module._reverse_edges(edges) is reverse
+    edges[50] = [(51, 1)]  # new node: the reverse is rebuilt
+    assert dijkstra(edges, 0, 51, bidirectional=True) == dijkstra(edges, 0, 51)
+    assert graph_module._reverse_edges(edges)[51] == [(49, 5), (50, 1)]
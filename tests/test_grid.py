@@ -1,4 +1,20 @@
-from aoc import Grid, Point
+import itertools
+import random
+
+import pytest
+
+from aoc import (
+    FlatGrid,
+    Grid,
+    GridState,
+    Point,
+    Rect,
+    automaton,
+    bounded_cost,
+    momentum_rule,
+    turning_rule,
+)
+from aoc import grid as grid_module
 
 
 class TestGridCreation:
@@ -112,6 +128,57 @@ class TestGridSearch:
         assert grid.find_all("x") == []
 
 
+class TestGridValueIndex:
+    @pytest.mark.parametrize("grid_type", [Grid, FlatGrid])
+    def test_index_follows_writes(self, grid_type):
+        grid = grid_type(["#.O.", ".O.#", "O..."])
+        grid.build_index()
+        assert grid.find("O") == Point(2, 0)
+        assert grid.find_all("O") == [Point(2, 0), Point(1, 1), Point(0, 2)]
+        assert grid.count("O") == 3
+        grid[Point(2, 0)] = "."
+        grid[Point(3, 2)] = "O"
+        grid[Point(-1, 0)] = "@"  # negative indices wrap like for reads
+        assert grid.find("O") == Point(1, 1)
+        assert grid.find_all("O") == [Point(1, 1), Point(0, 2), Point(3, 2)]
+        assert grid.find("@") == Point(3, 0)
+        assert grid.count(".") == 6
+        assert grid.find("x") is None
+        assert grid.find_all("x") == []
+        assert grid.count("x") == 0
+
+    @pytest.mark.parametrize("grid_type", [Grid, FlatGrid])
+    def test_matches_scan(self, grid_type):
+        rng = random.Random(11)
+        rows = ["".join(rng.choice(".#O") for _ in range(8)) for _ in range(6)]
+        indexed, plain = grid_type(rows), grid_type(rows)
+        indexed.build_index()
+        for _ in range(50):
+            p = Point(rng.randrange(8), rng.randrange(6))
+            value = rng.choice(".#O")
+            indexed[p] = plain[p] = value
+        for value in ".#O":
+            assert indexed.find(value) == plain.find(value)
+            assert indexed.find_all(value) == plain.find_all(value)
+            assert indexed.count(value) == plain.count(value)
+
+    def test_copy_and_simulate_keep_index(self):
+        grid = Grid([".....", "..#..", "..#..", "..#..", "....."])
+        grid.build_index()
+        copy = grid.copy()
+        copy[Point(0, 0)] = "#"
+        assert grid.count("#") == 3
+        assert copy.count("#") == 4
+        grid.step(lambda v, n: "#" if n == 3 or (v == "#" and n == 2) else ".")
+        assert grid.find_all("#") == [Point(1, 2), Point(2, 2), Point(3, 2)]
+        grid.drop_index()
+        assert grid.count("#") == 3
+
+    def test_not_on_views(self):
+        with pytest.raises(TypeError):
+            Grid(["ab"]).transposed().build_index()
+
+
 class TestGridNeighbors:
     def test_neighbors_cardinal(self):
         grid = Grid(["abc", "def", "ghi"])
@@ -134,6 +201,71 @@ class TestGridNeighbors:
         assert set(values) == {(Point(0, 0), "a"), (Point(2, 0), "c"), (Point(1, 1), "e")}
 
 
+class TestGridNeighborTable:
+    def test_matches_neighbors(self):
+        grid = Grid(["abcd", "efgh", "ijkl"])
+        for diagonal in (False, True):
+            table = grid.neighbor_table(diagonal)
+            assert len(table.offsets) == grid.width * grid.height + 1
+            for p in grid:
+                i = p.y * grid.width + p.x
+                cells = table.targets[table.offsets[i] : table.offsets[i + 1]]
+                expected = [q.y * grid.width + q.x for q in grid.neighbors(p, diagonal)]
+                assert list(cells) == expected
+
+    def test_index_neighbors_match_table(self):
+        for width, height in [(1, 1), (1, 4), (5, 1), (4, 3)]:
+            for diagonal in (False, True):
+                table = Grid.create(width, height).neighbor_table(diagonal)
+                neighbors = grid_module._index_neighbors(width, height, diagonal)
+                for i in range(width * height):
+                    expected = table.targets[table.offsets[i] : table.offsets[i + 1]]
+                    assert neighbors(i) == list(expected)
+
+    def test_searches_evaluate_only_reached_cells(self):
+        grid = Grid.create(200, 200)
+        seen = set()
+
+        def passable(v):
+            seen.add(v)
+            return v != "#"
+
+        grid[Point(150, 150)] = "x"
+        assert grid.bfs(Point(0, 0), Point(2, 0), passable=passable, with_path=False) == 2
+        assert grid.dijkstra(Point(0, 0), Point(0, 3), passable=passable, with_path=False) == 3
+        assert seen == {"."}
+
+    def test_cached_per_size(self):
+        assert Grid(["...", "..."]).neighbor_table() is Grid(["abc", "def"]).neighbor_table()
+        assert Grid(["..."]).neighbor_table() is not Grid(["..."]).neighbor_table(True)
+
+    def test_passable_filter(self):
+        grid = Grid([".#.", "..."])
+        table = grid.neighbor_table(passable=lambda v: v != "#")
+        assert list(table.targets[table.offsets[0] : table.offsets[1]]) == [3]
+        assert list(table.targets[table.offsets[4] : table.offsets[5]]) == [5, 3]
+
+    def test_searches_match_point_search(self):
+        rng = random.Random(12)
+        for _ in range(20):
+            rows = ["".join(rng.choice("..#") for _ in range(9)) for _ in range(7)]
+            grid = Grid(rows)
+            tiled = Grid(rows).window(Rect(0, 0, 9, 7))
+            goal = Point(8, 6)
+            for diagonal in (False, True):
+                expected = grid._point_search(
+                    Point(0, 0), goal, None, None, diagonal, lambda v: v != "#"
+                )
+                expected = -1 if expected is None else expected[1]
+                assert grid.bfs(Point(0, 0), goal, diagonal, with_path=False) == expected
+                assert grid.dijkstra(Point(0, 0), goal, diagonal=diagonal, with_path=False) == (
+                    expected
+                )
+                assert tiled.astar(Point(0, 0), goal, diagonal=diagonal, with_path=False) == (
+                    expected
+                )
+
+
 class TestGridFloodFill:
     def test_flood_fill_same_value(self):
         grid = Grid(["..#", "..#", "###"])
@@ -146,6 +278,36 @@ class TestGridFloodFill:
         # 1,2,3,4 are < 5; 5 is not, so Point(1,1) is not included
         assert result == {Point(0, 0), Point(1, 0), Point(2, 0), Point(0, 1)}
 
+    def test_as_mask(self):
+        grid = Grid(["..#", "#.#", "..."])
+        mask = grid.flood_fill(Point(0, 0), as_mask=True)
+        assert len(mask) == 6
+        assert Point(2, 2) in mask
+        assert Point(2, 0) not in mask
+        assert Point(5, 5) not in mask
+        assert list(mask)[:3] == [Point(0, 0), Point(1, 0), Point(1, 1)]
+        assert mask.to_set() == grid.flood_fill(Point(0, 0))
+
+    def test_matches_naive_fill(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            rows = ["".join(rng.choice(".#") for _ in range(11)) for _ in range(8)]
+            grid = Grid(rows)
+            start = Point(rng.randrange(11), rng.randrange(8))
+            expected = {start}
+            queue = [start]
+            while queue:
+                p = queue.pop()
+                for np in grid.neighbors(p):
+                    if np not in expected and grid[np] == grid[start]:
+                        expected.add(np)
+                        queue.append(np)
+            assert grid.flood_fill(start) == expected
+            assert FlatGrid(rows).flood_fill(start) == expected
+            assert grid.transposed().flood_fill(Point(start.y, start.x)) == {
+                Point(p.y, p.x) for p in expected
+            }
+
 
 class TestGridBFS:
     def test_bfs_simple(self):
@@ -181,6 +343,88 @@ class TestGridBFS:
         result = grid.bfs(Point(0, 0), Point(2, 2), passable=lambda v: v != "X")
         assert result is None
 
+    def test_bfs_path_is_connected(self):
+        grid = Grid(["....#", ".##.#", "...#.", "#...."])
+        path, dist = grid.bfs(Point(0, 0), Point(4, 3))
+        assert len(path) == dist + 1
+        for a, b in zip(path, path[1:]):
+            assert abs(a.x - b.x) + abs(a.y - b.y) == 1
+            assert grid[b] != "#"
+
+    def test_bidirectional(self):
+        grid = Grid(["....#", ".##.#", "...#.", "#...."])
+        path, dist = grid.bfs(Point(0, 0), Point(4, 3), bidirectional=True)
+        assert dist == 7
+        assert path[0] == Point(0, 0) and path[-1] == Point(4, 3)
+        for a, b in zip(path, path[1:]):
+            assert abs(a.x - b.x) + abs(a.y - b.y) == 1
+            assert grid[b] != "#"
+        assert grid.bfs(Point(0, 0), Point(0, 0), bidirectional=True) == ([Point(0, 0)], 0)
+        assert grid.bfs(Point(0, 0), Point(4, 0), bidirectional=True) is None
+        with pytest.raises(ValueError):
+            grid.bfs(Point(0, 0), lambda p: False, bidirectional=True)
+
+    def test_bidirectional_matches_bfs(self):
+        rng = random.Random(9)
+        for _ in range(30):
+            grid = Grid(["".join(rng.choice("...#") for _ in range(10)) for _ in range(8)])
+            start = Point(rng.randrange(10), rng.randrange(8))
+            goal = Point(rng.randrange(10), rng.randrange(8))
+            for diagonal in (False, True):
+                expected = grid.bfs(start, goal, diagonal, with_path=False)
+                result = grid.bfs(start, goal, diagonal, bidirectional=True)
+                assert (result[1] if result else -1) == expected
+                if result:
+                    assert len(result[0]) == expected + 1
+
+    def test_jump_points(self):
+        grid = Grid(["........", ".####...", "....#.#.", "##..#.#.", "......#."])
+        for diagonal, expected in ((False, 11), (True, 9)):
+            path, dist = grid.bfs(Point(0, 0), Point(7, 4), diagonal, jump_points=True)
+            assert dist == expected
+            assert len(path) == dist + 1
+            assert path[0] == Point(0, 0) and path[-1] == Point(7, 4)
+            assert all(grid[p] != "#" for p in path)
+        assert grid.bfs(Point(0, 0), Point(0, 3), jump_points=True) is None
+        assert grid.bfs(Point(0, 0), Point(0, 0), jump_points=True, with_path=False) == 0
+        with pytest.raises(ValueError):
+            grid.bfs(Point(0, 0), lambda p: False, jump_points=True)
+        with pytest.raises(ValueError):
+            grid.bfs(Point(0, 0), Point(7, 4), jump_points=True, bidirectional=True)
+
+    def test_jump_points_match_bfs(self):
+        rng = random.Random(13)
+        for _ in range(200):
+            w, h = rng.randrange(1, 15), rng.randrange(1, 15)
+            density = rng.choice([0.1, 0.3])
+            rows = ["".join(rng.choices(".#", [1 - density, density], k=w)) for _ in range(h)]
+            grid = Grid(rows)
+            start = Point(rng.randrange(w), rng.randrange(h))
+            goal = Point(rng.randrange(w), rng.randrange(h))
+            for diagonal in (False, True):
+                expected = grid.bfs(start, goal, diagonal, with_path=False)
+                result = grid.bfs(start, goal, diagonal, jump_points=True)
+                assert (result[1] if result else -1) == expected
+                if result:
+                    path = result[0]
+                    assert len(path) == expected + 1
+                    for a, b in zip(path, path[1:]):
+                        assert max(abs(a.x - b.x), abs(a.y - b.y)) == 1
+                        assert diagonal or abs(a.x - b.x) + abs(a.y - b.y) == 1
+                        assert grid[b] != "#"
+
+    def test_bfs_start_outside_grid(self):
+        grid = Grid(["...", "..."])
+        with pytest.raises(IndexError):
+            grid.bfs(Point(3, 0), Point(0, 0))
+
+    def test_bfs_without_path(self):
+        grid = Grid(["...", ".#.", "..."])
+        assert grid.bfs(Point(0, 0), Point(2, 2), with_path=False) == 4
+        assert grid.bfs(Point(0, 0), Point(0, 0), with_path=False) == 0
+        blocked = Grid(["..#", "###", "#.."])
+        assert blocked.bfs(Point(0, 0), Point(2, 2), with_path=False) == -1
+
 
 class TestGridDFS:
     def test_dfs_finds_path(self):
@@ -201,6 +445,71 @@ class TestGridDFS:
         assert result == 5
 
 
+def _naive_longest(grid, start, goal, diagonal=False):
+    best = -1
+
+    def walk(cur, seen, dist):
+        nonlocal best
+        if cur == goal:
+            best = max(best, dist)
+            return
+        for np in grid.neighbors(cur, diagonal):
+            if np not in seen and grid[np] != "#":
+                seen.add(np)
+                walk(np, seen, dist + 1)
+                seen.remove(np)
+
+    walk(start, {start}, 0)
+    return best
+
+
+class TestGridLongestPath:
+    def test_matches_cell_level_search(self):
+        rng = random.Random(23)
+        for _ in range(40):
+            rows = ["".join(rng.choice("...#") for _ in range(6)) for _ in range(5)]
+            grid = Grid(rows)
+            start, goal = Point(0, 0), Point(5, 4)
+            grid[start] = grid[goal] = "."
+            assert grid.longest_path(start, goal) == _naive_longest(grid, start, goal)
+
+    def test_diagonal(self):
+        grid = Grid(["..#", "#.#", "#.."])
+        expected = _naive_longest(grid, Point(0, 0), Point(2, 2), diagonal=True)
+        assert expected == 4
+        assert grid.longest_path(Point(0, 0), Point(2, 2), diagonal=True) == expected
+
+    def test_maze(self):
+        grid = Grid(
+            [
+                "#.#####",
+                "#.....#",
+                "#.###.#",
+                "#.....#",
+                "###.#.#",
+                "#...#.#",
+                "#.#####",
+            ]
+        )
+        assert grid.longest_path(Point(1, 0), Point(1, 6)) == 14
+        assert _naive_longest(grid, Point(1, 0), Point(1, 6)) == 14
+
+    def test_long_corridor_does_not_recurse(self):
+        width = 3000
+        grid = Grid(["." * width])
+        assert grid.dfs(Point(0, 0), Point(width - 1, 0)) == width - 1
+
+    def test_predicate_goal(self):
+        grid = Grid(["S...", ".##.", "...E"])
+        assert grid.longest_path(Point(0, 0), lambda p: grid[p] == "E") == 5
+
+    def test_junction_graph(self):
+        grid = Grid(["#.###", "#...#", "###.#"])
+        edges = grid.junction_graph(Point(1, 0))
+        assert edges == {Point(1, 0): [(Point(3, 2), 4)], Point(3, 2): [(Point(1, 0), 4)]}
+        assert grid.junction_graph(Point(1, 0), prune_dead_ends=True) == {Point(1, 0): []}
+
+
 class TestGridDijkstra:
     def test_dijkstra_simple(self):
         grid = Grid(["...", "...", "..."])
@@ -231,6 +540,615 @@ class TestGridDijkstra:
         result = grid.dijkstra(Point(0, 0), Point(2, 2))
         assert result is None
 
+    def test_dijkstra_optimal_cost(self):
+        grid = Grid(["1163", "1381", "2136"])
+        path, total_cost = grid.dijkstra(
+            Point(0, 0), Point(3, 2), cost=lambda _from, _to, val: int(val)
+        )
+        assert total_cost == 1 + 2 + 1 + 3 + 6
+        assert total_cost == sum(int(grid[p]) for p in path[1:])
+
+    def test_dijkstra_without_path(self):
+        grid = Grid(["1163", "1381", "2136"])
+        cost = lambda _from, _to, val: int(val)  # noqa: E731
+        assert grid.dijkstra(Point(0, 0), Point(3, 2), cost=cost, with_path=False) == 13
+        blocked = Grid(["..#", "###", "#.."])
+        assert blocked.dijkstra(Point(0, 0), Point(2, 2), with_path=False) == -1
+
+
+class TestGridAStar:
+    GRID = [
+        "2413432311323",
+        "3215453535623",
+        "3255245654254",
+        "3446585845452",
+        "4546657867536",
+        "1438598798454",
+        "4457876987766",
+        "3637877979653",
+        "4654967986887",
+        "4564679986453",
+        "1224686865563",
+        "2546548887735",
+        "4322674655533",
+    ]
+
+    def test_astar_matches_dijkstra(self):
+        grid = Grid(self.GRID)
+        cost = lambda _from, _to, val: int(val)  # noqa: E731
+        goal = Point(grid.width - 1, grid.height - 1)
+        path, total = grid.astar(Point(0, 0), goal, cost=cost)
+        assert total == grid.dijkstra(Point(0, 0), goal, cost=cost, with_path=False)
+        assert total == sum(int(grid[p]) for p in path[1:])
+
+    def test_astar_unit_cost(self):
+        grid = Grid(["....#", ".##.#", "...#.", "#...."])
+        assert grid.astar(Point(0, 0), Point(4, 3), with_path=False) == 7
+        assert grid.astar(Point(0, 0), Point(4, 3), diagonal=True, with_path=False) == 5
+        assert grid.astar(Point(0, 0), Point(4, 0)) is None
+
+    def test_astar_custom_heuristic(self):
+        grid = Grid(["...", "...", "..."])
+        path, dist = grid.astar(Point(0, 0), lambda p: p == Point(2, 1), heuristic=lambda p: 0)
+        assert dist == 3
+        assert path[-1] == Point(2, 1)
+
+    def test_bucket_queue(self):
+        grid = Grid(self.GRID)
+
+        @bounded_cost(9)
+        def cost(_from, _to, val):
+            return int(val)
+
+        goal = Point(grid.width - 1, grid.height - 1)
+        path, total = grid.dijkstra(Point(0, 0), goal, cost=cost)
+        plain = grid.dijkstra(Point(0, 0), goal, cost=lambda a, b, v: int(v), with_path=False)
+        assert total == plain
+        assert total == sum(int(grid[p]) for p in path[1:])
+
+    def test_bucket_queue_rejects_out_of_range_cost(self):
+        grid = Grid(["19", "11"])
+        cost = bounded_cost(5)(lambda _from, _to, val: int(val))
+        with pytest.raises(ValueError):
+            grid.dijkstra(Point(0, 0), Point(1, 1), cost=cost, passable=lambda v: True)
+        with pytest.raises(ValueError):
+            grid.dijkstra(Point(0, 0), Point(1, 1), cost=bounded_cost(5)(lambda a, b, v: 1.5))
+
+    def test_float_costs(self):
+        grid = Grid(["...", ".#.", "..."])
+
+        def cost(_from, to, _val):
+            return 1.5
+
+        path, total = grid.dijkstra(Point(0, 0), Point(2, 1), cost=cost)
+        assert total == 4.5 and len(path) == 4
+        assert grid.astar(Point(0, 0), Point(2, 1), cost=cost) == (path, 4.5)
+        assert grid.tiled().dijkstra(Point(0, 0), Point(2, 1), cost=cost, with_path=False) == 4.5
+
+
+class TestGridStateSearch:
+    REINDEER_MAZE = [
+        "###############",
+        "#.......#....E#",
+        "#.#.###.#.###.#",
+        "#.....#.#...#.#",
+        "#.###.#####.#.#",
+        "#.#.#.......#.#",
+        "#.#.#####.###.#",
+        "#...........#.#",
+        "###.#.#####.#.#",
+        "#...#.....#.#.#",
+        "#.#.#.###.#.#.#",
+        "#.....#...#.#.#",
+        "#.###.#.#.#.#.#",
+        "#S..#.....#...#",
+        "###############",
+    ]
+
+    def test_crucible(self):
+        grid = Grid(TestGridAStar.GRID)
+        goal = Point(grid.width - 1, grid.height - 1)
+        result = grid.state_search(Point(0, 0), goal, momentum_rule(1, 3), max_steps=3)
+        path, total = result
+        assert total == 102
+        assert path[0].pos == Point(0, 0)
+        assert path[-1].pos == goal
+        assert all(state.steps <= 3 for state in path)
+
+    def test_ultra_crucible(self):
+        grid = Grid(TestGridAStar.GRID)
+        goal = Point(grid.width - 1, grid.height - 1)
+        total = grid.state_search(
+            Point(0, 0),
+            lambda s: s.pos == goal and s.steps >= 4,
+            momentum_rule(4, 10),
+            max_steps=10,
+            with_path=False,
+        )
+        assert total == 94
+
+        grid = Grid(["111111111111"] + ["999999999991"] * 4)
+        goal = Point(11, 4)
+        rule = momentum_rule(4, 10)
+        is_goal = lambda s: s.pos == goal and s.steps >= 4  # noqa: E731
+        assert grid.state_search((0, 0), is_goal, rule, max_steps=10, with_path=False) == 71
+
+    def test_reindeer_maze(self):
+        grid = Grid(self.REINDEER_MAZE)
+        start = GridState(grid.find("S"), 1, 0)
+        path, total = grid.state_search(start, grid.find("E"), turning_rule())
+        assert total == 7036
+        assert path[0] == start
+        assert sum(1000 if a.pos == b.pos else 1 for a, b in zip(path, path[1:])) == total
+
+    def test_no_path(self):
+        grid = Grid(["S#.", "##E"])
+        assert grid.state_search(GridState(Point(0, 0), 1), Point(2, 1), turning_rule()) is None
+        result = grid.state_search(Point(0, 0), Point(2, 1), turning_rule(), with_path=False)
+        assert result == -1
+
+    def test_rejects_states_beyond_max_steps(self):
+        grid = Grid(["1111"])
+        with pytest.raises(ValueError):
+            grid.state_search(Point(0, 0), Point(3, 0), momentum_rule(1, 3), max_steps=2)
+
+    def test_rejects_invalid_heading(self):
+        grid = Grid(["...", "..."])
+
+        def rule(_grid, state):
+            yield GridState(state.pos, state.heading + 1, 0), 1
+
+        with pytest.raises(ValueError):
+            grid.state_search(GridState(Point(0, 0), 3), Point(2, 1), rule)
+
+
+class TestGridDistanceMap:
+    def test_single_source(self):
+        grid = Grid(["...", ".#.", "..."])
+        dist = grid.distance_map(Point(0, 0))
+        assert dist[Point(0, 0)] == 0
+        assert dist[Point(2, 2)] == 4
+        assert Point(1, 1) not in dist
+        assert dist.get(Point(1, 1)) is None
+        assert len(dist) == 8
+        assert dist.max() == 4
+
+    def test_matches_bfs(self):
+        grid = Grid(["..#...", ".##.#.", "......", "#.##.#"])
+        dist = grid.distance_map((0, 0))
+        for p, d in dist.items():
+            assert grid.bfs(Point(0, 0), p, with_path=False) == d
+        for p in grid:
+            if p not in dist:
+                assert grid.bfs(Point(0, 0), p) is None
+
+    def test_multiple_sources(self):
+        grid = Grid([".....", "....."])
+        dist = grid.distance_map([Point(0, 0), Point(4, 1)])
+        assert dist[Point(2, 0)] == 2
+        assert dist[Point(4, 0)] == 1
+        assert dist[Point(0, 1)] == 1
+
+    def test_source_outside_grid(self):
+        grid = Grid(["...", "..."])
+        with pytest.raises(IndexError):
+            grid.distance_map(Point(5, 0))
+        with pytest.raises(IndexError):
+            grid.distance_map([Point(0, 0), Point(-1, 1)])
+
+    def test_max_distance(self):
+        grid = Grid.create(7, 7)
+        dist = grid.distance_map(Point(3, 3), max_distance=2)
+        assert len(dist) == 13
+        assert dist.within(1) == 5
+        assert Point(0, 0) not in dist
+
+    def test_with_cost(self):
+        grid = Grid(["1163", "1381", "2136"])
+        cost = lambda _from, _to, val: int(val)  # noqa: E731
+        dist = grid.distance_map(Point(0, 0), cost=cost)
+        for p in grid:
+            assert dist[p] == grid.dijkstra(Point(0, 0), p, cost=cost, with_path=False)
+
+    def test_float_costs(self):
+        grid = Grid(["...", ".#.", "..."])
+        dist = grid.distance_map(Point(0, 0), cost=lambda _from, _to, _val: 0.5)
+        assert dist[Point(2, 2)] == 2.0
+        assert dist.max() == 2.0
+        assert Point(1, 1) not in dist
+        assert len(dist) == 8
+
+    def test_flat_grid(self):
+        rows = ["..#...", ".##.#.", "......", "#.##.#"]
+        expected = dict(Grid(rows).distance_map((5, 0), diagonal=True).items())
+        assert dict(FlatGrid(rows).distance_map((5, 0), diagonal=True).items()) == expected
+
+
+def _life(value, n):
+    return "#" if n == 3 or (value == "#" and n == 2) else "."
+
+
+def _lumber(value, trees, yards):
+    if value == ".":
+        return "|" if trees >= 3 else "."
+    if value == "|":
+        return "#" if yards >= 3 else "|"
+    return "#" if yards and trees else "."
+
+
+def _naive_step(grid, rule, count, diagonal=True):
+    result = grid.copy()
+    for p, v in grid.items():
+        values = [nv for _, nv in grid.neighbor_values(p, diagonal)]
+        result[p] = rule(v, *(values.count(c) for c in count))
+    return result
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def with_numpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(automaton, "np", None)
+    return request.param
+
+
+class TestGridPoiDistances:
+    DUCTS = ["###########", "#0.1.....2#", "#.#######.#", "#4.......3#", "###########"]
+
+    def test_ducts(self):
+        grid = Grid(self.DUCTS)
+        points, dist = grid.poi_distances("01234")
+        assert points == [grid.find(v) for v in "01234"]
+        assert dist[0] == [0, 2, 8, 10, 2]
+        assert all(dist[i][j] == dist[j][i] for i in range(5) for j in range(5))
+        routes = (
+            sum(dist[a][b] for a, b in zip((0, *order), order))
+            for order in itertools.permutations(range(1, 5))
+        )
+        assert min(routes) == 14
+
+    def test_points_and_unreachable(self):
+        grid = Grid(["..#.", "..#.", "..#."])
+        points, dist = grid.poi_distances([(0, 0), Point(1, 2), (3, 0)])
+        assert points == [Point(0, 0), Point(1, 2), Point(3, 0)]
+        assert dist == [[0, 3, -1], [3, 0, -1], [-1, -1, 0]]
+        assert grid.poi_distances([(0, 0), (1, 2)], diagonal=True).distances[0][1] == 2
+        with pytest.raises(IndexError):
+            grid.poi_distances([(4, 0)])
+
+    def test_workers_match_sequential(self):
+        rng = random.Random(8)
+        grid = Grid(["".join(rng.choice("....#") for _ in range(30)) for _ in range(20)])
+        pois = [Point(rng.randrange(30), rng.randrange(20)) for _ in range(7)]
+        expected = grid.poi_distances(pois)
+        assert grid.poi_distances(pois, workers=3) == expected
+
+
+class TestGridComponents:
+    GARDEN = [
+        "RRRRIICCFF",
+        "RRRRIICCCF",
+        "VVRRRCCFFF",
+        "VVRCCCJFFF",
+        "VVVVCJJCFE",
+        "VVIVCCJJEE",
+        "VVIIICJJEE",
+        "MIIIIIJJEE",
+        "MIIISIJEEE",
+        "MMMISSJEEE",
+    ]
+
+    def test_small_garden(self):
+        components = Grid(["AAAA", "BBCD", "BBCC", "EEEC"]).label_components()
+        assert len(components) == 5
+        a, b, c, d, e = components
+        assert (a.key, a.area, a.perimeter, a.corners) == ("A", 4, 10, 4)
+        assert (b.key, b.area, b.perimeter, b.corners) == ("B", 4, 8, 4)
+        assert (c.key, c.area, c.perimeter, c.corners) == ("C", 4, 10, 8)
+        assert (d.area, d.perimeter, d.corners) == (1, 4, 4)
+        assert (e.area, e.perimeter, e.corners) == (3, 8, 4)
+        assert c.bounds == Rect(2, 1, 2, 3)
+        assert components.label(Point(3, 3)) == c.label
+        assert components.cells(c.label) == [Point(2, 1), Point(2, 2), Point(3, 2), Point(3, 3)]
+
+    def test_garden_prices(self):
+        components = Grid(self.GARDEN).label_components()
+        assert len(components) == 11
+        assert sum(r.area * r.perimeter for r in components) == 1930
+        assert sum(r.area * r.corners for r in components) == 1206
+
+    def test_enclosed_regions(self):
+        grid = Grid(["EEEEE", "EXXXX", "EEEEE", "EXXXX", "EEEEE"])
+        assert sum(r.area * r.corners for r in grid.label_components()) == 236
+        grid = Grid(["AAAAAA", "AAABBA", "AAABBA", "ABBAAA", "ABBAAA", "AAAAAA"])
+        assert sum(r.area * r.corners for r in grid.label_components()) == 368
+
+    def test_matches_flood_fill(self):
+        rng = random.Random(5)
+        grid = Grid(["".join(rng.choice("ab") for _ in range(12)) for _ in range(9)])
+        components = grid.label_components()
+        for region in components:
+            cells = components.cells(region.label)
+            assert set(cells) == grid.flood_fill(cells[0])
+            assert region.area == len(cells)
+
+    def test_diagonal_and_key(self):
+        grid = Grid(["#..", ".#.", "..#"])
+        assert len(grid.label_components()) == 5
+        components = grid.label_components(diagonal=True, key=lambda v: v if v == "#" else None)
+        assert len(components) == 1
+        assert components[0].area == 3
+        assert components[0].bounds == Rect(0, 0, 3, 3)
+        assert components.label(Point(1, 0)) == -1
+        assert components.region(Point(1, 0)) is None
+
+
+class TestGridAutomaton:
+    LUMBER = [
+        ".#.#...|#.",
+        ".....#|##|",
+        ".|..|...#.",
+        "..|#.....#",
+        "#.#|||#|#|",
+        "...#.||...",
+        ".|....|...",
+        "||...#|.#|",
+        "|.||||..|.",
+        "...#.|..|.",
+    ]
+
+    @pytest.mark.usefixtures("with_numpy")
+    @pytest.mark.parametrize("grid_type", [Grid, FlatGrid])
+    def test_lumber(self, grid_type):
+        grid = grid_type(self.LUMBER)
+        assert grid.simulate(_lumber, 10, count="|#") == 10
+        assert len(grid.find_all("|")) * len(grid.find_all("#")) == 1147
+
+    @pytest.mark.usefixtures("with_numpy")
+    @pytest.mark.parametrize("diagonal", [True, False])
+    def test_matches_naive_step(self, diagonal):
+        rng = random.Random(7)
+        grid = Grid(["".join(rng.choice(".#") for _ in range(9)) for _ in range(7)])
+        expected = grid
+        for _ in range(5):
+            expected = _naive_step(expected, _life, "#", diagonal)
+            grid.step(_life, diagonal=diagonal)
+            assert str(grid) == str(expected)
+
+    def test_step_returns_changed_cells(self):
+        grid = Grid([".....", "..#..", "..#..", "..#..", "....."])
+        assert grid.step(_life) == 4
+        assert str(grid) == ".....\n.....\n.###.\n.....\n....."
+
+    @pytest.mark.usefixtures("with_numpy")
+    def test_stops_when_stable(self):
+        grid = Grid(["....", ".##.", ".##.", "...."])
+        assert grid.simulate(_life, 100) == 1
+        assert str(grid) == "....\n.##.\n.##.\n...."
+
+    def test_frontier(self):
+        rows = ["." * 30 for _ in range(30)]
+        rows[1] = "..#" + "." * 27
+        rows[2] = "...#" + "." * 26
+        rows[3] = ".###" + "." * 26
+        frontier, full = Grid(rows), Grid(rows)
+        frontier.simulate(_life, 40, frontier=True)
+        full.simulate(_life, 40)
+        assert str(frontier) == str(full)
+        assert len(full.find_all("#")) == 5  # glider keeps its shape
+
+    @pytest.mark.usefixtures("with_numpy")
+    def test_multi_character_values(self):
+        grid = Grid([["on", "off"], ["on", "on"]])
+
+        def rule(value, n):
+            return "on" if n >= 2 else "off"
+
+        grid.step(rule, count=["on"])
+        assert list(grid.items()) == [
+            (Point(0, 0), "on"),
+            (Point(1, 0), "on"),
+            (Point(0, 1), "on"),
+            (Point(1, 1), "on"),
+        ]
+
+
+def _spin(grid):
+    for dx, dy in ((0, -1), (-1, 0), (0, 1), (1, 0)):
+        xs = range(grid.width) if dx <= 0 else range(grid.width - 1, -1, -1)
+        ys = range(grid.height) if dy <= 0 else range(grid.height - 1, -1, -1)
+        for y in ys:
+            for x in xs:
+                if grid[(x, y)] != "O":
+                    continue
+                nx, ny = x, y
+                while (nx + dx, ny + dy) in grid and grid[(nx + dx, ny + dy)] == ".":
+                    nx, ny = nx + dx, ny + dy
+                grid[(x, y)] = "."
+                grid[(nx, ny)] = "O"
+
+
+class TestGridFingerprint:
+    DISH = [
+        "O....#....",
+        "O.OO#....#",
+        ".....##...",
+        "OO.#O....O",
+        ".O.....O#.",
+        "O.#..O.#.#",
+        "..O..#O..O",
+        ".......O..",
+        "#....###..",
+        "#OO..#....",
+    ]
+
+    @pytest.mark.parametrize("grid_type", [Grid, FlatGrid])
+    def test_incremental_matches_full(self, grid_type):
+        grid = grid_type(self.DISH)
+        before = grid.fingerprint
+        grid[Point(1, 0)] = "O"
+        assert grid.fingerprint != before
+        assert grid.fingerprint == grid_type(list(grid.rows())).fingerprint
+        grid[Point(1, 0)] = "."
+        assert grid.fingerprint == before
+
+    def test_copy_keeps_fingerprint(self):
+        grid = Grid(self.DISH)
+        copy = grid.copy()
+        assert copy.fingerprint == grid.fingerprint
+        _spin(copy)
+        assert copy.fingerprint == Grid(list(copy.rows())).fingerprint
+        assert copy.fingerprint != grid.fingerprint
+
+    def test_same_for_both_storages(self):
+        assert Grid(self.DISH).fingerprint == FlatGrid(self.DISH).fingerprint
+
+    @pytest.mark.parametrize("grid_type", [Grid, FlatGrid])
+    def test_run_until_cycle(self, grid_type):
+        grid = grid_type(self.DISH)
+        result = grid.run_until_cycle(_spin, 1_000_000_000)
+        load = sum(grid.height - p.y for p in result.grid.find_all("O"))
+        assert load == 64
+        assert (result.start, result.length) == (3, 7)
+        assert str(grid) == "\n".join(self.DISH)  # original grid untouched
+
+    def test_run_until_cycle_matches_direct_steps(self):
+        grid = Grid(self.DISH)
+        expected = grid.copy()
+        for _ in range(25):
+            _spin(expected)
+        assert str(grid.run_until_cycle(_spin, 25).grid) == str(expected)
+
+    def test_run_until_cycle_with_returned_grids(self):
+        grid = Grid(["ab"])
+        result = grid.run_until_cycle(lambda g: g.transpose().transpose(), 10)
+        assert (result.start, result.length) == (0, 1)
+
+    def test_run_until_cycle_without_cycle(self):
+        def count_up(grid):
+            grid[Point(0, 0)] = str(int(grid[Point(0, 0)]) + 1)
+
+        result = Grid(["0"]).run_until_cycle(count_up, 5)
+        assert (result.grid[Point(0, 0)], result.start, result.length) == ("5", -1, 0)
+
+
+def _rotate_cw(rows):
+    return ["".join(row[x] for row in reversed(rows)) for x in range(len(rows[0]))]
+
+
+class TestGridViews:
+    ROWS = ["abcd", "efgh", "ijkl"]
+
+    def test_transposed(self):
+        grid = Grid(self.ROWS)
+        view = grid.transposed()
+        assert (view.width, view.height) == (3, 4)
+        assert list(view.rows()) == list(grid.transpose().rows())
+        assert repr(view) == "GridView(3x4 of Grid(4x3))"
+
+    @pytest.mark.parametrize("grid_type", [Grid, FlatGrid])
+    def test_rotated(self, grid_type):
+        grid = grid_type(self.ROWS)
+        expected = self.ROWS
+        for turns in range(5):
+            assert list(grid.rotated(turns).rows()) == expected
+            expected = _rotate_cw(expected)
+
+    def test_mirrored(self):
+        grid = Grid(self.ROWS)
+        assert list(grid.mirrored().rows()) == ["dcba", "hgfe", "lkji"]
+        assert list(grid.mirrored(vertical=True).rows()) == ["ijkl", "efgh", "abcd"]
+
+    def test_orientations(self):
+        grid = Grid(self.ROWS)
+        variants = {str(view) for view in grid.orientations()}
+        assert len(variants) == 8
+        assert str(grid.transposed()) in variants
+
+    def test_stacked_views_collapse(self):
+        grid = Grid(self.ROWS)
+        view = grid.rotated().mirrored().window(Rect(1, 1, 2, 2))
+        assert view._parent is grid
+        expected = Grid(self.ROWS).rotated().materialize().mirrored().materialize()
+        assert str(view) == str(expected.window(Rect(1, 1, 2, 2)).materialize())
+
+    def test_window(self):
+        grid = Grid(self.ROWS)
+        view = grid.window(Rect(1, 1, 2, 2))
+        assert list(view.rows()) == ["fg", "jk"]
+        assert view.find("k") == Point(1, 1)
+        assert Point(2, 0) not in view
+        with pytest.raises(IndexError):
+            view[Point(2, 0)]
+        with pytest.raises(ValueError):
+            grid.window(Rect(3, 0, 2, 2))
+
+    def test_tiled(self):
+        grid = Grid(["ab", "cd"])
+        view = grid.tiled()
+        assert view[Point(-1, -1)] == "d"
+        assert view[Point(5, 2)] == "b"
+        assert Point(1000, -1000) in view
+        assert list(view.rows()) == ["ab", "cd"]
+        assert repr(view) == "GridView(tiled 2x2 of Grid(2x2))"
+
+    def test_tiled_bfs(self):
+        grid = Grid(["...", ".#.", "..."]).tiled()
+        assert grid.bfs(Point(1, 0), Point(1, 5), with_path=False) == 7
+
+    def test_tiled_unreachable(self):
+        assert Grid(["...", ".#.", "..."]).tiled().bfs((0, 0), (10, 10)) is None
+        # rows never connect: the open row repeats sideways only
+        corridor = Grid(["...", "###"]).tiled()
+        assert corridor.bfs((0, 0), (7, 0), with_path=False) == 7
+        assert corridor.dijkstra((0, 0), (5, 3)) is None
+        assert corridor.astar((0, 0), (-4, 2), with_path=False) == -1
+        # enclosed cell, and a start on a wall that opens into a single enclosed cell
+        pocket = Grid(["#####", "#.#.#", "#####"]).tiled()
+        assert pocket.bfs((1, 1), (6, 1)) is None
+        assert pocket.bfs((2, 1), (1, 1), with_path=False) == 1
+        assert pocket.bfs((2, 1), (6, 1)) is None
+        # diagonal steps connect every other tile only
+        checker = Grid([".#", "#."]).tiled()
+        assert checker.bfs((0, 0), (3, 3), diagonal=True, with_path=False) == 3
+        assert checker.bfs((0, 0), (2, 0), diagonal=True, with_path=False) == 2
+        assert checker.bfs((0, 0), (1, 0), diagonal=True) is None
+
+    def test_tiled_unsupported(self):
+        view = Grid(["...", ".#.", "..."]).tiled()
+        with pytest.raises(TypeError):
+            view.flood_fill(Point(0, 0))
+        with pytest.raises(TypeError):
+            view.bfs(Point(0, 0), lambda p: p.x > 5)
+
+    def test_search_apis(self):
+        grid = Grid(["S.#", "..#", "#.E"])
+        view = grid.rotated(2)  # E now at (0, 0), S at (2, 2)
+        assert view.find("E") == Point(0, 0)
+        assert view.bfs(view.find("S"), view.find("E"), with_path=False) == 4
+        assert view.distance_map(Point(0, 0))[Point(2, 2)] == 4
+        assert set(view.neighbors(Point(0, 0))) == {Point(1, 0), Point(0, 1)}
+
+    def test_write_through(self):
+        grid = Grid(self.ROWS)
+        before = grid.fingerprint
+        view = grid.transposed()
+        view[Point(0, 1)] = "X"
+        assert grid[Point(1, 0)] == "X"
+        assert grid.fingerprint != before
+        assert view.fingerprint == Grid(list(view.rows())).fingerprint
+
+    @pytest.mark.parametrize("grid_type", [Grid, FlatGrid])
+    def test_materialize(self, grid_type):
+        grid = grid_type(self.ROWS)
+        copy = grid.rotated().materialize()
+        assert type(copy) is grid_type
+        assert list(copy.rows()) == _rotate_cw(self.ROWS)
+        copy[Point(0, 0)] = "X"
+        assert grid[Point(0, 2)] == "i"
+        assert list(grid.window(Rect(0, 0, 2, 1)).copy().rows()) == ["ab"]
+
 
 class TestGridCopy:
     def test_copy_is_independent(self):
@@ -249,3 +1167,81 @@ class TestGridStr:
     def test_repr(self):
         grid = Grid(["abc", "def"])
         assert repr(grid) == "Grid(3x2)"
+
+
+class TestFlatGrid:
+    def test_same_api_as_grid(self):
+        rows = ["#..#", ".#..", "...#"]
+        grid, flat = Grid(rows), FlatGrid(rows)
+        assert (flat.width, flat.height) == (grid.width, grid.height)
+        assert list(flat.items()) == list(grid.items())
+        assert list(flat.rows()) == rows
+        assert str(flat) == str(grid)
+        assert repr(flat) == "FlatGrid(4x3)"
+
+    def test_parse_and_create(self):
+        assert isinstance(FlatGrid.parse("ab\ncd"), FlatGrid)
+        grid = FlatGrid.create(3, 2, "#")
+        assert isinstance(grid, FlatGrid)
+        assert str(grid) == "###\n###"
+
+    def test_setitem_and_bounds(self):
+        grid = FlatGrid(["ab", "cd"])
+        grid[Point(1, 0)] = "X"
+        assert grid[(1, 0)] == "X"
+        assert grid.get(Point(2, 0)) is None
+        with pytest.raises(IndexError):
+            grid[Point(2, 0)]
+        with pytest.raises(IndexError):
+            grid[Point(0, 2)] = "Y"
+        grid[Point(-1, 0)] = "Y"  # negative indices wrap like in Grid
+        assert grid[Point(1, 0)] == "Y"
+
+    def test_rejected_setitem_keeps_index_and_fingerprint(self):
+        grid = FlatGrid(["ab", "cd"])
+        grid.build_index()
+        before = grid.fingerprint
+        with pytest.raises(TypeError):
+            grid[Point(0, 0)] = "xy"
+        with pytest.raises(ValueError):
+            grid[Point(0, 0)] = "€"
+        assert grid[Point(0, 0)] == "a"
+        assert grid.find("a") == Point(0, 0)
+        assert grid.find("xy") is None
+        assert grid.find("€") is None
+        assert grid.fingerprint == before == FlatGrid(["ab", "cd"]).fingerprint
+
+    def test_find(self):
+        grid = FlatGrid(["aba", "bab"])
+        assert grid.find("b") == Point(1, 0)
+        assert grid.find("x") is None
+        assert grid.find_all("a") == [Point(0, 0), Point(2, 0), Point(1, 1)]
+        assert grid.find("ab") is None
+        assert grid.find("\u20ac") is None
+        assert grid.find_all("\u20ac") == []
+
+    def test_copy_is_independent(self):
+        grid = FlatGrid(["ab", "cd"])
+        copy = grid.copy()
+        copy[Point(0, 0)] = "X"
+        assert grid[Point(0, 0)] == "a"
+        assert copy[Point(0, 0)] == "X"
+        assert isinstance(copy, FlatGrid)
+
+    def test_transpose(self):
+        grid = FlatGrid(["abc", "def"])
+        assert list(grid.transpose().rows()) == list(Grid(["abc", "def"]).transpose().rows())
+
+    def test_search(self):
+        grid = FlatGrid(["...", ".#.", "..."])
+        path, dist = grid.bfs(Point(0, 0), Point(2, 2))
+        assert dist == 4
+        assert Point(1, 1) not in path
+
+    def test_rejects_ragged_rows(self):
+        with pytest.raises(ValueError):
+            FlatGrid(["abc", "de"])
+        with pytest.raises(ValueError):
+            FlatGrid([["10", "2"], ["3", "4"]])
+        with pytest.raises(ValueError):
+            FlatGrid(["a\u20ac"])
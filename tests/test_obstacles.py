@@ -0,0 +1,77 @@
+import pytest
+
+from aoc import EAST, NORTH, SOUTH, WEST, Grid, ObstacleIndex, Point
+
+LAB = """
+....#.....
+.........#
+..........
+..#.......
+.......#..
+..........
+.#..^.....
+........#.
+#.........
+......#...
+"""
+
+
+def _cells(start, walk):
+    """All cells covered by a walk, stepping along the segments between its stops."""
+    cells = {start}
+    pos = start
+    for stop, heading in [*walk.stops, (walk.exit, None)]:
+        if stop is None:
+            break
+        dx, dy = (stop.x > pos.x) - (stop.x < pos.x), (stop.y > pos.y) - (stop.y < pos.y)
+        while pos != stop:
+            pos = Point(pos.x + dx, pos.y + dy)
+            cells.add(pos)
+    return cells
+
+
+def test_next_obstacle():
+    index = Grid(["..#.", "....", "#..#"]).obstacle_index()
+    assert len(index) == 3
+    assert index.next_obstacle(Point(0, 0), EAST) == Point(2, 0)
+    assert index.next_obstacle(Point(2, 0), EAST) is None
+    assert index.next_obstacle(Point(3, 0), WEST) == Point(2, 0)
+    assert index.next_obstacle(Point(0, 0), SOUTH) == Point(0, 2)
+    assert index.next_obstacle(Point(3, 2), NORTH) is None
+    assert index.next_obstacle(Point(1, 5), NORTH) is None
+    with pytest.raises(ValueError):
+        index.next_obstacle(Point(0, 0), (1, 1))
+
+
+def test_toggle():
+    index = ObstacleIndex(4, 3, [(2, 0)])
+    assert index.toggle(Point(1, 0)) is True
+    assert index.next_obstacle(Point(0, 0), EAST) == Point(1, 0)
+    assert index.toggle(Point(1, 0)) is False
+    assert index.next_obstacle(Point(0, 0), EAST) == Point(2, 0)
+    assert Point(2, 0) in index and Point(1, 0) not in index
+    with pytest.raises(IndexError):
+        index.add(Point(4, 0))
+
+
+def test_guard_walk():
+    grid = Grid.parse(LAB)
+    start = grid.find("^")
+    index = grid.obstacle_index()
+    walk = index.walk(start, NORTH)
+    assert not walk.loop
+    assert walk.stops[0] == (Point(4, 1), NORTH)
+    assert walk.exit == Point(7, 9)
+    assert len(_cells(start, walk)) == 41
+
+
+def test_loop_candidates():
+    grid = Grid.parse(LAB)
+    start = grid.find("^")
+    index = grid.obstacle_index()
+    loops = 0
+    for p in _cells(start, index.walk(start, NORTH)) - {start}:
+        index.toggle(p)
+        loops += index.walk(start, NORTH).loop
+        index.toggle(p)
+    assert loops == 6
@@ -0,0 +1,123 @@
+import pytest
+
+from aoc import BloomVisited, HashedVisited, implicit_search
+
+
+def _jumps(n):
+    # +1 costs 1, *2 costs 3
+    return [(n + 1, 1), (n * 2, 3)]
+
+
+def _maze_neighbors(maze):
+    rows = maze.split()
+
+    def neighbors(p):
+        x, y = p
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= ny < len(rows) and 0 <= nx < len(rows[ny]) and rows[ny][nx] != "#":
+                yield (nx, ny), int(rows[ny][nx]) if rows[ny][nx].isdigit() else 1
+
+    return neighbors
+
+
+MAZE = """
+.....#....
+.###.#.##.
+.#...9..#.
+.#.####.#.
+...#....#.
+.#...##...
+"""
+
+
+def test_bfs():
+    result = implicit_search(1, _jumps, 20, method="bfs", with_path=True)
+    assert len(result.path) - 1 == 5  # 1 2 4 5 10 20
+    assert result.path[0] == 1 and result.path[-1] == 20
+    assert implicit_search(1, lambda n: [(n + 1, 1)] if n < 5 else [], 9, method="bfs") is None
+
+
+def test_dijkstra_and_astar():
+    dijkstra = implicit_search(1, _jumps, 20, with_path=True)
+    assert dijkstra.cost == 10  # 1 2 3 4 5 (+1) 10 20 (*2)
+    astar = implicit_search(1, _jumps, 20, method="astar", heuristic=lambda n: 0)
+    assert astar.cost == dijkstra.cost and astar.path is None
+    neighbors = _maze_neighbors(MAZE)
+    goal = (9, 5)
+
+    def manhattan(p):
+        return abs(p[0] - goal[0]) + abs(p[1] - goal[1])
+
+    expected = implicit_search((0, 0), neighbors, goal, with_path=True)
+    result = implicit_search((0, 0), neighbors, goal, method="astar", heuristic=manhattan)
+    assert result.cost == expected.cost == 16
+    assert expected.path[0] == (0, 0) and expected.path[-1] == goal
+
+
+def test_goal_predicate():
+    result = implicit_search(3, _jumps, lambda n: n % 7 == 0 and n > 20, with_path=True)
+    assert result.state == 21 and result.path[0] == 3
+
+
+def test_state_key():
+    # pairs of tokens on a line: the order of the pair does not matter
+    def neighbors(state):
+        a, b = state
+        for na, nb in ((a + 1, b), (a, b + 1), (a - 1, b), (a, b - 1)):
+            if 0 <= na < 30 and 0 <= nb < 30:
+                yield (na, nb), 1
+
+    plain = implicit_search((0, 0), neighbors, lambda s: sorted(s) == [5, 20], method="bfs")
+    keyed = implicit_search(
+        (0, 0),
+        neighbors,
+        lambda s: sorted(s) == [5, 20],
+        method="bfs",
+        state_key=lambda s: tuple(sorted(s)),
+    )
+    assert plain.cost == keyed.cost == 25
+
+
+@pytest.mark.parametrize("visited", ["set", "hash", "bloom", HashedVisited()])
+def test_visited_stores(visited):
+    result = implicit_search(1, _jumps, 20, visited=visited, memory=4096, with_path=True)
+    assert result.cost == 10 and result.path[-1] == 20
+
+
+def test_bloom_visited():
+    store = BloomVisited(memory=1024, hashes=3)
+    for n in range(100):
+        store.add((n, "x"))
+    assert all((n, "x") in store for n in range(100))
+    assert sum((n, "y") in store for n in range(1000)) < 50
+    assert 0 < store.error_rate() < 0.05
+    assert len(store) == 100
+
+
+def test_beam_search():
+    # beam search advances one step per round, so it is compared on unit costs
+    neighbors = _maze_neighbors(MAZE.replace("9", "."))
+    goal = (9, 5)
+
+    def manhattan(p):
+        return abs(p[0] - goal[0]) + abs(p[1] - goal[1])
+
+    expected = implicit_search((0, 0), neighbors, goal, method="bfs").cost
+    for width in (1, 3, 50):
+        result = implicit_search(
+            (0, 0), neighbors, goal, method="beam", heuristic=manhattan, beam_width=width
+        )
+        assert result is None or result.cost >= expected
+    wide = implicit_search((0, 0), neighbors, goal, method="beam", beam_width=50, with_path=True)
+    assert wide.cost == expected and len(wide.path) == expected + 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        implicit_search(1, _jumps, 20, method="dfs")
+    with pytest.raises(ValueError):
+        implicit_search(1, _jumps, 20, method="astar")
+    with pytest.raises(ValueError):
+        implicit_search(1, _jumps, 20, method="beam")
+    with pytest.raises(ValueError):
+        implicit_search(1, _jumps, 20, visited="trie")
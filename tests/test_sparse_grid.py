@@ -0,0 +1,71 @@
+from aoc import Grid, Point, Rect, SparseGrid
+
+
+def test_background_and_bounds():
+    grid = SparseGrid()
+    assert grid[Point(1000, -1000)] == "."
+    assert not grid.bounds
+    grid[Point(-3, 2)] = "#"
+    grid[Point(5, -1)] = "#"
+    assert grid.bounds == Rect(-3, -1, 9, 4)
+    assert (grid.width, grid.height) == (9, 4)
+    assert Point(0, 0) in grid
+    assert Point(6, 0) not in grid
+    assert grid[Point(-3, 2)] == "#"
+
+
+def test_background_writes_do_not_allocate():
+    grid = SparseGrid(chunk_size=4)
+    grid[Point(100, 100)] = "."
+    assert not grid.bounds
+    assert repr(grid) == "SparseGrid(0x0 at (0,0), 0 chunks)"
+    grid[Point(-1, -1)] = "#"
+    grid[Point(-1, -1)] = "."
+    assert grid[Point(-1, -1)] == "."
+    assert repr(grid) == "SparseGrid(1x1 at (-1,-1), 1 chunks)"
+
+
+def test_parse_and_str():
+    grid = SparseGrid.parse("#..\n.#.\n..#")
+    assert str(grid) == "#..\n.#.\n..#"
+    grid[Point(-1, 0)] = "X"
+    assert list(grid.rows()) == ["X#..", "..#.", "...#"]
+    assert isinstance(grid.to_grid(), Grid)
+
+
+def test_from_grid():
+    grid = SparseGrid.from_grid(Grid(["..", ".O"]))
+    assert grid.bounds == Rect(1, 1, 1, 1)
+    assert grid.find("O") == Point(1, 1)
+
+
+def test_find_all():
+    grid = SparseGrid(chunk_size=2)
+    for p in (Point(3, 3), Point(-5, 0), Point(0, 0), Point(1, 0)):
+        grid[p] = "#"
+    assert grid.find_all("#") == [Point(-5, 0), Point(0, 0), Point(1, 0), Point(3, 3)]
+    assert grid.find("x") is None
+    assert len(grid.find_all(".")) == 9 * 4 - 4
+
+
+def test_neighbors_are_unbounded():
+    grid = SparseGrid()
+    assert len(list(grid.neighbors(Point(0, 0)))) == 4
+    assert len(list(grid.neighbor_values(Point(0, 0), diagonal=True))) == 8
+
+
+def test_flood_fill_outside():
+    grid = SparseGrid.parse("###\n#.#\n###")
+    outside = grid.flood_fill(Point(-1, -1))
+    assert len(outside) == 6 * 6 - 9  # bounds extended by start, grown by margin 1
+    assert Point(1, 1) not in outside
+    assert grid.flood_fill(Point(1, 1)) == {Point(1, 1)}
+
+
+def test_bfs():
+    grid = SparseGrid.parse("S.#\n.##\n...")
+    path, dist = grid.bfs(Point(0, 0), Point(3, 0))
+    assert dist == 5
+    assert path[-1] == Point(3, 0)
+    assert grid.bfs(Point(0, 0), Point(10, 10), with_path=False) == -1
+    assert grid.bfs(Point(0, 0), Point(10, 10), margin=10, with_path=False) == 20
@@ -0,0 +1,98 @@
+import pytest
+
+from aoc import VoxelGrid, voxel
+
+DROPLET = [
+    (2, 2, 2), (1, 2, 2), (3, 2, 2), (2, 1, 2), (2, 3, 2), (2, 2, 1), (2, 2, 3),
+    (2, 2, 4), (2, 2, 6), (1, 2, 5), (3, 2, 5), (2, 1, 5), (2, 3, 5),
+]  # fmt: skip
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def with_numpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(voxel, "np", None)
+    return request.param
+
+
+def _cubes(dimensions, padding):
+    return VoxelGrid.from_points(
+        [(x, y) + (0,) * (dimensions - 2) for x, y in GLIDER], padding=padding
+    )
+
+
+def test_access():
+    grid = VoxelGrid((3, 2, 2), origin=(-1, 0, 5))
+    grid[(1, 1, 6)] = 7
+    assert grid[(1, 1, 6)] == 7
+    assert grid.get((2, 0, 5)) is None
+    assert (-1, 0, 5) in grid and (-2, 0, 5) not in grid
+    assert list(grid.points(7)) == [(1, 1, 6)]
+    assert grid.count(0) == 11
+    with pytest.raises(IndexError):
+        grid[(0, 2, 5)]
+    assert repr(grid) == "VoxelGrid(3x2x2 at (-1, 0, 5))"
+
+
+def test_from_points_and_padded():
+    grid = VoxelGrid.from_points(DROPLET)
+    assert grid.shape == (3, 3, 6)
+    assert grid.origin == (1, 1, 1)
+    assert sorted(grid.points()) == sorted(DROPLET)
+    padded = grid.padded(2)
+    assert padded.shape == (7, 7, 10)
+    assert sorted(padded.points()) == sorted(DROPLET)
+
+
+def test_surface_area():
+    grid = VoxelGrid.from_points(DROPLET)
+    assert grid.surface_area() == 64
+    assert grid.surface_area(exterior_only=True) == 58
+    assert VoxelGrid.from_points([(1, 1, 1), (2, 1, 1)]).surface_area() == 10
+
+
+def test_exterior():
+    grid = VoxelGrid.from_points(DROPLET)
+    outside = grid.exterior()
+    assert outside[(2, 2, 5)] == 0  # the enclosed pocket
+    assert outside[(1, 1, 1)] == 1
+    assert outside[(2, 2, 2)] == 0  # solid
+    assert outside.count(1) == grid.count(0) - 1
+
+
+def test_neighbor_counts(with_numpy):
+    grid = VoxelGrid.from_points([(0, 0, 0), (1, 0, 0), (1, 1, 0)])
+    counts = grid.neighbor_counts()
+    assert [counts[p] for p in [(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)]] == [1, 2, 2, 1]
+    counts = grid.neighbor_counts(diagonal=True)
+    assert [counts[p] for p in [(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)]] == [2, 2, 3, 2]
+
+
+def test_conway_cubes(with_numpy):
+    grid = _cubes(3, 6)
+    for _ in range(6):
+        grid = grid.life()
+    assert grid.count() == 112
+
+
+def test_conway_hypercubes(with_numpy):
+    grid = _cubes(4, 1)
+    assert grid.life().count() == 29
+    if with_numpy:
+        grid = _cubes(4, 6)
+        for _ in range(6):
+            grid = grid.life()
+        assert grid.count() == 848
+
+
+def test_height_map():
+    grid = VoxelGrid.from_points([(0, 0, 1), (0, 0, 3), (1, 0, 2), (1, 1, 1)], value=2)
+    assert grid.height_map() == {(0, 0): 3, (1, 0): 2, (1, 1): 1}
+    assert grid.height_map(axis=0) == {(0, 1): 0, (0, 3): 0, (0, 2): 1, (1, 1): 1}
+    grid[(0, 1, 3)] = 5
+    assert grid.height_map(value=2)[(0, 0)] == 3
+    assert (0, 1) not in grid.height_map(value=2)